@@ -2,11 +2,12 @@
 Main entry point for the Bingo application.
 """
 
+import asyncio
 import logging
 import os
 
 from fastapi.staticfiles import StaticFiles
-from nicegui import app, ui
+from nicegui import app, background_tasks, ui
 
 from src.config.constants import FREE_SPACE_TEXT, HEADER_TEXT
 from src.core.game_logic import (
@@ -18,8 +19,19 @@ from src.core.game_logic import (
     is_game_closed,
     today_seed,
 )
-from src.core.state_manager import get_state_manager
+from src.core.state_backend import StateReplicator, create_state_backend
+from src.core.state_events import StateEvent
+from src.core.state_manager import (
+    SHUTDOWN_DEADLINE,
+    SHUTDOWN_DEADLINE_ENV,
+    STORE_POLL_INTERVAL,
+    STORE_POLL_INTERVAL_ENV,
+    get_state_manager,
+)
+from src.core.win_patterns import get_pattern_registry
 from src.ui.routes import init_routes
+from src.ui.tile_layout import get_layout_cache
+from src.utils.file_monitor import get_phrases_watcher
 from src.utils.file_operations import read_phrases_file
 
 # Set up logging
@@ -31,39 +43,80 @@ logging.basicConfig(
 # Initialize the application
 def init_app():
     """Initialize the Bingo application."""
+    # Compile the win patterns (built-in plus any from the patterns file)
+    get_pattern_registry()
+
+    # Lay out every phrase's tile once, up front
+    phrases = read_phrases_file()
+    get_layout_cache().load(phrases)
+
     # Get the state manager (loads state from file if exists)
     state_manager = get_state_manager()
-    
+
     # Check if we have existing state
     if state_manager.board:
         # Restore state from state manager
         logging.info("Game state loaded from server-side storage")
         # Update global variables from state manager
         import src.core.game_logic as game_logic
-        game_logic.board = state_manager.board
-        game_logic.clicked_tiles = state_manager.clicked_tiles
-        game_logic.bingo_patterns = state_manager.bingo_patterns
-        game_logic.board_iteration = state_manager.board_iteration
-        game_logic.is_game_closed = state_manager.is_game_closed
-        game_logic.today_seed = state_manager.today_seed
+
+        game_logic.adopt_state(state_manager.snapshot)
     else:
         # If no saved state exists, initialize fresh game state
         logging.info("No saved state found, initializing fresh game state")
-        phrases = read_phrases_file()
         generated_board = generate_board(board_iteration, phrases)
-        
-        # Update state manager synchronously during initialization
-        # We'll save to file after UI starts up
-        import src.core.game_logic as game_logic
 
-        # Use NiceGUI's app.on_startup to save initial state after event loop starts
-        @app.on_startup
-        async def save_initial_state():
+        # The generated board is saved once the event loop runs, unless a
+        # replica or another worker provides a game first
+
+    # Follow changes other worker processes save to the shared state files.
+    # Subscribed before any client, so the globals are current when clients
+    # re-render.
+    import src.core.game_logic as game_logic
+
+    state_manager.subscribe(game_logic.follow_state_reloads)
+    poll_interval = float(os.getenv(STORE_POLL_INTERVAL_ENV, STORE_POLL_INTERVAL))
+    shutdown_deadline = float(os.getenv(SHUTDOWN_DEADLINE_ENV, SHUTDOWN_DEADLINE))
+
+    # Follow phrases.txt with one watcher for the whole process: a change
+    # reloads the corpus once and generates one new board for every client
+    phrases_watcher = get_phrases_watcher()
+
+    def on_corpus_change(event: StateEvent) -> None:
+        phrases = event.data["phrases"]
+        get_layout_cache().load(phrases)  # The old phrases' layouts go with them
+        game_logic.generate_new_board(phrases)
+
+    phrases_watcher.subscribe(on_corpus_change)
+
+    # Replicate changes to and from other replicas, if BINGO_PUBSUB_URL is set
+    backend = create_state_backend()
+    replicator = (
+        StateReplicator(state_manager, backend) if backend is not None else None
+    )
+
+    @app.on_startup
+    async def start_state():
+        if replicator is not None:
+            await replicator.start()  # Adopts the replicas' game, if there is one
+        # Another worker may have saved a game since this one loaded
+        await state_manager.refresh()
+        if not state_manager.board:
             await state_manager.update_board(
-                game_logic.board, 
-                game_logic.board_iteration, 
-                game_logic.today_seed
+                game_logic.board, game_logic.board_iteration, game_logic.today_seed
             )
+        background_tasks.create(
+            state_manager.watch_store(poll_interval), name="watch_state_store"
+        )
+        phrases_watcher.start(asyncio.get_running_loop())
+
+    @app.on_shutdown
+    async def stop_state():
+        phrases_watcher.stop(1.0)
+        # Flush pending changes before Kubernetes' grace period runs out
+        if replicator is not None:
+            await replicator.stop()
+        await state_manager.shutdown(shutdown_deadline)
 
     # Initialize routes
     init_routes()
@@ -78,4 +131,9 @@ def init_app():
 if __name__ in {"__main__", "__mp_main__"}:
     # Run the NiceGUI app
     init_app()
-    ui.run(port=8080, title=f"{HEADER_TEXT}", dark=False, storage_secret=os.getenv("STORAGE_SECRET","ThisIsMyCrappyStorageSecret"))
+    ui.run(
+        port=8080,
+        title=f"{HEADER_TEXT}",
+        dark=False,
+        storage_secret=os.getenv("STORAGE_SECRET", "ThisIsMyCrappyStorageSecret"),
+    )
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: bitboard win detection vs. the previous set-scanning check.
+
+Runs the pattern detection part of check_winner (no notifications) over random
+boards, for a full check and for the per-toggle check through one tile.
+
+Usage: python scripts/benchmark_check_winner.py [iterations]
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import List, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.win_patterns import completed_patterns, tiles_to_mask  # noqa: E402
+from src.types.ui_types import ClickedTiles, Coordinate  # noqa: E402
+
+
+def legacy_completed_patterns(clicked_tiles: ClickedTiles) -> List[str]:
+    """The pattern scan check_winner used before bitboards."""
+    patterns: List[str] = []
+    for i in range(5):
+        if all((i, j) in clicked_tiles for j in range(5)):
+            patterns.append(f"row{i}")
+        if all((j, i) in clicked_tiles for j in range(5)):
+            patterns.append(f"col{i}")
+    if all((i, i) in clicked_tiles for i in range(5)):
+        patterns.append("diag_main")
+    if all((i, 4 - i) in clicked_tiles for i in range(5)):
+        patterns.append("diag_anti")
+    if all((r, c) in clicked_tiles for r in range(5) for c in range(5)):
+        patterns.append("blackout")
+    if all(pos in clicked_tiles for pos in [(0, 0), (0, 4), (4, 0), (4, 4)]):
+        patterns.append("four_corners")
+    plus_cells: Set[Coordinate] = {(2, c) for c in range(5)} | {
+        (r, 2) for r in range(5)
+    }
+    if all(cell in clicked_tiles for cell in plus_cells):
+        patterns.append("plus")
+    if all((i, i) in clicked_tiles for i in range(5)) and all(
+        (i, 4 - i) in clicked_tiles for i in range(5)
+    ):
+        patterns.append("x_shape")
+    perimeter_cells: Set[Coordinate] = (
+        {(0, c) for c in range(5)}
+        | {(4, c) for c in range(5)}
+        | {(r, 0) for r in range(5)}
+        | {(r, 4) for r in range(5)}
+    )
+    if all(cell in clicked_tiles for cell in perimeter_cells):
+        patterns.append("perimeter")
+    return patterns
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(42)
+    tiles = [(r, c) for r in range(5) for c in range(5)]
+    boards = [{t for t in tiles if rng.random() < 0.7} for _ in range(64)]
+    toggles = [rng.choice(tiles) for _ in boards]
+
+    for clicked in boards:
+        assert legacy_completed_patterns(clicked) == completed_patterns(
+            tiles_to_mask(clicked)
+        )
+
+    def run_legacy() -> None:
+        for clicked in boards:
+            legacy_completed_patterns(clicked)
+
+    def run_bitboard_full() -> None:
+        for clicked in boards:
+            completed_patterns(tiles_to_mask(clicked))
+
+    def run_bitboard_toggle() -> None:
+        for clicked, toggled in zip(boards, toggles):
+            completed_patterns(tiles_to_mask(clicked), toggled)
+
+    runs = max(1, iterations // len(boards))
+    checks = runs * len(boards)
+    results = [
+        ("set scan (previous)", timeit.timeit(run_legacy, number=runs)),
+        ("bitboard, all patterns", timeit.timeit(run_bitboard_full, number=runs)),
+        ("bitboard, toggled tile", timeit.timeit(run_bitboard_toggle, number=runs)),
+    ]
+    baseline = results[0][1]
+    print(f"{checks} checks each")
+    for name, seconds in results:
+        print(
+            f"{name:<24} {seconds * 1e6 / checks:8.2f} us/check"
+            f"  {baseline / seconds:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the linear-partition line splitter vs. the previous brute force.
+
+The previous split_phrase_into_lines tried every 2-, 3- and 4-line split of a
+phrase, O(n^4) in its words. Both are run over phrases of growing length,
+after checking they split every phrase the same way.
+
+Usage: python scripts/benchmark_split_phrase.py [iterations]
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.text_processing import split_phrase_into_lines  # noqa: E402
+
+
+def legacy_split_phrase_into_lines(phrase: str, forced_lines: int = None) -> list:
+    """The brute-force split_phrase_into_lines, before the linear partition."""
+    words = phrase.split()
+    n = len(words)
+    if n <= 3:
+        return words
+
+    # Helper: total length of a list of words (including spaces between words).
+    def segment_length(segment):
+        return sum(len(word) for word in segment) + (len(segment) - 1 if segment else 0)
+
+    candidates = []  # list of tuples: (number_of_lines, diff, candidate)
+
+    # 2-line candidate
+    best_diff_2 = float("inf")
+    best_seg_2 = None
+    for i in range(1, n):
+        seg1 = words[:i]
+        seg2 = words[i:]
+        len1 = segment_length(seg1)
+        len2 = segment_length(seg2)
+        diff = abs(len1 - len2)
+        if diff < best_diff_2:
+            best_diff_2 = diff
+            best_seg_2 = [" ".join(seg1), " ".join(seg2)]
+    if best_seg_2 is not None:
+        candidates.append((2, best_diff_2, best_seg_2))
+
+    # 3-line candidate (if at least 4 words)
+    if n >= 4:
+        best_diff_3 = float("inf")
+        best_seg_3 = None
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                seg1 = words[:i]
+                seg2 = words[i:j]
+                seg3 = words[j:]
+                len1 = segment_length(seg1)
+                len2 = segment_length(seg2)
+                len3 = segment_length(seg3)
+                current_diff = max(len1, len2, len3) - min(len1, len2, len3)
+                if current_diff < best_diff_3:
+                    best_diff_3 = current_diff
+                    best_seg_3 = [" ".join(seg1), " ".join(seg2), " ".join(seg3)]
+        if best_seg_3 is not None:
+            candidates.append((3, best_diff_3, best_seg_3))
+
+    # 4-line candidate (if at least 5 words)
+    if n >= 5:
+        best_diff_4 = float("inf")
+        best_seg_4 = None
+        for i in range(1, n - 2):
+            for j in range(i + 1, n - 1):
+                for k in range(j + 1, n):
+                    seg1 = words[:i]
+                    seg2 = words[i:j]
+                    seg3 = words[j:k]
+                    seg4 = words[k:]
+                    len1 = segment_length(seg1)
+                    len2 = segment_length(seg2)
+                    len3 = segment_length(seg3)
+                    len4 = segment_length(seg4)
+                    diff = max(len1, len2, len3, len4) - min(len1, len2, len3, len4)
+                    if diff < best_diff_4:
+                        best_diff_4 = diff
+                        best_seg_4 = [
+                            " ".join(seg1),
+                            " ".join(seg2),
+                            " ".join(seg3),
+                            " ".join(seg4),
+                        ]
+        if best_seg_4 is not None:
+            candidates.append((4, best_diff_4, best_seg_4))
+
+    # If a forced number of lines is specified, try to return that candidate first.
+    if forced_lines is not None:
+        forced_candidates = [cand for cand in candidates if cand[0] == forced_lines]
+        if forced_candidates:
+            _, _, best_candidate = min(forced_candidates, key=lambda x: x[1])
+            return best_candidate
+
+    # Otherwise, choose the candidate with the smallest diff.
+    if candidates:
+        _, _, best_candidate = min(candidates, key=lambda x: x[1])
+        return best_candidate
+    else:
+        # fallback (should never happen)
+        return [" ".join(words)]
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(42)
+    vocabulary = (
+        "the a of merge conflict deploy friday rollback works on my machine".split()
+    )
+
+    print(f"{'words':>5} {'brute force':>14} {'linear partition':>18} {'speedup':>8}")
+    for word_count in (5, 10, 20, 40):
+        phrases = [
+            " ".join(rng.choice(vocabulary) for _ in range(word_count))
+            for _ in range(20)
+        ]
+        for phrase in phrases:
+            assert legacy_split_phrase_into_lines(phrase) == split_phrase_into_lines(
+                phrase
+            )
+
+        runs = max(1, iterations // (word_count // 5))
+        legacy = timeit.timeit(
+            lambda: [legacy_split_phrase_into_lines(p) for p in phrases], number=runs
+        )
+        linear = timeit.timeit(
+            lambda: [split_phrase_into_lines(p) for p in phrases], number=runs
+        )
+        splits = runs * len(phrases)
+        print(
+            f"{word_count:>5} {legacy * 1e6 / splits:11.1f} us"
+            f" {linear * 1e6 / splits:15.1f} us {legacy / linear:7.1f}x"
+        )
+
+    # Beyond 4 lines, only the linear partition is practical
+    phrase = " ".join(rng.choice(vocabulary) for _ in range(200))
+    seconds = timeit.timeit(
+        lambda: split_phrase_into_lines(phrase, max_lines=12), number=5
+    )
+    print(f"200 words into up to 12 lines: {seconds * 1e3 / 5:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
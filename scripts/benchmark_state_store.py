@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: saves/sec of each state store backend under a click storm.
+
+Every click toggles a tile and saves immediately, the worst case for the
+store (the debounced save normally batches a storm into fewer saves).
+Also compares the cost of a JSON and a binary snapshot.
+
+Usage: python scripts/benchmark_state_store.py [clicks]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.constants import FREE_SPACE_TEXT  # noqa: E402
+from src.core.state_manager import GameStateManager  # noqa: E402
+from src.core.state_snapshot import (  # noqa: E402
+    PhraseTable,
+    decode_snapshot,
+    encode_snapshot,
+)
+from src.core.state_store import (  # noqa: E402
+    BinaryFileStore,
+    JsonFileStore,
+    SqliteStateStore,
+    StateStore,
+)
+
+
+async def click_storm(store: StateStore, clicks: int) -> float:
+    """Toggle random tiles, saving after each one; return the saves per second."""
+    board = [[f"phrase {r}{c}" for c in range(5)] for r in range(5)]
+    board[2][2] = FREE_SPACE_TEXT
+    manager = GameStateManager(store=store)
+    await manager.update_board(board, 1, "bench")
+    await manager.save_state(immediate=True)
+
+    rng = random.Random(42)
+    tiles = [(r, c) for r in range(5) for c in range(5)]
+    start = time.perf_counter()
+    for _ in range(clicks):
+        await manager.toggle_tile(*rng.choice(tiles))
+        await manager.save_state(immediate=True)
+    elapsed = time.perf_counter() - start
+
+    manager.saves.cancel()  # The toggles' debounced save
+    store.close()
+    return clicks / elapsed
+
+
+def main() -> None:
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    backends: List[Tuple[str, Callable[[Path], StateStore]]] = [
+        (
+            "json, snapshot per save",
+            lambda d: JsonFileStore(d / "s.json", compact_entries=1),
+        ),
+        ("json, journal", lambda d: JsonFileStore(d / "s.json")),
+        (
+            "binary, snapshot per save",
+            lambda d: BinaryFileStore(d / "s.bin", compact_entries=1),
+        ),
+        ("binary, journal", lambda d: BinaryFileStore(d / "s.bin")),
+        ("sqlite (WAL)", lambda d: SqliteStateStore(d / "s.db")),
+    ]
+
+    print(f"{clicks} clicks, one save per click")
+    for name, make_store in backends:
+        with tempfile.TemporaryDirectory() as tmp:
+            rate = asyncio.run(click_storm(make_store(Path(tmp)), clicks))
+        print(f"{name:<26} {rate:10.0f} saves/sec")
+
+    snapshot_codecs()
+
+
+def snapshot_codecs(iterations: int = 20000) -> None:
+    """Compare encoding and decoding a snapshot as JSON and in the binary format."""
+    board = [[f"phrase number {r}{c}" for c in range(5)] for r in range(5)]
+    board[2][2] = FREE_SPACE_TEXT
+    state = {
+        "board": board,
+        "clicked_tiles": [[0, 0], [1, 1], [2, 2], [3, 3]],
+        "bingo_patterns": [],
+        "is_game_closed": False,
+        "board_iteration": 1,
+        "today_seed": "20250101.1",
+        "header_text": "BINGO!",
+        "timestamp": time.time(),
+        "version": 42,
+        "snapshot_id": "0" * 32,
+    }
+    table = PhraseTable(p for row in board for p in row)
+    as_json = json.dumps(state, indent=2)
+    as_binary = encode_snapshot(state, table)
+
+    codecs = [
+        ("json encode", lambda: json.dumps(state, indent=2)),
+        ("json decode", lambda: json.loads(as_json)),
+        ("binary encode", lambda: encode_snapshot(state, table)),
+        ("binary decode", lambda: decode_snapshot(as_binary, table)),
+    ]
+    print(f"\nsnapshot size: json {len(as_json)} bytes, binary {len(as_binary)} bytes")
+    for name, codec in codecs:
+        seconds = timeit.timeit(codec, number=iterations)
+        print(f"{name:<26} {seconds * 1e6 / iterations:10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Print the saved game state as JSON, for debugging.
+
+Reads the store selected by BINGO_STATE_BACKEND (json, binary or sqlite),
+replays its journal, and prints the resulting state.
+
+Usage: BINGO_STATE_BACKEND=binary python scripts/export_state.py [state file]
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.state_manager import GameStateManager  # noqa: E402
+from src.core.state_store import create_state_store  # noqa: E402
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    store = create_state_store(path)
+    if not store.exists():
+        sys.exit(f"No saved state in {store.path}")
+    state = GameStateManager(store=store).get_full_state()
+    state["clicked_tiles"] = sorted(state["clicked_tiles"])
+    state["bingo_patterns"] = sorted(state["bingo_patterns"])
+    print(json.dumps(state, indent=2, ensure_ascii=False))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Fault injection: kill the state writer mid-write, over and over, and check
+the saved state always recovers intact.
+
+Each round forks a writer process that loads the state and keeps clicking
+tiles, saving every click, with a journal so short that snapshots (and the
+shifting of their generations) are written all the time. The writer is
+SIGKILLed at a random moment. In some rounds the crash is also made to tear
+the newest write, as a power loss before the fsync would: the snapshot is
+truncated or gets a flipped byte, or the journal loses the end of its last
+line. At most one snapshot generation is damaged at a time, the damage a
+store keeping two or more generations must survive.
+
+The state is then loaded, timed, and checked against the click sequence:
+tile TILES[v % len(TILES)] is toggled at version v, so every version has
+exactly one valid state. Without damage, no saved click may be lost either.
+
+Usage: python scripts/fault_inject_state.py [rounds] [json|binary]
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.constants import FREE_SPACE_TEXT  # noqa: E402
+from src.core.state_events import TILE_TOGGLED, StateEvent  # noqa: E402
+from src.core.state_manager import GameStateManager  # noqa: E402
+from src.core.state_store import BinaryFileStore, JsonFileStore  # noqa: E402
+from src.core.state_writer import StateWriter  # noqa: E402
+
+BOARD = [[f"phrase {r}{c}" for c in range(5)] for r in range(5)]
+BOARD[2][2] = FREE_SPACE_TEXT
+TILES = [(r, c) for r in range(5) for c in range(5) if (r, c) != (2, 2)]
+
+COMPACT_ENTRIES = 4  # A snapshot every few clicks
+GENERATIONS = 3
+MAX_RUN = 0.005  # Seconds a writer runs at most before it is killed
+DAMAGE_RATE = 0.3  # Share of rounds whose crash also tears the newest write
+
+
+@dataclass
+class FaultReport:
+    """The outcome of a fault injection run."""
+
+    rounds: int = 0
+    damaged: int = 0  # Rounds whose crash also tore a write
+    recovery_times: List[float] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def max_recovery(self) -> float:
+        return max(self.recovery_times, default=0.0)
+
+    def summary(self) -> str:
+        times = sorted(self.recovery_times) or [0.0]
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+        return (
+            f"{self.rounds} rounds ({self.damaged} with a torn write), "
+            f"{len(self.failures)} failures; recovery "
+            f"mean {statistics.mean(times) * 1000:.2f} ms, "
+            f"p99 {p99 * 1000:.2f} ms, max {self.max_recovery * 1000:.2f} ms"
+        )
+
+
+def open_store(path: Path, backend: str) -> JsonFileStore:
+    """The store under test."""
+    store_class = BinaryFileStore if backend == "binary" else JsonFileStore
+    return store_class(path, compact_entries=COMPACT_ENTRIES, generations=GENERATIONS)
+
+
+def expected_clicks(version: int, base_version: int) -> Set[Tuple[int, int]]:
+    """The clicked tiles at a version of the click sequence."""
+    clicked = {(2, 2)}
+    for v in range(base_version + 1, version + 1):
+        clicked ^= {TILES[v % len(TILES)]}
+    return clicked
+
+
+async def _start_game(path: Path, backend: str) -> int:
+    """Save the board, in every snapshot generation; returns its version."""
+    manager = GameStateManager(store=open_store(path, backend), writer=StateWriter())
+    await manager.update_board(BOARD, 1, "faults")
+    for _ in range(GENERATIONS):
+        await manager.compact()
+    manager.saves.cancel()
+    await asyncio.to_thread(manager.writer.stop)
+    return manager.version
+
+
+def _click_until_killed(path: str, backend: str, ready) -> None:
+    """The writer process: continue the click sequence until killed."""
+    manager = GameStateManager(
+        store=open_store(Path(path), backend), writer=StateWriter()
+    )
+    ready.set()
+    while True:
+        row, col = TILES[(manager.version + 1) % len(TILES)]
+        clicked = (row, col) not in manager.clicked_tiles
+        manager.apply(
+            StateEvent(TILE_TOGGLED, {"row": row, "col": col, "clicked": clicked})
+        )
+
+
+def _tear_newest_write(store: JsonFileStore, rng: random.Random) -> Optional[int]:
+    """
+    Damage the newest write like a crash before its fsync would.
+
+    Returns:
+        The inode of the damaged snapshot, or None if the journal was torn
+    """
+    journal = store.journal.path
+    if rng.random() < 0.3 and journal.exists() and journal.stat().st_size > 40:
+        size = journal.stat().st_size
+        os.truncate(journal, size - rng.randint(1, 20))
+        return None
+    data = bytearray(store.path.read_bytes())
+    if rng.random() < 0.5:
+        data = data[: rng.randrange(len(data))]
+    else:
+        data[rng.randrange(len(data))] ^= 1 << rng.randrange(8)
+    # In place, like the torn write itself, keeping the inode
+    with open(store.path, "r+b") as f:
+        f.write(data)
+        f.truncate()
+    return store.path.stat().st_ino
+
+
+def run_fault_injection(
+    rounds: int, backend: str = "json", directory: Optional[Path] = None, seed: int = 0
+) -> FaultReport:
+    """
+    Run the fault injection rounds against a fresh state file.
+
+    Args:
+        rounds: Writer processes to kill
+        backend: "json" or "binary"
+        directory: Where to keep the state files; a temporary directory if None
+        seed: Seeds the kill timing and the damage
+
+    Returns:
+        The report; any failure is described in report.failures
+    """
+    if directory is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return run_fault_injection(rounds, backend, Path(tmp), seed)
+
+    rng = random.Random(seed)
+    context = multiprocessing.get_context("fork")
+    path = directory / ("state.bin" if backend == "binary" else "state.json")
+
+    base_version = asyncio.run(_start_game(path, backend))
+    last_version = base_version
+
+    report = FaultReport()
+    damaged_inodes: Set[int] = set()
+    for round_number in range(rounds):
+        ready = context.Event()
+        writer = context.Process(
+            target=_click_until_killed, args=(str(path), backend, ready)
+        )
+        writer.start()
+        ready.wait(10)
+        time.sleep(rng.uniform(0, MAX_RUN))
+        writer.kill()
+        writer.join()
+
+        store = open_store(path, backend)
+        on_disk = {p.stat().st_ino for p in store.snapshot_paths() if p.exists()}
+        damaged_inodes &= on_disk
+        # Killed between shifting the generations and renaming the new
+        # snapshot into place, there is no newest snapshot to tear
+        damaged = (
+            not damaged_inodes and store.path.exists() and rng.random() < DAMAGE_RATE
+        )
+        if damaged:
+            inode = _tear_newest_write(store, rng)
+            if inode is not None:
+                damaged_inodes.add(inode)
+            report.damaged += 1
+
+        start = time.perf_counter()
+        manager = GameStateManager(
+            store=open_store(path, backend), writer=StateWriter()
+        )
+        report.recovery_times.append(time.perf_counter() - start)
+        report.rounds += 1
+
+        version = manager.version
+        if manager.board != tuple(map(tuple, BOARD)):
+            report.failures.append(
+                f"round {round_number}: board lost (version {version})"
+            )
+        elif manager.clicked_tiles != expected_clicks(version, base_version):
+            report.failures.append(
+                f"round {round_number}: clicks at version {version} corrupt"
+            )
+        elif not damaged and version < last_version:
+            report.failures.append(
+                f"round {round_number}: version went back"
+                f" from {last_version} to {version}"
+            )
+        if report.failures:
+            break
+        last_version = version
+    return report
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    backend = sys.argv[2] if len(sys.argv) > 2 else "json"
+    logging.disable(logging.CRITICAL)  # Every damaged round logs its recovery
+    report = run_fault_injection(rounds, backend)
+    print(f"{backend}: {report.summary()}")
+    for failure in report.failures:
+        print(f"  {failure}")
+    sys.exit(1 if report.failures else 0)
+
+
+if __name__ == "__main__":
+    main()
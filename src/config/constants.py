@@ -2,7 +2,7 @@
 Configuration constants for the Bingo application.
 """
 
-from typing import Final, Literal
+from typing import Final, Literal, Tuple
 
 # Type definitions for CSS properties
 CssColor = str  # Hex color code like "#123456" or named color like "red"
@@ -34,10 +34,15 @@ STREAM_BG_COLOR: Final[CssColor] = "#00FF00"
 
 # Font settings
 HEADER_FONT_FAMILY: Final[CssFontFamily] = "'Super Carnival', sans-serif"
-BOARD_TILE_FONT: Final[str] = "Inter"
-BOARD_TILE_FONT_WEIGHT: Final[CssFontWeight] = "700"
+BOARD_TILE_FONT: Final[str] = "Super Carnival"
+BOARD_TILE_FONT_WEIGHT: Final[CssFontWeight] = "400"  # The font's only weight
 BOARD_TILE_FONT_STYLE: Final[CssFontStyle] = "normal"
 
+# Bundled font files text is fitted with on the server. The tiles use the
+# bundled header font, so their sizes come from its real metrics
+HEADER_FONT_FILE: Final[str] = "static/Super Carnival.woff"
+BOARD_TILE_FONT_FILE: Final[str] = HEADER_FONT_FILE
+
 # UI Class Constants
 BOARD_CONTAINER_CLASS: Final[CssClass] = "flex justify-center items-center w-full"
 HEADER_CONTAINER_CLASS: Final[CssClass] = "w-full"
@@ -52,3 +57,28 @@ GRID_CLASSES: Final[CssClass] = "gap-2 h-full grid-rows-5"
 ROW_CLASSES: Final[CssClass] = "w-full"
 LABEL_SMALL_CLASSES: Final[CssClass] = "fit-text-small text-center select-none"
 LABEL_CLASSES: Final[CssClass] = "fit-text text-center select-none"
+# Fitted text is sized in container units (cqw) of its nearest element with
+# this class, so it keeps fitting when the viewport is resized
+FIT_CONTAINER_CLASS: Final[CssClass] = "fit-container"
+
+# Flattened tile markup: the card, column, row and label classes that NiceGUI
+# would add, for tiles rendered as a single element (see build_tile_html)
+TILE_CARD_CLASSES: Final[CssClass] = (
+    f"q-card nicegui-card {CARD_CLASSES} {FIT_CONTAINER_CLASS}"
+)
+TILE_COLUMN_CLASSES: Final[CssClass] = f"nicegui-column {COLUMN_CLASSES}"
+TILE_ROW_CLASSES: Final[CssClass] = "nicegui-row row w-full items-center justify-center"
+
+# Tile state classes, styled by the generated tile stylesheet (see tile_layout):
+# a click swaps a tile's state class, and a phrase's column carries the class
+# for its number of lines
+TILE_CLICKED_CLASS: Final[CssClass] = "tile-clicked"
+TILE_UNCLICKED_CLASS: Final[CssClass] = "tile-unclicked"
+TILE_FREE_CLASS: Final[CssClass] = "tile-free"
+LINE_COUNT_CLASS_PREFIX: Final[str] = "line-count-"
+
+# Board render modes: "server" builds one element per tile, "client" renders
+# the whole board in a browser component fed a compact state payload
+BOARD_RENDER_SERVER: Final[str] = "server"
+BOARD_RENDER_CLIENT: Final[str] = "client"
+BOARD_RENDER_MODES: Final[Tuple[str, ...]] = (BOARD_RENDER_SERVER, BOARD_RENDER_CLIENT)
@@ -6,7 +6,8 @@ import datetime
 import json
 import logging
 import random
-from typing import Any, Dict, List, Optional, Set, Tuple, cast
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from nicegui import app, ui
 
@@ -15,10 +16,22 @@ from src.config.constants import (
     FREE_SPACE_TEXT,
     FREE_SPACE_TEXT_COLOR,
     HEADER_TEXT,
-    TILE_CLICKED_BG_COLOR,
-    TILE_CLICKED_TEXT_COLOR,
-    TILE_UNCLICKED_BG_COLOR,
-    TILE_UNCLICKED_TEXT_COLOR,
+)
+from src.core.state_events import (
+    BOARD_REPLACED,
+    BOARD_RESET,
+    GAME_CLOSED,
+    GAME_REOPENED,
+    STATE_RELOADED,
+    TILE_TOGGLED,
+    StateEvent,
+)
+from src.core.win_patterns import (
+    STANDARD_CATEGORY,
+    PatternTracker,
+    get_pattern_registry,
+    tile_bit,
+    tiles_to_mask,
 )
 from src.types.ui_types import (
     BingoPattern,
@@ -27,15 +40,17 @@ from src.types.ui_types import (
     BoardViews,
     ClickedTiles,
     Coordinate,
-    TileButtonsDict,
-    TileLabelInfo,
 )
-from src.utils.text_processing import get_line_style_for_lines, split_phrase_into_lines
+
+if TYPE_CHECKING:
+    from src.core.state_manager import StateSnapshot
 
 # Global variables for game state
 board: BoardType = []  # 2D array of phrases
 clicked_tiles: ClickedTiles = set()  # Set of (row, col) tuples that are clicked
+clicked_mask: int = 0  # clicked_tiles as a 25-bit int, kept in step with it
 bingo_patterns: BingoPatterns = set()  # Set of winning patterns found
+win_tracker = PatternTracker()  # Per-category counts of bingo_patterns
 board_iteration: int = 1
 is_game_closed: bool = False
 today_seed: Optional[str] = None
@@ -48,6 +63,9 @@ board_views: BoardViews = (
     {}
 )  # Dictionary mapping view name to (container, tile_buttons) tuple
 
+# Serializes out-of-loop saves coming from different threads
+_storage_thread_lock = threading.Lock()
+
 
 def generate_board(seed_val: int, phrases: List[str]) -> BoardType:
     """
@@ -61,7 +79,7 @@ def generate_board(seed_val: int, phrases: List[str]) -> BoardType:
     Returns:
         The generated board as a 2D array of phrases
     """
-    global board, today_seed, clicked_tiles
+    global board, today_seed, clicked_tiles, clicked_mask
 
     todays_seed = datetime.date.today().strftime("%Y%m%d")
     random.seed(seed_val)
@@ -76,6 +94,7 @@ def generate_board(seed_val: int, phrases: List[str]) -> BoardType:
         for c, phrase in enumerate(row):
             if phrase.upper() == FREE_SPACE_TEXT:
                 clicked_tiles.add((r, c))
+    clicked_mask = tiles_to_mask(clicked_tiles)
 
     today_seed = f"{todays_seed}.{seed_val}"
 
@@ -91,7 +110,7 @@ def toggle_tile(row: int, col: int) -> None:
         row: Row index of the tile to toggle
         col: Column index of the tile to toggle
     """
-    global clicked_tiles
+    global clicked_tiles, clicked_mask
 
     # Don't allow toggling when game is closed
     if is_game_closed:
@@ -107,180 +126,115 @@ def toggle_tile(row: int, col: int) -> None:
         clicked_tiles.remove(key)
     else:
         clicked_tiles.add(key)
+    clicked = key in clicked_tiles
+    if clicked:
+        clicked_mask |= tile_bit(row, col)
+    else:
+        clicked_mask &= ~tile_bit(row, col)
 
-    check_winner()
+    changed = check_winner(key)
     
-    # Save state to storage after each tile toggle for persistence
-    save_state_to_storage()
-
-    for view_key, (container, tile_buttons_local) in board_views.items():
-        for (r, c), tile in tile_buttons_local.items():
-            phrase = board[r][c]
-            if (r, c) in clicked_tiles:
-                new_card_style = f"background-color: {TILE_CLICKED_BG_COLOR}; color: {TILE_CLICKED_TEXT_COLOR}; border: none; outline: 3px solid {TILE_CLICKED_TEXT_COLOR};"
-                new_label_color = TILE_CLICKED_TEXT_COLOR
-            else:
-                new_card_style = f"background-color: {TILE_UNCLICKED_BG_COLOR}; color: {TILE_UNCLICKED_TEXT_COLOR}; border: none;"
-                new_label_color = TILE_UNCLICKED_TEXT_COLOR
-
-            card = cast(ui.card, tile["card"])
-            card.style(new_card_style)
-
-            lines = split_phrase_into_lines(phrase)
-            line_count = len(lines)
-            new_label_style = get_line_style_for_lines(line_count, new_label_color)
-
-            label_list = cast(List[TileLabelInfo], tile["labels"])
-            for label_info in label_list:
-                lbl = cast(ui.label, label_info["ref"])
-                base_classes = cast(str, label_info["base_classes"])
-                lbl.classes(base_classes)
-                lbl.style(new_label_style)
-                lbl.update()
-
-            card.update()
-
-        container.update()
+    # Save just this toggle (and the wins it changed) for persistence
+    delta: Dict[str, Any] = {"row": row, "col": col, "clicked": clicked}
+    if changed:
+        delta["won" if clicked else "lost"] = changed
+    apply_state_change(TILE_TOGGLED, **delta)
 
+    # Restyle only the flipped tile in each board view
     try:
-        js_code = """
-            setTimeout(function() {
-                if (typeof fitty !== 'undefined') {
-                    fitty('.fit-text', { multiLine: true, minSize: 10, maxSize: 1000 });
-                    fitty('.fit-text-small', { multiLine: true, minSize: 10, maxSize: 72 });
-                }
-            }, 50);
-        """
-        ui.run_javascript(js_code)
-        
-        # In NiceGUI 2.11+, updates are automatically synchronized between clients
-        # via the timer-based sync_board_state function running frequently
-        logging.debug("UI updates will be synchronized by timers")
+        from src.core.state_manager import get_state_manager
+        from src.ui.sync import render_board_views, render_stats
+
+        updates = render_board_views(get_state_manager().version)
+        render_stats.record_toggle(updates)
+        logging.debug(f"Tile toggle sent {updates} element updates")
     except Exception as e:
-        logging.debug(f"JavaScript execution failed: {e}")
+        logging.debug(f"Rendering board views failed: {e}")
+
+    # Push the change to every other connected client
+    publish_state_change(TILE_TOGGLED, row=row, col=col, clicked=clicked)
 
 
-def check_winner() -> None:
+def check_winner(toggled: Optional[Coordinate] = None) -> List[BingoPattern]:
     """
     Check for Bingo win condition and update the UI accordingly.
+
+    Args:
+        toggled: The tile that just changed; if given, only the patterns
+            through it are checked, and retracted if the tile was un-clicked.
+            If None, all patterns are checked and clicked_mask is rebuilt
+            from clicked_tiles, e.g. after the tiles were set wholesale
+
+    Returns:
+        The newly completed patterns, or the retracted ones for an un-click
     """
-    global bingo_patterns
-    new_patterns: List[BingoPattern] = []
-
-    # Check rows and columns.
-    for i in range(5):
-        if all((i, j) in clicked_tiles for j in range(5)):
-            if f"row{i}" not in bingo_patterns:
-                new_patterns.append(f"row{i}")
-        if all((j, i) in clicked_tiles for j in range(5)):
-            if f"col{i}" not in bingo_patterns:
-                new_patterns.append(f"col{i}")
-
-    # Check main diagonal.
-    if all((i, i) in clicked_tiles for i in range(5)):
-        if "diag_main" not in bingo_patterns:
-            new_patterns.append("diag_main")
-
-    # Check anti-diagonal.
-    if all((i, 4 - i) in clicked_tiles for i in range(5)):
-        if "diag_anti" not in bingo_patterns:
-            new_patterns.append("diag_anti")
-
-    # Additional winning variations:
-
-    # Blackout: every cell is clicked.
-    if all((r, c) in clicked_tiles for r in range(5) for c in range(5)):
-        if "blackout" not in bingo_patterns:
-            new_patterns.append("blackout")
-
-    # 4 Corners: top-left, top-right, bottom-left, bottom-right.
-    if all(pos in clicked_tiles for pos in [(0, 0), (0, 4), (4, 0), (4, 4)]):
-        if "four_corners" not in bingo_patterns:
-            new_patterns.append("four_corners")
-
-    # Plus shape: complete center row and center column.
-    plus_cells: Set[Coordinate] = {(2, c) for c in range(5)} | {
-        (r, 2) for r in range(5)
-    }
-    if all(cell in clicked_tiles for cell in plus_cells):
-        if "plus" not in bingo_patterns:
-            new_patterns.append("plus")
-
-    # X shape: both diagonals complete.
-    if all((i, i) in clicked_tiles for i in range(5)) and all(
-        (i, 4 - i) in clicked_tiles for i in range(5)
-    ):
-        if "x_shape" not in bingo_patterns:
-            new_patterns.append("x_shape")
-
-    # Outside edges (perimeter): all border cells clicked.
-    perimeter_cells: Set[Coordinate] = (
-        {(0, c) for c in range(5)}
-        | {(4, c) for c in range(5)}
-        | {(r, 0) for r in range(5)}
-        | {(r, 4) for r in range(5)}
-    )
-    if all(cell in clicked_tiles for cell in perimeter_cells):
-        if "perimeter" not in bingo_patterns:
-            new_patterns.append("perimeter")
+    global bingo_patterns, clicked_mask
+
+    # Every pattern is a precomputed mask over the 25-bit clicked state
+    registry = get_pattern_registry()
+    win_tracker.bind(bingo_patterns, registry)
+
+    # Un-clicking a tile breaks every completed pattern through it and
+    # cannot complete a new one
+    if toggled is not None and toggled not in clicked_tiles:
+        retracted = win_tracker.retract(toggled, registry)
+        if retracted:
+            logging.debug(f"Win patterns retracted: {retracted}")
+        return retracted
+
+    if toggled is None:
+        clicked_mask = tiles_to_mask(clicked_tiles)
+    new_patterns: List[BingoPattern] = [
+        p for p in registry.completed(clicked_mask, toggled) if p not in bingo_patterns
+    ]
 
     if new_patterns:
         # Separate new win patterns into standard and special ones.
-        special_set: Set[str] = {
-            "blackout",
-            "four_corners",
-            "plus",
-            "x_shape",
-            "perimeter",
-        }
         standard_new: List[BingoPattern] = [
-            p for p in new_patterns if p not in special_set
+            p for p in new_patterns if registry.category(p) == STANDARD_CATEGORY
+        ]
+        special_new: List[BingoPattern] = [
+            p for p in new_patterns if registry.category(p) != STANDARD_CATEGORY
         ]
-        special_new: List[BingoPattern] = [p for p in new_patterns if p in special_set]
 
-        # Process standard win conditions (rows, columns, diagonals).
+        # Process standard win conditions (rows, columns, diagonals) as one
+        # multi-bingo announcement.
         if standard_new:
             for pattern in standard_new:
-                bingo_patterns.add(pattern)
-            standard_total: int = sum(1 for p in bingo_patterns if p not in special_set)
-            message: str
-            if standard_total == 1:
-                message = "BINGO!"
-            elif standard_total == 2:
-                message = "DOUBLE BINGO!"
-            elif standard_total == 3:
-                message = "TRIPLE BINGO!"
-            elif standard_total == 4:
-                message = "QUADRUPLE BINGO!"
-            elif standard_total == 5:
-                message = "QUINTUPLE BINGO!"
-            else:
-                message = f"{standard_total}-WAY BINGO!"
+                win_tracker.add(pattern, registry)
+            standard_total: int = win_tracker.count(STANDARD_CATEGORY)
+            message: str = registry.patterns[standard_new[0]].format_message(
+                standard_total
+            )
             ui.notify(message, color="green", duration=5)
 
         # Process special win conditions individually.
         for sp in special_new:
-            bingo_patterns.add(sp)
-            # Format the name to title-case and append "Bingo!"
-            sp_message: str = sp.replace("_", " ").title() + " Bingo!"
+            win_tracker.add(sp, registry)
+            category_total = win_tracker.count(registry.category(sp))
+            sp_message: str = registry.patterns[sp].format_message(category_total)
             ui.notify(sp_message, color="blue", duration=5)
 
+    return new_patterns
+
 
 def reset_board() -> None:
     """
     Reset the board by clearing all clicked states, clearing winning patterns,
     and re-adding the FREE SPACE.
     """
-    global bingo_patterns
+    global bingo_patterns, clicked_mask
     bingo_patterns.clear()  # Clear previously recorded wins.
     clicked_tiles.clear()
     for r, row in enumerate(board):
         for c, phrase in enumerate(row):
             if phrase.upper() == FREE_SPACE_TEXT:
                 clicked_tiles.add((r, c))
+    clicked_mask = tiles_to_mask(clicked_tiles)
     
     # Save state after reset for persistence
-    save_state_to_storage()
+    apply_state_change(BOARD_RESET)
+    publish_state_change(BOARD_RESET)
 
 
 def generate_new_board(phrases: List[str]) -> None:
@@ -292,15 +246,19 @@ def generate_new_board(phrases: List[str]) -> None:
     """
     global board_iteration
     board_iteration += 1
+    # generate_board resets the clicked tiles; a new board also starts with no
+    # wins. BOARD_REPLACED covers both, so no separate reset is committed.
     generate_board(board_iteration, phrases)
+    bingo_patterns.clear()
+    apply_state_change(BOARD_REPLACED, board=board, iteration=board_iteration, seed=today_seed)
 
     # Update all board views (both home and stream)
-    from src.ui.board_builder import build_board
+    from src.ui.board_builder import rebuild_board
 
     for view_key, (container, tile_buttons_local) in board_views.items():
         container.clear()
         tile_buttons_local.clear()
-        build_board(container, tile_buttons_local, toggle_tile, board, clicked_tiles)
+        rebuild_board(container, tile_buttons_local, toggle_tile, board, clicked_tiles)
         container.update()
 
     # Update the seed label if available
@@ -308,7 +266,7 @@ def generate_new_board(phrases: List[str]) -> None:
         seed_label.set_text(f"Seed: {today_seed}")
         seed_label.update()
 
-    reset_board()
+    publish_state_change(BOARD_REPLACED, iteration=board_iteration, seed=today_seed)
 
 
 def close_game() -> None:
@@ -321,8 +279,9 @@ def close_game() -> None:
 
     # Update header text on the current view
     if header_label is not None:
-        header_label.set_text(CLOSED_HEADER_TEXT)
-        header_label.update()
+        from src.ui.head import set_header_text
+
+        set_header_text(header_label, CLOSED_HEADER_TEXT)
 
     # Show closed message in board containers
     from src.config.constants import CLOSED_MESSAGE_COLOR, CLOSED_MESSAGE_TEXT
@@ -344,11 +303,10 @@ def close_game() -> None:
                 ui.tooltip("Start a new game with a fresh board")
 
     # Save game state with is_game_closed=True for persistence
-    save_state_to_storage()
+    apply_state_change(GAME_CLOSED, header_text=CLOSED_HEADER_TEXT)
+    publish_state_change(GAME_CLOSED)
 
-    # In NiceGUI 2.11+, updates are automatically synchronized between clients
-    # via the timer-based sync_board_state function
-    logging.info("Game closed - changes will be synchronized by timers")
+    logging.info("Game closed - changes pushed to subscribed clients")
 
     # Notify that game has been closed
     ui.notify("Game has been closed", color="red", duration=3)
@@ -366,8 +324,9 @@ def reopen_game() -> None:
 
     # Update header text back to original for the current view
     if header_label is not None:
-        header_label.set_text(HEADER_TEXT)
-        header_label.update()
+        from src.ui.head import set_header_text
+
+        set_header_text(header_label, HEADER_TEXT)
 
     # Generate a new board
     from src.utils.file_operations import read_phrases_file
@@ -375,7 +334,13 @@ def reopen_game() -> None:
     phrases: List[str] = read_phrases_file()
 
     board_iteration += 1
+    # The new board resets the clicked tiles and wins, as in generate_new_board
     generate_board(board_iteration, phrases)
+    bingo_patterns.clear()
+
+    # Save the reopened game with its new board for persistence
+    apply_state_change(BOARD_REPLACED, board=board, iteration=board_iteration, seed=today_seed)
+    apply_state_change(GAME_REOPENED, header_text=HEADER_TEXT)
 
     # Rebuild the controls row with all buttons
     from src.ui.controls import rebuild_controls_row
@@ -384,33 +349,66 @@ def reopen_game() -> None:
         rebuild_controls_row(controls_row)
 
     # Recreate and show all board views
-    from src.ui.board_builder import build_board
+    from src.ui.board_builder import rebuild_board
 
     for view_key, (container, tile_buttons_local) in board_views.items():
         container.style("display: block;")
         container.clear()
         tile_buttons_local.clear()
-        build_board(container, tile_buttons_local, toggle_tile, board, clicked_tiles)
+        rebuild_board(container, tile_buttons_local, toggle_tile, board, clicked_tiles)
         container.update()
 
-    # Reset clicked tiles except for FREE SPACE
-    reset_board()
-
     # Notify that a new game has started
     ui.notify("New game started", color="green", duration=3)
 
-    # In NiceGUI 2.11+, updates are automatically synchronized between clients
-    # via the timer-based sync_board_state function
-    logging.info("Game reopened - changes will be synchronized by timers")
-        
-    # Save state to storage for persistence across app restarts
-    save_state_to_storage()
+    logging.info("Game reopened - changes pushed to subscribed clients")
+    publish_state_change(GAME_REOPENED)
+
+
+def publish_state_change(kind: str, **data: Any) -> None:
+    """
+    Notify subscribed clients that the game state changed.
+
+    Args:
+        kind: One of the event kinds defined in src.core.state_events
+        **data: Event details, e.g. the toggled tile's row and col
+    """
+    try:
+        from src.core.state_manager import get_state_manager
+
+        get_state_manager().publish(kind, **data)
+    except Exception as e:
+        logging.debug(f"Publishing {kind} failed: {e}")
+
+
+def apply_state_change(kind: str, **data: Any) -> None:
+    """
+    Save one change to the game globals through the StateManager.
+    Only the delta is applied; the StateManager's debounced save persists it.
+
+    Args:
+        kind: One of the event kinds defined in src.core.state_events
+        **data: The change, e.g. the toggled tile's row, col and clicked state
+    """
+    try:
+        from src.core.state_events import StateEvent
+        from src.core.state_manager import get_state_manager
+
+        # Safe from any thread: the manager commits changes with a compare-and-swap
+        get_state_manager().apply(StateEvent(kind, data))
+    except Exception as e:
+        logging.error(f"Error saving {kind} to storage: {e}")
 
 
 def save_state_to_storage() -> bool:
     """
     Save the current game state using the StateManager for server-side persistence.
     This is a synchronous wrapper that schedules async operations.
+    The whole state is written; single changes use apply_state_change instead.
+
+    This is the legacy whole-state entry point, kept for tests and tools that
+    set the globals directly. It commits through replace_state, so the
+    version is advanced there, in the same compare-and-swap as the state.
     
     Returns:
         bool: True if state was saved successfully, False otherwise
@@ -418,25 +416,25 @@ def save_state_to_storage() -> bool:
     try:
         import asyncio
 
-        from src.core.state_manager import GameState, get_state_manager
+        from src.core.state_manager import get_state_manager
         
         state_manager = get_state_manager()
         
         # Create a complete async function to update state
         async def update_state():
-            # Update the board and basic info
-            await state_manager.update_board(board, board_iteration, today_seed)
-            
-            # Manually update the state manager's internal state
-            # This is necessary because we need to sync the clicked tiles and patterns
-            async with state_manager._lock:
-                state_manager._state.clicked_tiles = clicked_tiles.copy()
-                state_manager._state.bingo_patterns = bingo_patterns.copy()
-                state_manager._state.is_game_closed = is_game_closed
-                state_manager._state.header_text = CLOSED_HEADER_TEXT if is_game_closed else HEADER_TEXT
-            
-            # Save the state
-            await state_manager.save_state(immediate=True)
+            # Mirror the globals into the state manager. update_board() is not
+            # used here because it would publish a board-replaced event for
+            # every click.
+            await state_manager.replace_state(
+                board=board,
+                board_iteration=board_iteration,
+                today_seed=today_seed,
+                clicked_tiles=clicked_tiles.copy(),
+                bingo_patterns=bingo_patterns.copy(),
+                is_game_closed=is_game_closed,
+                header_text=CLOSED_HEADER_TEXT if is_game_closed else HEADER_TEXT,
+                immediate=True,
+            )
         
         # Schedule the async operation
         try:
@@ -444,8 +442,10 @@ def save_state_to_storage() -> bool:
             loop = asyncio.get_running_loop()
             asyncio.create_task(update_state())
         except RuntimeError:
-            # Not in an event loop, run it directly
-            asyncio.run(update_state())
+            # Not in an event loop, run it directly. Callers on different
+            # threads take turns, so each mirrors the globals whole.
+            with _storage_thread_lock:
+                asyncio.run(update_state())
         
         logging.debug("Game state saved to server-side storage")
         return True
@@ -461,20 +461,18 @@ def load_state_from_storage() -> bool:
     Returns:
         bool: True if state was loaded successfully, False otherwise
     """
-    global board, clicked_tiles, bingo_patterns, board_iteration, is_game_closed, today_seed
-    
     try:
-        from pathlib import Path
-
         from src.core.state_manager import GameStateManager
+        from src.core.state_store import create_state_store
 
-        # Force reload from file by creating new instance
-        state_file = Path("game_state.json")
-        if not state_file.exists():
+        # Force reload from the store by creating new instance
+        store = create_state_store()
+        if not store.exists():
             logging.debug("No state file found")
+            store.close()
             return False
             
-        state_manager = GameStateManager()
+        state_manager = GameStateManager(store=store)
         
         # Check if state manager has valid board data
         if not state_manager.board:
@@ -482,15 +480,65 @@ def load_state_from_storage() -> bool:
             return False
         
         # Load state from state manager
-        board = state_manager.board
-        clicked_tiles = state_manager.clicked_tiles
-        bingo_patterns = state_manager.bingo_patterns
-        board_iteration = state_manager.board_iteration
-        is_game_closed = state_manager.is_game_closed
-        today_seed = state_manager.today_seed
+        adopt_state(state_manager.snapshot)
         
         logging.debug("Game state loaded from server-side storage")
         return True
     except Exception as e:
         logging.error(f"Error loading state from storage: {e}")
         return False
+
+
+def adopt_state(state: "StateSnapshot") -> None:
+    """
+    Set the game globals from a state manager snapshot.
+
+    Args:
+        state: The snapshot; the globals get mutable copies, since they are
+            changed in place
+    """
+    global board, clicked_tiles, clicked_mask, bingo_patterns, board_iteration
+    global is_game_closed, today_seed
+    board = [list(row) for row in state.board]
+    clicked_tiles = set(state.clicked_tiles)
+    clicked_mask = tiles_to_mask(clicked_tiles)
+    bingo_patterns = set(state.bingo_patterns)
+    board_iteration = state.board_iteration
+    is_game_closed = state.is_game_closed
+    today_seed = state.today_seed
+
+
+def follow_state_reloads(event: StateEvent) -> None:
+    """
+    State listener that adopts a state another process saved.
+
+    Board views are rebuilt if the board changed or the game was reopened;
+    otherwise each client's own subscription restyles its tiles or shows
+    the closed message.
+
+    Args:
+        event: Any state event; only STATE_RELOADED is acted on
+    """
+    if event.kind != STATE_RELOADED:
+        return
+    from src.core.state_manager import get_state_manager
+
+    old_board, was_closed = board, is_game_closed
+    adopt_state(get_state_manager().snapshot)
+    if is_game_closed or (board == old_board and not was_closed):
+        return
+
+    from src.ui.board_builder import rebuild_board
+    from src.ui.controls import rebuild_controls_row
+
+    if was_closed and controls_row is not None:
+        rebuild_controls_row(controls_row)
+    for view_key, (container, tile_buttons_local) in board_views.items():
+        container.style("display: block;")
+        container.clear()
+        tile_buttons_local.clear()
+        rebuild_board(container, tile_buttons_local, toggle_tile, board, clicked_tiles)
+        container.update()
+    if seed_label is not None:
+        seed_label.set_text(f"Seed: {today_seed}")
+        seed_label.update()
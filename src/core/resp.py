@@ -0,0 +1,326 @@
+"""
+A minimal Redis protocol (RESP2) client and stand-in server.
+
+The client is just enough for RedisStateBackend: commands and their
+replies, and pub/sub messages, over one asyncio connection each; it needs
+no Redis client library. RespServer speaks the same subset (strings,
+pub/sub and optimistic transactions, no persistence), so integration
+tests and local runs of several replicas need no Redis installation.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
+
+CRLF = b"\r\n"
+
+RespValue = Union[None, int, bytes, str, List[Any], "RespError"]
+
+
+class RespError(Exception):
+    """An error reply from the server."""
+
+
+def encode_command(*args: Union[str, bytes, int]) -> bytes:
+    """Encode a command as an array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, int):
+            arg = str(arg)
+        if isinstance(arg, str):
+            arg = arg.encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def encode_reply(value: RespValue) -> bytes:
+    """
+    Encode a server reply. Strings are simple strings, bytes bulk strings,
+    None the null bulk string.
+    """
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-%s\r\n" % str(value).encode()
+    if isinstance(value, bool) or not isinstance(value, (int, str, bytes, list)):
+        raise TypeError(f"Cannot encode {value!r} as a reply")
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> RespValue:
+    """
+    Read one reply (or, on the server side, one command).
+
+    Returns:
+        Simple strings as str, bulk strings as bytes, integers as int,
+        arrays as lists; error replies are returned as RespError, not raised
+
+    Raises:
+        ConnectionError: If the connection closed
+        ValueError: If the data is not RESP
+    """
+    line = await reader.readline()
+    if not line.endswith(CRLF):
+        raise ConnectionError("Connection closed")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode()
+    if prefix == b"-":
+        return RespError(payload.decode())
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ValueError(f"Not a RESP reply: {line[:32]!r}")
+
+
+class RespConnection:
+    """One connection to a Redis-protocol server."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self._lock = asyncio.Lock()  # One command and its reply at a time
+
+    @classmethod
+    async def open(cls, url: str) -> "RespConnection":
+        """
+        Connect to redis://[:password@]host[:port][/db].
+
+        Raises:
+            OSError: If the server cannot be reached
+            RespError: If authentication or selecting the database fails
+        """
+        parsed = urlparse(url)
+        reader, writer = await asyncio.open_connection(
+            parsed.hostname or "localhost", parsed.port or 6379
+        )
+        conn = cls(reader, writer)
+        if parsed.password:
+            await conn.execute("AUTH", parsed.password)
+        db = parsed.path.lstrip("/")
+        if db and db != "0":
+            await conn.execute("SELECT", db)
+        return conn
+
+    async def execute(self, *args: Union[str, bytes, int]) -> RespValue:
+        """
+        Send a command and return its reply.
+
+        Raises:
+            RespError: If the server replied with an error
+        """
+        async with self._lock:
+            self.writer.write(encode_command(*args))
+            await self.writer.drain()
+            reply = await read_reply(self.reader)
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    async def read(self) -> RespValue:
+        """Read the next reply or message, e.g. on a subscribed connection."""
+        return await read_reply(self.reader)
+
+    async def send(self, *args: Union[str, bytes, int]) -> None:
+        """Send a command without waiting for a reply, e.g. SUBSCRIBE."""
+        self.writer.write(encode_command(*args))
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+@dataclass
+class _Session:
+    """What RespServer keeps per connection."""
+
+    subscribed: Set[bytes] = field(default_factory=set)
+    watched: Dict[bytes, int] = field(default_factory=dict)  # Key -> its revision
+    queued: Optional[List[Tuple[bytes, List[Any]]]] = None  # Inside MULTI
+
+
+class RespServer:
+    """
+    A stand-in Redis server with the commands the state backend uses:
+    PING, AUTH, SELECT, GET, SET, DEL, PUBLISH, SUBSCRIBE, UNSUBSCRIBE and
+    the WATCH/MULTI/EXEC transactions. Data lives in memory only.
+    """
+
+    def __init__(self) -> None:
+        self.data: Dict[bytes, bytes] = {}
+        self._revisions: Dict[bytes, int] = {}  # Bumped by every write to a key
+        self._channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        """The redis:// URL to connect to."""
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Start listening; port 0 picks a free port.
+
+        Returns:
+            The port
+        """
+        self._server = await asyncio.start_server(self._serve, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        """Stop listening and drop all connections."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        self._channels.clear()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer one client's commands until it disconnects."""
+        session = _Session()
+        self._clients.add(writer)
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    writer.write(
+                        encode_reply(RespError("ERR expected a command array"))
+                    )
+                    continue
+                name, args = command[0].upper(), command[1:]
+                for reply in self._execute(name, args, writer, session):
+                    writer.write(encode_reply(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logging.error(f"RESP stand-in server error: {e}")
+        finally:
+            for channel in session.subscribed:
+                self._channels.get(channel, set()).discard(writer)
+            self._clients.discard(writer)
+            writer.close()
+
+    def _execute(
+        self,
+        name: bytes,
+        args: List[Any],
+        writer: asyncio.StreamWriter,
+        session: _Session,
+    ) -> List[RespValue]:
+        """Run one command; returns its replies (SUBSCRIBE has one per channel)."""
+        if session.queued is not None and name not in (
+            b"EXEC",
+            b"DISCARD",
+            b"MULTI",
+            b"WATCH",
+        ):
+            session.queued.append((name, args))
+            return ["QUEUED"]
+        if name == b"WATCH" and args:
+            if session.queued is not None:
+                return [RespError("ERR WATCH inside MULTI is not allowed")]
+            for key in args:
+                session.watched[key] = self._revisions.get(key, 0)
+            return ["OK"]
+        if name == b"UNWATCH":
+            session.watched.clear()
+            return ["OK"]
+        if name == b"MULTI":
+            if session.queued is not None:
+                return [RespError("ERR MULTI calls can not be nested")]
+            session.queued = []
+            return ["OK"]
+        if name == b"DISCARD":
+            if session.queued is None:
+                return [RespError("ERR DISCARD without MULTI")]
+            session.queued = None
+            session.watched.clear()
+            return ["OK"]
+        if name == b"EXEC":
+            if session.queued is None:
+                return [RespError("ERR EXEC without MULTI")]
+            queued, session.queued = session.queued, None
+            watched, session.watched = session.watched, {}
+            if any(self._revisions.get(key, 0) != rev for key, rev in watched.items()):
+                return [None]  # Aborted: a watched key was written
+            return [
+                [
+                    reply
+                    for command in queued
+                    for reply in self._execute(*command, writer, session)
+                ]
+            ]
+        subscribed = session.subscribed
+        if name == b"PING":
+            return ["PONG"]
+        if name in (b"AUTH", b"SELECT"):
+            return ["OK"]
+        if name == b"GET" and len(args) == 1:
+            return [self.data.get(args[0])]
+        if name == b"SET" and len(args) == 2:
+            self.data[args[0]] = args[1]
+            self._touch(args[0])
+            return ["OK"]
+        if name == b"DEL" and args:
+            for key in args:
+                self._touch(key)
+            return [sum(self.data.pop(key, None) is not None for key in args)]
+        if name == b"PUBLISH" and len(args) == 2:
+            channel, message = args
+            receivers = list(self._channels.get(channel, ()))
+            for receiver in receivers:
+                receiver.write(encode_reply([b"message", channel, message]))
+            return [len(receivers)]
+        if name == b"SUBSCRIBE" and args:
+            replies: List[RespValue] = []
+            for channel in args:
+                self._channels.setdefault(channel, set()).add(writer)
+                subscribed.add(channel)
+                replies.append([b"subscribe", channel, len(subscribed)])
+            return replies
+        if name == b"UNSUBSCRIBE":
+            replies = []
+            for channel in args or list(subscribed):
+                self._channels.get(channel, set()).discard(writer)
+                subscribed.discard(channel)
+                replies.append([b"unsubscribe", channel, len(subscribed)])
+            return replies
+        return [RespError(f"ERR unknown command or arguments for {name.decode()!r}")]
+
+    def _touch(self, key: bytes) -> None:
+        """Record a write to a key, failing the transactions that watch it."""
+        self._revisions[key] = self._revisions.get(key, 0) + 1
@@ -0,0 +1,217 @@
+"""
+Bounded-latency debouncing of state saves.
+
+Changes are saved once they have been quiet for a short delay, so a burst of
+clicks becomes one save; but never later than a maximum latency after the
+oldest unsaved change, so a continuous click storm cannot postpone saving
+indefinitely. One long-lived task per event loop does the waiting; marking a
+change only updates counters and timestamps. A failed flush keeps its changes
+pending and is retried with exponential backoff, without waiting for another
+change.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+SAVE_DELAY = 0.5  # Seconds without changes before saving
+SAVE_MAX_LATENCY = 2.0  # Seconds an unsaved change may wait at most
+RATE_WINDOW = 60.0  # Seconds over which flushes/sec is measured
+SAVE_RETRY_DELAY = 1.0  # Seconds before retrying a failed flush, doubled per failure
+SAVE_RETRY_MAX_DELAY = 30.0
+
+SAVE_DELAY_ENV = "BINGO_SAVE_DELAY"
+SAVE_MAX_LATENCY_ENV = "BINGO_SAVE_MAX_LATENCY"
+
+
+@dataclass
+class DebounceMetrics:
+    """Counts of debounced saves, to tune durability against I/O cost."""
+
+    flushes: int = 0  # Total since startup
+    changes_flushed: int = 0
+    last_flush_changes: int = 0  # Changes coalesced into the most recent flush
+    last_flush_latency: float = 0.0  # Age of its oldest change, in seconds
+    max_flush_latency: float = 0.0
+    failures: int = 0  # Flushes that failed and were retried
+    _recent: Deque[float] = field(default_factory=deque, repr=False)  # Flush times
+
+    def record_flush(self, changes: int, latency: float, now: float) -> None:
+        """Record one flush of `changes` changes, the oldest `latency` seconds old."""
+        self.flushes += 1
+        self.changes_flushed += changes
+        self.last_flush_changes = changes
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+        self._recent.append(now)
+        self._trim(now)
+
+    def flushes_per_sec(self, now: float) -> float:
+        """Return the flush rate over the last RATE_WINDOW seconds."""
+        self._trim(now)
+        return len(self._recent) / RATE_WINDOW
+
+    @property
+    def coalesced_per_flush(self) -> float:
+        """Average changes saved per flush."""
+        return self.changes_flushed / self.flushes if self.flushes else 0.0
+
+    def _trim(self, now: float) -> None:
+        """Forget flushes older than the rate window."""
+        while self._recent and self._recent[0] < now - RATE_WINDOW:
+            self._recent.popleft()
+
+
+class SaveDebouncer:
+    """Calls a flush function for marked changes, with bounded latency."""
+
+    def __init__(
+        self,
+        flush: Callable[[], Awaitable[Any]],
+        delay: float = SAVE_DELAY,
+        max_latency: float = SAVE_MAX_LATENCY,
+        retry_delay: float = SAVE_RETRY_DELAY,
+        max_retry_delay: float = SAVE_RETRY_MAX_DELAY,
+    ) -> None:
+        """
+        Args:
+            flush: Saves all pending changes; raises if they were not saved
+            delay: Seconds without changes before flushing
+            max_latency: Seconds after the oldest pending change by which
+                a flush starts, however busy
+            retry_delay: Seconds before retrying a failed flush; doubled
+                after each further failure
+            max_retry_delay: The longest wait between retries
+        """
+        self.flush = flush
+        self.delay = delay
+        self.max_latency = max(max_latency, delay)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max(max_retry_delay, retry_delay)
+        self.metrics = DebounceMetrics()
+        self.pending = 0  # Changes marked since the last flush started
+        self._first_change: Optional[float] = None
+        self._last_change = 0.0
+        self._failures = 0  # Consecutive failed flushes
+        self._retry_at = 0.0  # No flush before this (monotonic time), after a failure
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def mark(self, changes: int = 1) -> None:
+        """Note unsaved changes; must be called in the event loop."""
+        now = time.monotonic()
+        if self.pending == 0:
+            self._first_change = now
+        self.pending += changes
+        self._last_change = now
+        self._ensure_task()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def pending_age(self) -> float:
+        """Seconds the oldest unsaved change has waited, 0 if there is none."""
+        if self._first_change is None:
+            return 0.0
+        return time.monotonic() - self._first_change
+
+    def stats(self) -> Dict[str, float]:
+        """Return the current metrics, e.g. for the health endpoint."""
+        now = time.monotonic()
+        return {
+            "pending_changes": self.pending,
+            "pending_age": round(self.pending_age(), 3),
+            "flushes": self.metrics.flushes,
+            "flushes_per_sec": round(self.metrics.flushes_per_sec(now), 3),
+            "coalesced_per_flush": round(self.metrics.coalesced_per_flush, 2),
+            "last_flush_latency": round(self.metrics.last_flush_latency, 3),
+            "max_flush_latency": round(self.metrics.max_flush_latency, 3),
+            "failed_flushes": self.metrics.failures,
+        }
+
+    async def flush_now(self) -> int:
+        """
+        Stop waiting and flush the pending changes now, e.g. on shutdown.
+
+        Returns:
+            The number of changes flushed
+
+        Raises:
+            Exception: Whatever the flush function raised; the changes stay
+                pending
+        """
+        self.cancel()
+        return await self._flush()
+
+    def cancel(self) -> None:
+        """Stop the flush task; pending changes stay marked."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def _ensure_task(self) -> None:
+        """Start the flush task for the running event loop, if not running."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is loop
+        ):
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    def _due(self) -> float:
+        """Return when the pending changes must be flushed (monotonic time)."""
+        assert self._first_change is not None
+        due = min(self._last_change + self.delay, self._first_change + self.max_latency)
+        return max(due, self._retry_at)
+
+    async def _run(self) -> None:
+        """Flush pending changes when they are due; sleep while there are none."""
+        assert self._wakeup is not None
+        while True:
+            if self.pending == 0:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # Later changes push the quiet deadline back, so re-check on waking
+            wait = self._due() - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            try:
+                await self._flush()
+            except Exception as e:
+                logging.error(f"Debounced save failed, retrying: {e}")
+
+    async def _flush(self) -> int:
+        """
+        Flush the pending changes, if any, and record the flush. If it fails,
+        the changes are marked pending again and retried after a backoff.
+        """
+        changes, first_change = self.pending, self._first_change
+        if changes == 0:
+            return 0
+        self.pending = 0
+        self._first_change = None
+        now = time.monotonic()
+        try:
+            await self.flush()
+        except Exception:
+            # Changes marked during the flush are newer than these
+            self.pending += changes
+            self._first_change = first_change
+            self._failures += 1
+            self.metrics.failures += 1
+            backoff = self.retry_delay * 2 ** (self._failures - 1)
+            self._retry_at = time.monotonic() + min(backoff, self.max_retry_delay)
+            raise
+        self._failures = 0
+        self._retry_at = 0.0
+        self.metrics.record_flush(changes, now - (first_change or now), now)
+        return changes
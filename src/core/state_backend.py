@@ -0,0 +1,425 @@
+"""
+Pub/sub backends that replicate the game state across replicas.
+
+Each replica (pod or process) keeps its own GameStateManager. With a backend
+configured, a StateReplicator publishes every change a replica commits and
+applies the changes other replicas publish, so each replica can fan changes
+out to its own websocket clients. The backend also keeps the authoritative
+state, which a replica adopts when it starts and whenever it resubscribes.
+Replicas never overwrite that state with their own: each applies the changes
+it publishes to the stored state in an optimistic transaction, so changes
+made on two replicas at once both land.
+
+The backend is chosen with BINGO_PUBSUB_URL:
+
+- unset: no replication (a single replica)
+- memory://: an in-process hub, for tests and single-process development
+- redis://[:password@]host[:port][/db]: a Redis-protocol server
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    cast,
+)
+from urllib.parse import urlparse
+
+from src.core.resp import RespConnection, RespError
+from src.core.state_events import StateEvent
+from src.core.state_manager import apply_changes
+from src.core.state_store import StateDict
+
+if TYPE_CHECKING:
+    from src.core.state_manager import GameStateManager
+
+PUBSUB_URL_ENV = "BINGO_PUBSUB_URL"
+EVENTS_CHANNEL = "bingo:events"
+STATE_KEY = "bingo:state"
+RECONNECT_DELAY = 1.0  # Seconds before resubscribing after a lost connection
+
+# A published change: {"origin": replica id, "kind", "data", "version"}
+ChangeMessage = Dict[str, Any]
+
+# Works out the new authoritative state from the current one (None if none
+# was stored); returns None to leave it as it is
+StateUpdate = Callable[[Optional[StateDict]], Optional[StateDict]]
+
+
+class StateBackend(ABC):
+    """Publishes changes to all replicas and holds the authoritative state."""
+
+    @abstractmethod
+    async def publish(self, message: ChangeMessage) -> None:
+        """Send a change to every subscribed replica, including this one."""
+
+    @abstractmethod
+    def messages(self) -> AsyncGenerator[Optional[ChangeMessage], None]:
+        """
+        Yield None once subscribed, then the changes published from then on,
+        until closed. Use subscribe() rather than iterating this directly.
+        """
+
+    async def subscribe(self) -> AsyncGenerator[ChangeMessage, None]:
+        """
+        Subscribe to changes, and return them once the subscription is in
+        place: nothing published after this returns is missed.
+
+        Returns:
+            The changes; close it (aclose) to unsubscribe
+        """
+        messages = self.messages()
+        await messages.__anext__()  # Runs up to the subscription
+        return cast(AsyncGenerator[ChangeMessage, None], messages)
+
+    @abstractmethod
+    async def fetch_state(self) -> Optional[StateDict]:
+        """Return the authoritative state, or None if none was stored."""
+
+    @abstractmethod
+    async def update_state(self, update: StateUpdate) -> Optional[StateDict]:
+        """
+        Replace the authoritative state with update(current), atomically:
+        if another replica stores a state in between, update is called again
+        with that one.
+
+        Returns:
+            The authoritative state afterwards
+        """
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class LocalHub:
+    """What an in-process backend shares between the replicas using it."""
+
+    def __init__(self) -> None:
+        self.state: Optional[str] = None  # JSON, like the Redis key
+        self.subscribers: List["asyncio.Queue[str]"] = []
+
+
+class LocalStateBackend(StateBackend):
+    """
+    An in-process stand-in for a Redis backend. Messages and state go
+    through JSON just as they would over the network, so anything that
+    would not survive the trip fails here too.
+    """
+
+    def __init__(self, hub: Optional[LocalHub] = None) -> None:
+        """
+        Args:
+            hub: Shared with the other replicas' backends; a new one if None
+        """
+        self.hub = hub or LocalHub()
+
+    async def publish(self, message: ChangeMessage) -> None:
+        payload = json.dumps(message)
+        for queue in list(self.hub.subscribers):
+            queue.put_nowait(payload)
+
+    async def messages(self) -> AsyncGenerator[Optional[ChangeMessage], None]:
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self.hub.subscribers.append(queue)
+        try:
+            yield None
+            while True:
+                yield json.loads(await queue.get())
+        finally:
+            self.hub.subscribers.remove(queue)
+
+    async def fetch_state(self) -> Optional[StateDict]:
+        return json.loads(self.hub.state) if self.hub.state is not None else None
+
+    async def update_state(self, update: StateUpdate) -> Optional[StateDict]:
+        # Nothing awaits between the read and the write, so no replica can come between
+        current = await self.fetch_state()
+        state = update(current)
+        if state is None:
+            return current
+        self.hub.state = json.dumps(state)
+        return state
+
+
+class RedisStateBackend(StateBackend):
+    """
+    A Redis-protocol server: changes go through a pub/sub channel, the state
+    is a string key. Works with Redis, compatible servers and RespServer.
+    """
+
+    def __init__(
+        self, url: str, channel: str = EVENTS_CHANNEL, key: str = STATE_KEY
+    ) -> None:
+        """
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            channel: The pub/sub channel for changes
+            key: The key holding the state
+        """
+        self.url = url
+        self.channel = channel
+        self.key = key
+        self._conn: Optional[RespConnection] = (
+            None  # For commands; subscribers get their own
+        )
+        # For transactions, which must not interleave with other commands
+        self._tx_conn: Optional[RespConnection] = None
+        self._tx_lock = asyncio.Lock()
+
+    async def _connection(self) -> RespConnection:
+        """Connect on first use."""
+        if self._conn is None:
+            self._conn = await RespConnection.open(self.url)
+        return self._conn
+
+    async def _execute(self, *args: Any) -> Any:
+        """Run a command, reconnecting once if the connection was lost."""
+        try:
+            return await (await self._connection()).execute(*args)
+        except (ConnectionError, OSError):
+            await self.close()
+            return await (await self._connection()).execute(*args)
+
+    async def publish(self, message: ChangeMessage) -> None:
+        await self._execute("PUBLISH", self.channel, json.dumps(message))
+
+    async def messages(self) -> AsyncGenerator[Optional[ChangeMessage], None]:
+        conn = await RespConnection.open(self.url)
+        try:
+            await conn.send("SUBSCRIBE", self.channel)
+            # Messages only come after the server confirms the subscription
+            while True:
+                reply = await conn.read()
+                if isinstance(reply, RespError):
+                    raise reply
+                if isinstance(reply, list) and reply[:1] == [b"subscribe"]:
+                    break
+            yield None
+            while True:
+                reply = await conn.read()
+                if (
+                    isinstance(reply, list)
+                    and len(reply) == 3
+                    and reply[0] == b"message"
+                ):
+                    yield json.loads(reply[2])
+        finally:
+            await conn.close()
+
+    async def fetch_state(self) -> Optional[StateDict]:
+        data = await self._execute("GET", self.key)
+        return json.loads(data) if data is not None else None
+
+    async def update_state(self, update: StateUpdate) -> Optional[StateDict]:
+        async with self._tx_lock:
+            if self._tx_conn is None:
+                self._tx_conn = await RespConnection.open(self.url)
+            conn = self._tx_conn
+            try:
+                while True:
+                    # EXEC fails (None) if the key was written after WATCH
+                    await conn.execute("WATCH", self.key)
+                    data = await conn.execute("GET", self.key)
+                    current = json.loads(data) if data is not None else None
+                    state = update(current)
+                    if state is None:
+                        await conn.execute("UNWATCH")
+                        return current
+                    await conn.execute("MULTI")
+                    await conn.execute("SET", self.key, json.dumps(state))
+                    if await conn.execute("EXEC") is not None:
+                        return state
+            except (ConnectionError, OSError):
+                self._tx_conn = None
+                await conn.close()
+                raise
+
+    async def close(self) -> None:
+        for attr in ("_conn", "_tx_conn"):
+            conn = getattr(self, attr)
+            if conn is not None:
+                setattr(self, attr, None)
+                await conn.close()
+
+
+class StateReplicator:
+    """
+    Connects a GameStateManager to a StateBackend: publishes the changes
+    this replica commits, and applies those other replicas publish.
+    """
+
+    def __init__(
+        self,
+        manager: "GameStateManager",
+        backend: StateBackend,
+        replica_id: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            manager: This replica's state manager
+            backend: The backend shared by all replicas
+            replica_id: Tells this replica's messages apart; random if None
+        """
+        self.manager = manager
+        self.backend = backend
+        self.replica_id = replica_id or uuid.uuid4().hex
+        self.published = 0  # Changes sent to other replicas
+        self.received = 0  # Changes applied from other replicas
+        self.resubscribes = 0  # Subscriptions restored after being lost
+        self._outbox: "asyncio.Queue[StateEvent]" = asyncio.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    async def start(self) -> None:
+        """Subscribe, adopt the authoritative state, if any, then start replicating."""
+        self._loop = asyncio.get_running_loop()
+        subscription: Optional[AsyncGenerator[ChangeMessage, None]] = None
+        try:
+            subscription = await self.backend.subscribe()
+            await self._sync()
+        except Exception as e:
+            logging.error(f"Failed to join the shared state, retrying: {e}")
+        self._unsubscribe = self.manager.commits.subscribe(self._on_commit)
+        self._tasks = [
+            self._loop.create_task(self._push()),
+            self._loop.create_task(self._listen(subscription)),
+        ]
+
+    async def _sync(self) -> None:
+        """
+        Adopt the authoritative state, or make this replica's the
+        authoritative one if there is none yet. Called after subscribing,
+        so no change published since the state was read is missed; a change
+        the state already has may be applied again, which is harmless, as
+        every change sets the state rather than adjusting it.
+        """
+        ours = self.manager.get_full_state()
+
+        def keep_or_seed(current: Optional[StateDict]) -> Optional[StateDict]:
+            if current is not None and current.get("board"):
+                return None
+            return ours if ours.get("board") else None
+
+        shared = await self.backend.update_state(keep_or_seed)
+        if shared is not None and shared is not ours:
+            self.manager.adopt(shared)
+
+    async def stop(self) -> None:
+        """Send what is queued, then stop replicating."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        while not self._outbox.empty():
+            await self._send(self._take_queued())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.backend.close()
+
+    def _on_commit(self, event: StateEvent) -> None:
+        """Queue a committed change; commits may come from any thread."""
+        assert self._loop is not None
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._outbox.put_nowait, event)
+
+    def _take_queued(self) -> List[StateEvent]:
+        """Take every queued change."""
+        events = []
+        while not self._outbox.empty():
+            events.append(self._outbox.get_nowait())
+        return events
+
+    async def _push(self) -> None:
+        """Publish committed changes as they come."""
+        while True:
+            events = [await self._outbox.get()] + self._take_queued()
+            try:
+                await self._send(events)
+            except Exception as e:
+                logging.error(f"Failed to publish {len(events)} state changes: {e}")
+
+    async def _send(self, events: List[StateEvent]) -> None:
+        """Apply the changes to the authoritative state, then publish them."""
+
+        def merge(current: Optional[StateDict]) -> StateDict:
+            if current is None:
+                return self.manager.get_full_state()
+            return apply_changes(current, events)
+
+        await self.backend.update_state(merge)
+        for event in events:
+            await self.backend.publish(
+                {
+                    "origin": self.replica_id,
+                    "kind": event.kind,
+                    "data": event.data,
+                    "version": event.version,
+                }
+            )
+            self.published += 1
+
+    async def _listen(
+        self, subscription: Optional[AsyncGenerator[ChangeMessage, None]]
+    ) -> None:
+        """
+        Apply the changes other replicas publish. If the subscription is
+        lost, resubscribe and adopt the authoritative state, which has the
+        changes published in between.
+        """
+        while True:
+            try:
+                if subscription is None:
+                    subscription = await self.backend.subscribe()
+                    await self._sync()
+                    self.resubscribes += 1
+                async for message in subscription:
+                    if message.get("origin") == self.replica_id:
+                        continue
+                    self.manager.apply_remote(
+                        StateEvent(message["kind"], message["data"])
+                    )
+                    self.received += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"State subscription failed, resubscribing: {e}")
+            finally:
+                if subscription is not None:
+                    await subscription.aclose()
+                subscription = None
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+def create_state_backend(url: Optional[str] = None) -> Optional[StateBackend]:
+    """
+    Create the backend BINGO_PUBSUB_URL names.
+
+    Args:
+        url: Overrides BINGO_PUBSUB_URL
+
+    Returns:
+        The backend, or None if replication is not configured
+    """
+    url = url if url is not None else os.getenv(PUBSUB_URL_ENV, "")
+    if not url:
+        return None
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        return LocalStateBackend()
+    if scheme == "redis":
+        return RedisStateBackend(url)
+    logging.warning(f"Unknown pub/sub URL scheme {scheme!r}, not replicating state")
+    return None
@@ -0,0 +1,74 @@
+"""
+In-process state change notifications for the Bingo application.
+
+The GameStateManager publishes a StateEvent whenever the game changes so
+that connected clients can re-render on demand instead of polling.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Final, List
+
+# Event kinds published by the state manager
+TILE_TOGGLED: Final[str] = "tile_toggled"
+BOARD_RESET: Final[str] = "board_reset"
+BOARD_REPLACED: Final[str] = "board_replaced"
+GAME_CLOSED: Final[str] = "game_closed"
+GAME_REOPENED: Final[str] = "game_reopened"
+HEADER_CHANGED: Final[str] = "header_changed"
+PATTERN_ADDED: Final[str] = "pattern_added"
+STATE_REPLACED: Final[str] = "state_replaced"
+STATE_RELOADED: Final[str] = "state_reloaded"  # Changed by another process or replica
+
+
+@dataclass(frozen=True)
+class StateEvent:
+    """A single change to the game state."""
+
+    kind: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0  # State version after the change
+
+
+StateListener = Callable[[StateEvent], None]
+
+
+class StateEventBus:
+    """
+    Synchronous publish/subscribe bus for state change events.
+
+    Listeners are called in subscription order on the publisher's call stack,
+    so a change reaches every subscriber before the publishing call returns.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty bus."""
+        self._listeners: List[StateListener] = []
+
+    def subscribe(self, listener: StateListener) -> Callable[[], None]:
+        """
+        Register a listener for all state events.
+
+        Returns:
+            A callable that removes the listener again
+        """
+        self._listeners.append(listener)
+        return lambda: self.unsubscribe(listener)
+
+    def unsubscribe(self, listener: StateListener) -> None:
+        """Remove a listener; unknown listeners are ignored."""
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def publish(self, event: StateEvent) -> None:
+        """Deliver an event to every listener, isolating listener failures."""
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logging.debug(f"State listener failed for {event.kind}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._listeners)
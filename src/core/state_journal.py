@@ -0,0 +1,107 @@
+"""
+Append-only event journal for the Bingo game state.
+
+Each state change is one compact JSON line appended to the journal file, so
+saving a click is a small sequential write. The full state is only written
+as a snapshot when the journal is compacted; startup loads the snapshot and
+replays the journal entries recorded after it.
+
+The first line names the snapshot the journal continues, so entries are never
+replayed onto a snapshot that was replaced behind the journal's back.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+JournalEntry = Dict[str, Any]  # {"version": int, "kind": str, "data": dict}
+
+
+class StateJournal:
+    """An append-only file of JSON-encoded state change entries."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open the journal at the given path; the file is created on first append.
+
+        Args:
+            path: The journal file
+        """
+        self.path = path
+        self.snapshot_id: Optional[str] = None  # Snapshot the entries continue
+        self.entry_count = 0  # Entries in the file, counted by read() and append()
+        self.size_bytes = path.stat().st_size if path.exists() else 0
+
+    def append(self, entries: Iterable[JournalEntry]) -> int:
+        """
+        Append entries to the journal in a single write.
+
+        Returns:
+            The number of entries written
+        """
+        lines = [json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries]
+        if not lines:
+            return 0
+        data = "".join(lines)
+        with open(self.path, "a") as f:
+            f.write(data)
+        self.entry_count += len(lines)
+        self.size_bytes += len(data.encode())
+        return len(lines)
+
+    def read(self) -> List[JournalEntry]:
+        """
+        Read all complete entries and the snapshot they continue (snapshot_id).
+        A torn last line from a crash is cut off the file, so the next append
+        does not run on from it.
+
+        Returns:
+            The entries in append order
+        """
+        entries: List[JournalEntry] = []
+        self.snapshot_id = None
+        if not self.path.exists():
+            return entries
+        data = self.path.read_bytes()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            logging.warning(
+                f"Cutting off a torn journal entry at the end of {self.path}"
+            )
+            os.truncate(self.path, complete)
+            data = data[:complete]
+        for line_number, line in enumerate(
+            data.decode(errors="replace").splitlines(), 1
+        ):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning(
+                    f"Skipping unreadable journal entry {line_number} in {self.path}"
+                )
+                continue
+            if line_number == 1 and "snapshot" in entry:
+                self.snapshot_id = entry["snapshot"]
+            else:
+                entries.append(entry)
+        self.entry_count = len(entries)
+        self.size_bytes = self.path.stat().st_size
+        return entries
+
+    def truncate(self, snapshot_id: str) -> None:
+        """
+        Drop all entries, after their changes were written to a snapshot.
+
+        Args:
+            snapshot_id: The new snapshot, which later entries continue
+        """
+        header = json.dumps({"snapshot": snapshot_id}) + "\n"
+        with open(self.path, "w") as f:
+            f.write(header)
+        self.snapshot_id = snapshot_id
+        self.entry_count = 0
+        self.size_bytes = len(header.encode())
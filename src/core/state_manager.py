@@ -6,14 +6,58 @@ to the server's file system instead of relying on client-side storage.
 """
 
 import asyncio
-import json
 import logging
+import os
+import threading
 import time
-from dataclasses import dataclass, field
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from src.config.constants import FREE_SPACE_TEXT
+from src.core.save_debouncer import (
+    SAVE_DELAY,
+    SAVE_DELAY_ENV,
+    SAVE_MAX_LATENCY,
+    SAVE_MAX_LATENCY_ENV,
+    SaveDebouncer,
+)
+from src.core.state_events import (
+    BOARD_REPLACED,
+    BOARD_RESET,
+    GAME_CLOSED,
+    GAME_REOPENED,
+    HEADER_CHANGED,
+    PATTERN_ADDED,
+    STATE_RELOADED,
+    STATE_REPLACED,
+    TILE_TOGGLED,
+    StateEvent,
+    StateEventBus,
+    StateListener,
+)
+from src.core.state_journal import JournalEntry
+from src.core.state_snapshot import SnapshotError
+from src.core.state_store import (
+    JOURNAL_COMPACT_BYTES,
+    JOURNAL_COMPACT_ENTRIES,
+    JsonFileStore,
+    StateStore,
+    create_state_store,
+)
+from src.core.state_writer import StateWriter, get_state_writer
 
 if TYPE_CHECKING:
     from src.types.ui_types import BingoPatterns, BoardType, ClickedTiles, Coordinate
@@ -24,10 +68,25 @@ else:
     BingoPatterns = Set[str]
     Coordinate = Tuple[int, int]
 
+# Immutable counterparts, as readers see them
+BoardSnapshot = Tuple[Tuple[str, ...], ...]
+ClickedTilesSnapshot = FrozenSet[Tuple[int, int]]
+BingoPatternsSnapshot = FrozenSet[str]
+
+# How often to check whether another process saved the state (seconds)
+STORE_POLL_INTERVAL = 1.0
+STORE_POLL_INTERVAL_ENV = "BINGO_STORE_POLL_INTERVAL"
+
+# Seconds shutdown() may take to save pending changes; well within the
+# 30 seconds Kubernetes waits between SIGTERM and SIGKILL by default
+SHUTDOWN_DEADLINE = 5.0
+SHUTDOWN_DEADLINE_ENV = "BINGO_SHUTDOWN_DEADLINE"
+
 
 @dataclass
 class GameState:
     """Represents the complete game state."""
+
     board: BoardType = field(default_factory=list)
     clicked_tiles: ClickedTiles = field(default_factory=set)
     bingo_patterns: BingoPatterns = field(default_factory=set)
@@ -36,250 +95,780 @@ class GameState:
     today_seed: Optional[str] = None
     header_text: str = "BINGO!"
     timestamp: float = field(default_factory=time.time)
+    version: int = 0  # Monotonic, bumped by every mutation
+
+
+@dataclass(frozen=True, slots=True)
+class StateSnapshot:
+    """
+    An immutable copy of the game state at one version.
+
+    Every change builds a new snapshot and swaps it in; the manager never
+    changes one in place, so readers share it without locking or copying.
+    """
+
+    board: BoardSnapshot
+    clicked_tiles: ClickedTilesSnapshot
+    bingo_patterns: BingoPatternsSnapshot
+    is_game_closed: bool
+    board_iteration: int
+    today_seed: Optional[str]
+    header_text: str
+    timestamp: float
+    version: int
+
+    @classmethod
+    def of(cls, state: GameState) -> "StateSnapshot":
+        """Copy a (mutable) game state."""
+        return cls(
+            board=tuple(tuple(row) for row in state.board),
+            clicked_tiles=frozenset(state.clicked_tiles),
+            bingo_patterns=frozenset(state.bingo_patterns),
+            is_game_closed=state.is_game_closed,
+            board_iteration=state.board_iteration,
+            today_seed=state.today_seed,
+            header_text=state.header_text,
+            timestamp=state.timestamp,
+            version=state.version,
+        )
+
+
+# A change to make, worked out from the snapshot it applies to: (kind, data)
+Change = Tuple[str, Dict[str, Any]]
+
+
+def _with_free_space(board: BoardSnapshot) -> ClickedTilesSnapshot:
+    """Return the clicked tiles of a fresh board: the free space, if it has one."""
+    if len(board) > 2 and len(board[2]) > 2 and board[2][2] == FREE_SPACE_TEXT:
+        return frozenset({(2, 2)})
+    return frozenset()
+
+
+def _apply_change(
+    state: StateSnapshot, kind: str, data: Dict[str, Any]
+) -> StateSnapshot:
+    """
+    Return the state after one recorded change; the version is left as is.
+    Used both by the mutators and when replaying the journal.
+    """
+    if kind == TILE_TOGGLED:
+        pos = (data["row"], data["col"])
+        clicked = (
+            state.clicked_tiles | {pos}
+            if data["clicked"]
+            else state.clicked_tiles - {pos}
+        )
+        # Win patterns the toggle completed or broke, if the caller tracked them
+        patterns = state.bingo_patterns
+        if "won" in data or "lost" in data:
+            patterns = (patterns | set(data.get("won", ()))) - set(data.get("lost", ()))
+        return replace(state, clicked_tiles=clicked, bingo_patterns=patterns)
+    if kind == BOARD_RESET:
+        return replace(
+            state,
+            clicked_tiles=_with_free_space(state.board),
+            bingo_patterns=frozenset(),
+        )
+    if kind == BOARD_REPLACED:
+        board = tuple(tuple(row) for row in data["board"])
+        return replace(
+            state,
+            board=board,
+            board_iteration=data["iteration"],
+            today_seed=data.get("seed"),
+            clicked_tiles=_with_free_space(board),
+            bingo_patterns=frozenset(),
+        )
+    if kind == GAME_CLOSED:
+        return replace(
+            state,
+            is_game_closed=True,
+            header_text=data.get("header_text", state.header_text),
+        )
+    if kind == GAME_REOPENED:
+        return replace(
+            state,
+            is_game_closed=False,
+            header_text=data.get("header_text", state.header_text),
+        )
+    if kind == HEADER_CHANGED:
+        return replace(state, header_text=data["text"])
+    if kind == PATTERN_ADDED:
+        return replace(state, bingo_patterns=state.bingo_patterns | {data["pattern"]})
+    if kind == STATE_REPLACED:
+        return replace(
+            state,
+            board=tuple(tuple(row) for row in data["board"]),
+            board_iteration=data["board_iteration"],
+            today_seed=data.get("today_seed"),
+            clicked_tiles=frozenset(tuple(pos) for pos in data["clicked_tiles"]),
+            bingo_patterns=frozenset(data["bingo_patterns"]),
+            is_game_closed=data["is_game_closed"],
+            header_text=data["header_text"],
+        )
+    raise ValueError(f"Unknown state change: {kind}")
+
+
+def state_from_dict(data: Dict[str, Any]) -> StateSnapshot:
+    """Build a snapshot from a state dict, as saved or as in get_full_state."""
+    return StateSnapshot.of(
+        GameState(
+            board=data.get("board", []),
+            clicked_tiles=set(tuple(pos) for pos in data.get("clicked_tiles", [])),
+            bingo_patterns=set(data.get("bingo_patterns", [])),
+            is_game_closed=data.get("is_game_closed", False),
+            board_iteration=data.get("board_iteration", 1),
+            today_seed=data.get("today_seed"),
+            header_text=data.get("header_text", "BINGO!"),
+            timestamp=data.get("timestamp", time.time()),
+            version=data.get("version", 0),
+        )
+    )
+
+
+def state_to_dict(state: StateSnapshot) -> Dict[str, Any]:
+    """Return a snapshot as a JSON-serializable state dict."""
+    return {
+        "board": [list(row) for row in state.board],
+        "clicked_tiles": list(state.clicked_tiles),
+        "bingo_patterns": list(state.bingo_patterns),
+        "is_game_closed": state.is_game_closed,
+        "board_iteration": state.board_iteration,
+        "today_seed": state.today_seed,
+        "header_text": state.header_text,
+        "timestamp": state.timestamp,
+        "version": state.version,
+    }
+
+
+def apply_changes(
+    data: Dict[str, Any], changes: Iterable[StateEvent]
+) -> Dict[str, Any]:
+    """
+    Apply changes to a state dict, e.g. the state shared by the replicas.
+
+    Args:
+        data: The state, as in get_full_state
+        changes: The changes, as committed; each one advances the version by one
+
+    Returns:
+        The new state dict
+    """
+    state = state_from_dict(data)
+    for event in changes:
+        state = replace(
+            _apply_change(state, event.kind, event.data), version=state.version + 1
+        )
+    return state_to_dict(state)
 
 
 class GameStateManager:
     """
     Manages game state with server-side persistence.
-    
+
     This replaces the client-side app.storage.general approach with
     a proper server-side file storage solution.
+
+    Where the state is saved is up to the StateStore: by default a JSON
+    snapshot file with a journal of changes next to it (see JsonFileStore).
+    Saves are written off the event loop by a StateWriter thread.
+
+    The state is an immutable StateSnapshot that changes copy-on-write:
+    readers take the current snapshot without locking and never see a
+    change half made; writers build the next snapshot and swap it in with
+    a compare-and-swap, retrying against the newer snapshot if another
+    writer won. Only the swap itself is serialized, so no change waits for
+    another change's work, and none waits for a save.
+
+    Several processes may share the store: watch_store() notices when
+    another process saved and reloads the state, re-applying the changes
+    this process has not saved yet on top of it.
     """
-    
-    def __init__(self, state_file: Path = Path("game_state.json")):
-        """Initialize the state manager."""
-        self.state_file = state_file
-        self._state = GameState()
-        self._lock = asyncio.Lock()
-        self._save_lock = asyncio.Lock()
-        self._save_task = None
-        self._pending_save = False
-        
+
+    def __init__(
+        self,
+        state_file: Path = Path("game_state.json"),
+        compact_entries: int = JOURNAL_COMPACT_ENTRIES,
+        compact_bytes: int = JOURNAL_COMPACT_BYTES,
+        store: Optional[StateStore] = None,
+        writer: Optional[StateWriter] = None,
+        save_delay: float = SAVE_DELAY,
+        save_max_latency: float = SAVE_MAX_LATENCY,
+    ):
+        """
+        Initialize the state manager.
+
+        Args:
+            state_file: The snapshot file; the journal uses the same name
+                with a .journal suffix
+            compact_entries: Compact once the journal holds this many entries
+            compact_bytes: Compact once the journal grows to this many bytes
+            store: Where to persist the state; overrides the JSON file store
+                the other arguments describe
+            writer: The thread that writes to the store; defaults to the
+                global writer
+            save_delay: Seconds without changes before a debounced save
+            save_max_latency: Seconds a change waits for its debounced save
+                at most, even while changes keep coming
+        """
+        self.store = store or JsonFileStore(state_file, compact_entries, compact_bytes)
+        self._writer = writer
+        self._state = StateSnapshot.of(GameState())
+        # Guards the swap of _state and the changes queued for saving with it
+        self._swap_lock = threading.Lock()
+        self.saves = SaveDebouncer(self._flush_pending, save_delay, save_max_latency)
+        self._unjournaled: List[JournalEntry] = []  # Changes not yet persisted
+        self._snapshot_stale = False  # Forces the next save to write the full state
+        self.conflicts = 0  # Changes recomputed because another writer swapped first
+        self.reloads = 0  # Times the state was reloaded after another process saved
+        self._saves_submitted = 0
+        self._in_flight: Set["Future[bool]"] = set()  # Saves not yet written
+        self.shutdown_report: Optional[Dict[str, Any]] = None  # Set by shutdown()
+        self.events = StateEventBus()
+        # Every change committed here, as journaled, e.g. to replicate it
+        self.commits = StateEventBus()
+
         # Load existing state on initialization
         self._load_state_sync()
-    
+
+    @property
+    def state_file(self) -> Path:
+        """The file the store saves to."""
+        return self.store.path
+
+    @state_file.setter
+    def state_file(self, path: Path) -> None:
+        self.store.path = path
+
     def _load_state_sync(self) -> bool:
-        """Synchronously load state from file (for initialization)."""
-        if not self.state_file.exists():
-            logging.info("No existing state file found, starting fresh")
+        """
+        Synchronously load state from the store (for initialization).
+        Loads the saved state, then replays the changes recorded after it.
+        """
+        state = self._read_store()
+        if state is None:
             return False
-        
+        with self._swap_lock:
+            self._state = state
+        return True
+
+    def _read_store(self) -> Optional[StateSnapshot]:
+        """
+        Read the saved state and replay the changes recorded after it.
+
+        Returns:
+            The state, or None if nothing was saved or it cannot be read
+        """
         try:
-            with open(self.state_file, 'r') as f:
-                data = json.load(f)
-            
+            loaded = self.store.load()
+            if loaded is None:
+                logging.info("No existing state file found, starting fresh")
+                return None
+            data, changes = loaded
+
             # Validate and restore state
-            self._state = GameState(
-                board=data.get('board', []),
-                clicked_tiles=set(tuple(pos) for pos in data.get('clicked_tiles', [])),
-                bingo_patterns=set(data.get('bingo_patterns', [])),
-                is_game_closed=data.get('is_game_closed', False),
-                board_iteration=data.get('board_iteration', 1),
-                today_seed=data.get('today_seed'),
-                header_text=data.get('header_text', 'BINGO!'),
-                timestamp=data.get('timestamp', time.time())
-            )
-            
+            state = state_from_dict(data)
+
             logging.info(f"State loaded from {self.state_file}")
-            return True
-            
+
+        except SnapshotError as e:
+            # The store moved the damaged snapshots aside (*.corrupt), so the
+            # fresh state's saves do not rotate them away
+            logging.error(
+                f"State snapshot {self.state_file} is corrupt, starting fresh: {e}"
+            )
+            return None
         except Exception as e:
             logging.error(f"Failed to load state: {e}")
-            return False
-    
+            return None
+
+        return self._replay(state, changes)
+
+    def _replay(
+        self, state: StateSnapshot, changes: List[JournalEntry]
+    ) -> StateSnapshot:
+        """
+        Re-apply recorded changes newer than the loaded state.
+
+        Returns:
+            The state with the changes applied
+        """
+        replayed = 0
+        try:
+            for entry in changes:
+                if entry.get("version", 0) <= state.version:
+                    continue  # Already in the snapshot
+                state = replace(
+                    _apply_change(state, entry["kind"], entry.get("data", {})),
+                    version=entry["version"],
+                )
+                replayed += 1
+        except Exception as e:
+            logging.error(f"Failed to replay state journal: {e}")
+
+        if replayed:
+            logging.info(f"Replayed {replayed} journaled state changes")
+        return state
+
     async def load_state(self) -> bool:
         """Asynchronously load state from file."""
-        async with self._lock:
-            return self._load_state_sync()
-    
+        return self._load_state_sync()
+
+    async def refresh(self) -> bool:
+        """
+        Reload the state if another process saved it since this one last did.
+
+        Changes made here but not saved yet are re-applied on top of the
+        reloaded state, so they are neither lost nor saved twice. Subscribers
+        get a STATE_RELOADED event.
+
+        Returns:
+            True if the state was reloaded
+        """
+        if self._in_flight or not self.store.changed():
+            return False
+        submitted = self._saves_submitted
+        state = await asyncio.to_thread(self._read_store)
+        if state is None:
+            return False
+        with self._swap_lock:
+            if self._in_flight or self._saves_submitted != submitted:
+                return False  # Saved meanwhile; the next check reloads
+            pending = []
+            for entry in self._unjournaled:
+                state = replace(
+                    _apply_change(state, entry["kind"], entry["data"]),
+                    version=state.version + 1,
+                )
+                pending.append(dict(entry, version=state.version))
+            self._unjournaled = pending
+            self._state = state
+        self.reloads += 1
+        logging.info(f"Reloaded state version {state.version} saved by another process")
+        self.events.publish(StateEvent(STATE_RELOADED, {}, state.version))
+        return True
+
+    async def watch_store(self, interval: float = STORE_POLL_INTERVAL) -> None:
+        """Reload the state whenever another process saves it; runs until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.error(f"Failed to reload state: {e}")
+
     async def save_state(self, immediate: bool = False) -> bool:
         """
         Save state to file with debouncing.
-        
+
         Args:
-            immediate: If True, save immediately without debouncing
+            immediate: If True, save immediately without debouncing; skipped
+                if the saved state is already current
         """
         if immediate:
+            if not self.has_unsaved_changes and self.store.exists():
+                return True
             return await self._persist()
-        
-        # Mark that we need to save
-        self._pending_save = True
-        
-        # Cancel existing save task if any
-        if self._save_task and not self._save_task.done():
-            self._save_task.cancel()
-        
-        # Schedule a new save
-        self._save_task = asyncio.create_task(self._debounced_save())
+
+        self._schedule_save()
         return True
-    
-    async def _debounced_save(self):
-        """Save state after a short delay to batch updates."""
+
+    def _schedule_save(self) -> None:
+        """Have the debouncer save the recorded changes soon."""
+        self.saves.mark()
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """True if changes were made that are not handed to the writer yet."""
+        return bool(self._unjournaled) or self._snapshot_stale
+
+    async def shutdown(self, deadline: float = SHUTDOWN_DEADLINE) -> Dict[str, Any]:
+        """
+        Save all pending changes and have them written and synced, for the
+        app's shutdown hook. Gives up after the deadline rather than hold up
+        the shutdown.
+
+        Args:
+            deadline: Seconds the whole flush may take
+
+        Returns:
+            A report (also kept as shutdown_report): the seconds it took, the
+            changes saved, and whether everything was saved in time
+        """
+        started = time.monotonic()
+        changes = len(self._unjournaled)
+        completed = True
+        try:
+            await asyncio.wait_for(self._drain(), deadline)
+        except asyncio.TimeoutError:
+            completed = False
+        except Exception as e:
+            logging.error(f"Failed to save state on shutdown: {e}")
+            completed = False
+
+        # Write and fsync whatever is still queued, with the time that is left
+        remaining = max(0.0, deadline - (time.monotonic() - started))
+        if not await asyncio.to_thread(self.writer.stop, remaining):
+            completed = False
+
+        duration = time.monotonic() - started
+        self.shutdown_report = {
+            "duration": round(duration, 3),
+            "changes": changes,
+            "completed": completed,
+        }
+        if completed:
+            logging.info(
+                f"Saved {changes} pending state changes on shutdown in {duration:.3f}s"
+            )
+        else:
+            logging.warning(
+                f"State not fully saved within the {deadline}s shutdown deadline ({duration:.3f}s)"
+            )
+        return self.shutdown_report
+
+    async def _drain(self) -> None:
+        """Save everything pending and wait for all saves in flight."""
         try:
-            # Wait a bit for more changes
-            await asyncio.sleep(0.5)
-            
-            if self._pending_save:
-                await self._persist()
-                self._pending_save = False
-                
-        except asyncio.CancelledError:
-            # Task was cancelled, that's fine
-            pass
-    
+            await self.saves.flush_now()
+        except OSError:
+            pass  # The changes were kept, and are saved once more below
+        if self.has_unsaved_changes:
+            await self._persist()  # E.g. the retry of a failed save
+        in_flight = [asyncio.wrap_future(future) for future in list(self._in_flight)]
+        if in_flight:
+            await asyncio.wait(in_flight)
+
+    async def _flush_pending(self) -> None:
+        """
+        Save the changes the debouncer was waiting for, unless already saved.
+
+        Raises:
+            OSError: If the save failed; the changes are kept, and the
+                debouncer retries
+        """
+        if self.has_unsaved_changes and not await self._persist():
+            raise OSError("State save failed")
+
+    @property
+    def writer(self) -> StateWriter:
+        """The thread that writes to the store."""
+        return self._writer or get_state_writer()
+
+    def _submit(self) -> Tuple[List[JournalEntry], "Future[bool]"]:
+        """
+        Hand the changes since the last save to the writer thread.
+
+        Returns:
+            The changes and the future of their save
+        """
+        with self._swap_lock:
+            # Taken together, so the saved state includes exactly these changes
+            entries, self._unjournaled = self._unjournaled, []
+            full, self._snapshot_stale = self._snapshot_stale, False
+            state = self._snapshot_dict()
+            future = self.writer.submit(self.store, state, entries, full)
+            self._saves_submitted += 1
+            self._in_flight.add(future)
+        future.add_done_callback(self._in_flight.discard)
+        return entries, future
+
     async def _persist(self) -> bool:
-        """Persist state to file atomically."""
-        async with self._save_lock:
-            try:
-                # Prepare state data
-                state_dict = {
-                    'board': self._state.board,
-                    'clicked_tiles': list(self._state.clicked_tiles),
-                    'bingo_patterns': list(self._state.bingo_patterns),
-                    'is_game_closed': self._state.is_game_closed,
-                    'board_iteration': self._state.board_iteration,
-                    'today_seed': self._state.today_seed,
-                    'header_text': self._state.header_text,
-                    'timestamp': time.time()
-                }
-                
-                # Atomic write using temp file
-                temp_file = self.state_file.with_suffix('.tmp')
-                with open(temp_file, 'w') as f:
-                    json.dump(state_dict, f, indent=2)
-                
-                # Atomic rename
-                temp_file.rename(self.state_file)
-                
-                logging.debug(f"State saved to {self.state_file}")
-                return True
-                
-            except Exception as e:
-                logging.error(f"Failed to save state: {e}")
-                return False
-    
+        """Save the changes since the last save and wait until they are durable."""
+        entries, future = self._submit()
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception as e:
+            self._save_failed(entries, e)
+            return False
+
+    def _persist_blocking(self) -> bool:
+        """Like _persist, for callers outside the event loop."""
+        entries, future = self._submit()
+        try:
+            return future.result()
+        except Exception as e:
+            self._save_failed(entries, e)
+            return False
+
+    def _save_failed(self, entries: List[JournalEntry], error: Exception) -> None:
+        """Keep the changes of a failed save, and write everything next time."""
+        logging.error(f"Failed to save state: {error}")
+        with self._swap_lock:
+            # The next save then covers whatever this one lost
+            self._unjournaled = entries + self._unjournaled
+            self._snapshot_stale = True
+
+    def _snapshot_dict(self) -> Dict[str, Any]:
+        """Return the state to write when the store saves it whole."""
+        return dict(self.get_full_state(), timestamp=time.time())
+
+    def _commit(
+        self,
+        change: Callable[[StateSnapshot], Change],
+        local: bool = True,
+    ) -> Tuple[StateSnapshot, str, Dict[str, Any]]:
+        """
+        Make one change copy-on-write and queue it for saving.
+
+        The change is worked out against the current snapshot without any
+        lock held. The result is swapped in only if the snapshot is still
+        current (compare-and-swap); otherwise another writer committed first
+        and the change is worked out again against the newer snapshot.
+
+        Args:
+            change: Returns the change (kind and data) to make to a snapshot;
+                may be called more than once
+            local: The change was made here rather than received from
+                another replica, so subscribers to commits get it
+
+        Returns:
+            The new snapshot, and the kind and data of the change made
+        """
+        while True:
+            base = self._state
+            kind, data = change(base)
+            new = replace(_apply_change(base, kind, data), version=base.version + 1)
+            with self._swap_lock:
+                if self._state is base:
+                    self._state = new
+                    # Queued under the same lock, so the journal stays in version order
+                    self._unjournaled.append(
+                        {"version": new.version, "kind": kind, "data": data}
+                    )
+                    break
+                self.conflicts += 1
+        if local:
+            self.commits.publish(StateEvent(kind, data, new.version))
+        return new, kind, data
+
+    def apply(self, event: StateEvent) -> StateEvent:
+        """
+        Apply one change and schedule its save through the debounced path.
+
+        This is the cheap path for frequent changes such as clicks: only the
+        delta is applied and journaled. Unlike the mutators, apply does not
+        publish the event, so a caller can apply several changes and publish
+        once. It is safe to call from any thread.
+
+        Args:
+            event: The change (kind and data as journaled); its version is ignored
+
+        Returns:
+            The event with the version it produced
+        """
+        new, _, _ = self._commit(lambda state: (event.kind, event.data))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to debounce on, e.g. in a worker thread, which
+            # can simply wait for the save
+            self._persist_blocking()
+        else:
+            self._schedule_save()
+        return StateEvent(event.kind, event.data, new.version)
+
+    def apply_remote(self, event: StateEvent) -> StateEvent:
+        """
+        Apply a change another replica made, and tell subscribers the state
+        changed elsewhere (STATE_RELOADED). Must be called in the event loop.
+
+        Args:
+            event: The change as the other replica committed it
+
+        Returns:
+            The STATE_RELOADED event published
+        """
+        new, _, _ = self._commit(lambda state: (event.kind, event.data), local=False)
+        self._schedule_save()
+        reloaded = StateEvent(STATE_RELOADED, {}, new.version)
+        self.events.publish(reloaded)
+        return reloaded
+
+    def adopt(self, state: Dict[str, Any]) -> None:
+        """
+        Replace the state with one from elsewhere, e.g. the authoritative
+        state of the replicas, and tell subscribers (STATE_RELOADED).
+
+        Args:
+            state: The state, as in get_full_state
+        """
+        change = {
+            "board": state.get("board", []),
+            "board_iteration": state.get("board_iteration", 1),
+            "today_seed": state.get("today_seed"),
+            "clicked_tiles": state.get("clicked_tiles", []),
+            "bingo_patterns": state.get("bingo_patterns", []),
+            "is_game_closed": state.get("is_game_closed", False),
+            "header_text": state.get("header_text", "BINGO!"),
+        }
+        new, _, _ = self._commit(lambda current: (STATE_REPLACED, change), local=False)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._persist_blocking()
+        else:
+            self._schedule_save()
+        self.events.publish(StateEvent(STATE_RELOADED, {}, new.version))
+
+    async def _mutate(
+        self, change: Callable[[StateSnapshot], Change], publish: bool = True
+    ) -> Tuple[StateSnapshot, str, Dict[str, Any]]:
+        """Commit one change for a mutator, schedule its save and publish it."""
+        new, kind, data = self._commit(change)
+        await self.save_state()
+        if publish:
+            self.events.publish(StateEvent(kind, data, new.version))
+        return new, kind, data
+
+    async def compact(self) -> bool:
+        """Write the full state now, e.g. to empty the JSON store's journal."""
+        with self._swap_lock:
+            self._snapshot_stale = True
+        return await self._persist()
+
+    def subscribe(self, listener: StateListener) -> Callable[[], None]:
+        """
+        Subscribe to state change events.
+
+        Returns:
+            A callable that cancels the subscription
+        """
+        return self.events.subscribe(listener)
+
+    def publish(self, kind: str, **data: Any) -> None:
+        """Publish a state change event to all subscribers."""
+        self.events.publish(StateEvent(kind, data, self._state.version))
+
     async def toggle_tile(self, row: int, col: int) -> bool:
         """Toggle a tile's clicked state."""
-        async with self._lock:
-            pos = (row, col)
-            
-            if pos in self._state.clicked_tiles:
-                self._state.clicked_tiles.remove(pos)
-                clicked = False
-            else:
-                self._state.clicked_tiles.add(pos)
-                clicked = True
-            
-            # Save state asynchronously
-            await self.save_state()
-            
-            return clicked
-    
+
+        def toggle(state: StateSnapshot) -> Change:
+            clicked = (row, col) not in state.clicked_tiles
+            return TILE_TOGGLED, {"row": row, "col": col, "clicked": clicked}
+
+        _, _, data = await self._mutate(toggle)
+        return data["clicked"]
+
     async def reset_board(self) -> None:
         """Reset all clicked tiles."""
-        async with self._lock:
-            self._state.clicked_tiles.clear()
-            self._state.bingo_patterns.clear()
-            
-            # Add free space back if board exists
-            if len(self._state.board) > 2:
-                free_pos = (2, 2)
-                if self._state.board[2][2] == FREE_SPACE_TEXT:
-                    self._state.clicked_tiles.add(free_pos)
-            
-            await self.save_state()
-    
+        await self._mutate(lambda state: (BOARD_RESET, {}))
+
     async def close_game(self) -> None:
         """Close the game."""
-        async with self._lock:
-            self._state.is_game_closed = True
-            await self.save_state()
-    
+        await self._mutate(lambda state: (GAME_CLOSED, {}))
+
     async def reopen_game(self) -> None:
         """Reopen the game."""
-        async with self._lock:
-            self._state.is_game_closed = False
-            await self.save_state()
-    
-    async def update_board(self, board: BoardType, iteration: int, 
-                          seed: Optional[str] = None) -> None:
+        await self._mutate(lambda state: (GAME_REOPENED, {}))
+
+    async def update_board(
+        self, board: BoardType, iteration: int, seed: Optional[str] = None
+    ) -> None:
         """Update the board configuration."""
-        async with self._lock:
-            self._state.board = board
-            self._state.board_iteration = iteration
-            self._state.today_seed = seed
-            
-            # Reset clicked tiles for new board
-            self._state.clicked_tiles.clear()
-            self._state.bingo_patterns.clear()
-            
-            # Add free space
-            if len(board) > 2 and len(board[2]) > 2:
-                if board[2][2] == FREE_SPACE_TEXT:
-                    self._state.clicked_tiles.add((2, 2))
-            
-            await self.save_state()
-    
+        # Clears clicked tiles for the new board, except the free space
+        change = {"board": board, "iteration": iteration, "seed": seed}
+        new, _, _ = await self._mutate(
+            lambda state: (BOARD_REPLACED, change), publish=False
+        )
+        self.events.publish(
+            StateEvent(
+                BOARD_REPLACED, {"iteration": iteration, "seed": seed}, new.version
+            )
+        )
+
     async def update_header_text(self, text: str) -> None:
         """Update the header text."""
-        async with self._lock:
-            self._state.header_text = text
-            await self.save_state()
-    
+        await self._mutate(lambda state: (HEADER_CHANGED, {"text": text}))
+
     async def add_bingo_pattern(self, pattern: str) -> None:
         """Add a winning bingo pattern."""
-        async with self._lock:
-            self._state.bingo_patterns.add(pattern)
-            await self.save_state()
-    
-    # Property accessors (read-only)
+        await self._mutate(
+            lambda state: (PATTERN_ADDED, {"pattern": pattern}), publish=False
+        )
+
+    async def replace_state(
+        self,
+        board: BoardType,
+        board_iteration: int,
+        today_seed: Optional[str],
+        clicked_tiles: ClickedTiles,
+        bingo_patterns: BingoPatterns,
+        is_game_closed: bool,
+        header_text: str,
+        immediate: bool = False,
+    ) -> None:
+        """
+        Overwrite the whole game state, e.g. to mirror the game logic globals.
+        Like every other change, it advances the version by one.
+        """
+        change = {
+            "board": board,
+            "board_iteration": board_iteration,
+            "today_seed": today_seed,
+            "clicked_tiles": [list(pos) for pos in clicked_tiles],
+            "bingo_patterns": list(bingo_patterns),
+            "is_game_closed": is_game_closed,
+            "header_text": header_text,
+        }
+        self._commit(lambda state: (STATE_REPLACED, change))
+
+        await self.save_state(immediate=immediate)
+
+    # Property accessors (read-only, lock-free)
     @property
-    def board(self) -> BoardType:
-        """Get current board."""
-        return self._state.board.copy()
-    
+    def snapshot(self) -> StateSnapshot:
+        """
+        Get the current state as an immutable snapshot.
+
+        Read several fields from one snapshot to see them consistently; two
+        property reads may straddle a change.
+        """
+        return self._state
+
+    @property
+    def board(self) -> BoardSnapshot:
+        """Get current board, as a tuple of rows."""
+        return self._state.board
+
     @property
-    def clicked_tiles(self) -> ClickedTiles:
+    def clicked_tiles(self) -> ClickedTilesSnapshot:
         """Get clicked tiles."""
-        return self._state.clicked_tiles.copy()
-    
+        return self._state.clicked_tiles
+
     @property
     def is_game_closed(self) -> bool:
         """Check if game is closed."""
         return self._state.is_game_closed
-    
+
     @property
     def board_iteration(self) -> int:
         """Get board iteration."""
         return self._state.board_iteration
-    
+
     @property
     def today_seed(self) -> Optional[str]:
         """Get today's seed."""
         return self._state.today_seed
-    
+
     @property
     def header_text(self) -> str:
         """Get header text."""
         return self._state.header_text
-    
+
     @property
-    def bingo_patterns(self) -> BingoPatterns:
+    def version(self) -> int:
+        """Get the state version, which changes whenever the state does."""
+        return self._state.version
+
+    @property
+    def bingo_patterns(self) -> BingoPatternsSnapshot:
         """Get bingo patterns."""
-        return self._state.bingo_patterns.copy()
-    
+        return self._state.bingo_patterns
+
     def get_full_state(self) -> Dict[str, Any]:
         """Get the complete game state as a dictionary."""
-        return {
-            'board': self._state.board,
-            'clicked_tiles': list(self._state.clicked_tiles),
-            'bingo_patterns': list(self._state.bingo_patterns),
-            'is_game_closed': self._state.is_game_closed,
-            'board_iteration': self._state.board_iteration,
-            'today_seed': self._state.today_seed,
-            'header_text': self._state.header_text,
-            'timestamp': self._state.timestamp
-        }
+        return state_to_dict(self._state)
 
 
 # Global state manager instance
@@ -287,8 +876,15 @@ _state_manager: Optional[GameStateManager] = None
 
 
 def get_state_manager() -> GameStateManager:
-    """Get or create the global state manager instance."""
+    """
+    Get or create the global state manager instance.
+    The debounced save timing comes from BINGO_SAVE_DELAY and BINGO_SAVE_MAX_LATENCY.
+    """
     global _state_manager
     if _state_manager is None:
-        _state_manager = GameStateManager()
-    return _state_manager
\ No newline at end of file
+        _state_manager = GameStateManager(
+            store=create_state_store(),
+            save_delay=float(os.getenv(SAVE_DELAY_ENV, SAVE_DELAY)),
+            save_max_latency=float(os.getenv(SAVE_MAX_LATENCY_ENV, SAVE_MAX_LATENCY)),
+        )
+    return _state_manager
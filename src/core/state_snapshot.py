@@ -0,0 +1,251 @@
+"""
+Compact binary snapshot format for the Bingo game state.
+
+A snapshot is a few hundred bytes instead of a pretty-printed JSON document:
+phrases are stored as indices into a phrase table kept next to the snapshot
+(only rewritten when a board brings new phrases), clicked tiles and the
+built-in win patterns as bitmasks. Layout, little-endian:
+
+    header      magic "BNGS", format version (u8), flags (u8), rows (u8), cols (u8)
+    counters    state version (u64), board iteration (u32), timestamp (f64)
+    phrases     phrase table digest (8 bytes), rows * cols phrase indices (u16)
+    bitmasks    clicked tiles (u32, bit row * 5 + col), built-in patterns (u32,
+                bit = position in BUILTIN_PATTERNS)
+    strings     seed, header text, snapshot id, then a u8 count of other
+                pattern names; each string is a u16 length and UTF-8 bytes
+    trailer     CRC-32 of everything before it (u32)
+
+Any truncation, bit flip or foreign file fails the checksum or the header
+checks and raises SnapshotError. For debugging, BinaryFileStore.export_json
+and scripts/export_state.py give the state as JSON.
+"""
+
+import hashlib
+import json
+import struct
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.win_patterns import BOARD_SIZE, default_patterns
+
+MAGIC = b"BNGS"
+FORMAT_VERSION = 1
+
+FLAG_GAME_CLOSED = 0x01
+
+# Built-in patterns in bit order; append only, or bump FORMAT_VERSION
+BUILTIN_PATTERNS: Tuple[str, ...] = tuple(p.name for p in default_patterns())
+
+_HEADER = struct.Struct("<4sBBBB")
+_COUNTERS = struct.Struct("<QId")
+_DIGEST_SIZE = 8
+_MASKS = struct.Struct("<II")
+_LENGTH = struct.Struct("<H")
+_CHECKSUM = struct.Struct("<I")
+
+StateDict = Dict[str, Any]
+
+
+class SnapshotError(ValueError):
+    """A snapshot is corrupt, truncated or in an unknown format."""
+
+
+class PhraseTable:
+    """The phrases snapshot boards index into, identified by a digest."""
+
+    def __init__(self, phrases: Iterable[str] = ()) -> None:
+        """
+        Args:
+            phrases: The phrases, in index order; duplicates are dropped
+        """
+        self.phrases: Tuple[str, ...] = tuple(dict.fromkeys(phrases))
+        self.index: Dict[str, int] = {p: i for i, p in enumerate(self.phrases)}
+        encoded = json.dumps(self.phrases, ensure_ascii=False).encode()
+        self.digest = hashlib.blake2b(encoded, digest_size=_DIGEST_SIZE).digest()
+
+    def covers(self, board: Sequence[Sequence[str]]) -> bool:
+        """Return True if every phrase of the board is in the table."""
+        return all(phrase in self.index for row in board for phrase in row)
+
+    def extended(self, board: Sequence[Sequence[str]]) -> "PhraseTable":
+        """Return a table with the board's missing phrases appended."""
+        return PhraseTable(self.phrases + tuple(p for row in board for p in row))
+
+    def to_json(self) -> str:
+        """Serialize the table for the phrase table file."""
+        return json.dumps(list(self.phrases), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "PhraseTable":
+        """Parse a phrase table file."""
+        return cls(json.loads(text))
+
+
+def _pack_string(value: Optional[str]) -> bytes:
+    """Encode a string as a u16 length and UTF-8 bytes; None is the empty string."""
+    encoded = (value or "").encode()
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def encode_snapshot(state: StateDict, table: PhraseTable) -> bytes:
+    """
+    Encode a state (as in GameStateManager.get_full_state) as a snapshot.
+
+    Args:
+        state: The state, including its snapshot_id
+        table: A phrase table covering the board
+
+    Raises:
+        SnapshotError: If the state cannot be represented, e.g. a phrase is
+            missing from the table or a clicked tile is off the board
+    """
+    board = state.get("board") or []
+    rows = len(board)
+    cols = len(board[0]) if rows else 0
+    if any(len(row) != cols for row in board) or rows > 255 or cols > 255:
+        raise SnapshotError("Board is not a rectangle of at most 255x255 tiles")
+    try:
+        indices = [table.index[phrase] for row in board for phrase in row]
+    except KeyError as e:
+        raise SnapshotError(f"Phrase missing from the phrase table: {e}") from None
+
+    clicked = 0
+    for row, col in state.get("clicked_tiles", ()):
+        if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
+            raise SnapshotError(f"Clicked tile off the board: {(row, col)}")
+        clicked |= 1 << (row * BOARD_SIZE + col)
+
+    patterns = 0
+    other_patterns: List[str] = []
+    for name in sorted(state.get("bingo_patterns", ())):
+        if name in BUILTIN_PATTERNS:
+            patterns |= 1 << BUILTIN_PATTERNS.index(name)
+        else:
+            other_patterns.append(name)
+    if len(other_patterns) > 255:
+        raise SnapshotError("Too many custom win patterns")
+
+    flags = FLAG_GAME_CLOSED if state.get("is_game_closed") else 0
+    parts = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, flags, rows, cols),
+        _COUNTERS.pack(
+            state.get("version", 0),
+            state.get("board_iteration", 1),
+            state.get("timestamp", 0.0),
+        ),
+        table.digest,
+        struct.pack(f"<{len(indices)}H", *indices),
+        _MASKS.pack(clicked, patterns),
+        _pack_string(state.get("today_seed")),
+        _pack_string(state.get("header_text")),
+        _pack_string(state.get("snapshot_id")),
+        bytes([len(other_patterns)]),
+    ]
+    parts.extend(_pack_string(name) for name in other_patterns)
+    body = b"".join(parts)
+    return body + _CHECKSUM.pack(zlib.crc32(body))
+
+
+def _verified_body(data: bytes) -> bytes:
+    """Check the trailer checksum and the header; return the checksummed bytes."""
+    if len(data) < _HEADER.size + _CHECKSUM.size:
+        raise SnapshotError(f"Snapshot is truncated ({len(data)} bytes)")
+    body, trailer = data[: -_CHECKSUM.size], data[-_CHECKSUM.size :]
+    if data[:4] != MAGIC:
+        raise SnapshotError("Not a state snapshot")
+    (checksum,) = _CHECKSUM.unpack(trailer)
+    if zlib.crc32(body) != checksum:
+        raise SnapshotError("Snapshot checksum mismatch")
+    format_version = body[4]
+    if format_version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version {format_version}")
+    return body
+
+
+def snapshot_table_digest(data: bytes) -> bytes:
+    """
+    Return the digest of the phrase table a snapshot needs.
+
+    Raises:
+        SnapshotError: If the snapshot is corrupt
+    """
+    body = _verified_body(data)
+    offset = _HEADER.size + _COUNTERS.size
+    return body[offset : offset + _DIGEST_SIZE]
+
+
+def _set_bits(mask: int) -> List[int]:
+    """Return the positions of the set bits of a mask, lowest first."""
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low.bit_length() - 1)
+        mask ^= low
+    return bits
+
+
+def decode_snapshot(data: bytes, table: PhraseTable) -> StateDict:
+    """
+    Decode a snapshot into a state dict.
+
+    Args:
+        data: The snapshot
+        table: The phrase table with the digest the snapshot names
+
+    Raises:
+        SnapshotError: If the snapshot is corrupt or the table does not match
+    """
+    body = _verified_body(data)
+    try:
+        _, _, flags, rows, cols = _HEADER.unpack_from(body, 0)
+        offset = _HEADER.size
+        version, board_iteration, timestamp = _COUNTERS.unpack_from(body, offset)
+        offset += _COUNTERS.size
+        if body[offset : offset + _DIGEST_SIZE] != table.digest:
+            raise SnapshotError("Snapshot does not match the phrase table")
+        offset += _DIGEST_SIZE
+
+        indices = struct.unpack_from(f"<{rows * cols}H", body, offset)
+        offset += 2 * rows * cols
+        board = [
+            [table.phrases[i] for i in indices[r * cols : (r + 1) * cols]]
+            for r in range(rows)
+        ]
+
+        clicked, patterns = _MASKS.unpack_from(body, offset)
+        offset += _MASKS.size
+
+        strings: List[str] = []
+        for _ in range(3):
+            (length,) = _LENGTH.unpack_from(body, offset)
+            offset += _LENGTH.size
+            strings.append(body[offset : offset + length].decode())
+            offset += length
+        seed, header_text, snapshot_id = strings
+
+        other_patterns: List[str] = []
+        count = body[offset]
+        offset += 1
+        for _ in range(count):
+            (length,) = _LENGTH.unpack_from(body, offset)
+            offset += _LENGTH.size
+            other_patterns.append(body[offset : offset + length].decode())
+            offset += length
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(f"Snapshot is malformed: {e}") from None
+    if offset != len(body):
+        raise SnapshotError("Snapshot has trailing data")
+
+    return {
+        "board": board,
+        "clicked_tiles": [list(divmod(bit, BOARD_SIZE)) for bit in _set_bits(clicked)],
+        "bingo_patterns": [BUILTIN_PATTERNS[bit] for bit in _set_bits(patterns)]
+        + other_patterns,
+        "is_game_closed": bool(flags & FLAG_GAME_CLOSED),
+        "board_iteration": board_iteration,
+        "today_seed": seed or None,
+        "header_text": header_text,
+        "timestamp": timestamp,
+        "version": version,
+        "snapshot_id": snapshot_id or None,
+    }
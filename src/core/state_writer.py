@@ -0,0 +1,223 @@
+"""
+Background writer for the Bingo game state.
+
+Saving the state means file (or database) I/O, which must not run on the
+asyncio event loop that also serves every client's websocket. Saves are
+submitted to a queue instead and written by one writer thread, which
+coalesces everything queued for a store into a single write (group commit).
+
+Each submitted save returns a future that completes once the save is as
+durable as the fsync policy makes it:
+
+- none: after the write; the OS flushes it to disk when it sees fit
+- commit: after the write and an fsync
+- interval: after the next fsync, which happens at most every fsync_interval
+  seconds, so a burst of saves shares one fsync
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.core.state_journal import JournalEntry
+from src.core.state_store import StateDict, StateStore
+
+# fsync policies
+FSYNC_NONE = "none"
+FSYNC_COMMIT = "commit"
+FSYNC_INTERVAL = "interval"
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_COMMIT, FSYNC_INTERVAL)
+
+FSYNC_POLICY_ENV = "BINGO_FSYNC"
+FSYNC_INTERVAL_ENV = "BINGO_FSYNC_INTERVAL"
+DEFAULT_FSYNC_INTERVAL = 1.0  # Seconds
+
+
+@dataclass
+class _Commit:
+    """One submitted save."""
+
+    store: StateStore
+    state: StateDict
+    changes: List[JournalEntry]
+    full: bool
+    future: "Future[bool]"
+
+
+class StateWriter:
+    """A thread that writes submitted saves to their stores, in order."""
+
+    def __init__(
+        self,
+        fsync_policy: str = FSYNC_NONE,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            fsync_policy: One of FSYNC_POLICIES
+            fsync_interval: Seconds between fsyncs under the interval policy
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy!r}")
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.writes = 0  # Store writes, each covering one or more saves
+        self.saves = 0  # Saves written
+        self._queue: "queue.Queue[Optional[_Commit]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Written but not yet fsynced, under the interval policy; keyed by id(store)
+        self._unsynced: Dict[int, Tuple[StateStore, List["Future[bool]"]]] = {}
+        self._last_sync = time.monotonic()
+
+    def submit(
+        self,
+        store: StateStore,
+        state: StateDict,
+        changes: List[JournalEntry],
+        full: bool = False,
+    ) -> "Future[bool]":
+        """
+        Queue a save; see StateStore.save for the arguments.
+
+        The state is passed by value so the writer never reads game state
+        the event loop is changing.
+
+        Returns:
+            A future that completes when the save is durable (per the fsync
+            policy), or fails with the store's exception
+        """
+        future: "Future[bool]" = Future()
+        self._ensure_started()
+        self._queue.put(_Commit(store, state, changes, full, future))
+        return future
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write and fsync everything queued, then stop the thread.
+
+        Returns:
+            True if the thread finished within the timeout
+        """
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return True
+            self._queue.put(None)
+            thread.join(timeout)
+            if thread.is_alive():
+                return False
+            self._thread = None
+            return True
+
+    def _ensure_started(self) -> None:
+        """Start the writer thread on first use."""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="bingo-state-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Write queued saves until stopped."""
+        while True:
+            timeout = None
+            if self._unsynced:
+                timeout = max(
+                    0.0, self._last_sync + self.fsync_interval - time.monotonic()
+                )
+            try:
+                first = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._sync_unsynced()
+                continue
+
+            # Group commit: take everything queued behind the first save
+            batch = [first]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            groups: Dict[int, List[_Commit]] = {}
+            for commit in batch:
+                if commit is not None:
+                    groups.setdefault(id(commit.store), []).append(commit)
+            for commits in groups.values():
+                self._write(commits)
+
+            stopping = None in batch
+            if self._unsynced and (
+                stopping or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_unsynced()
+            if stopping:
+                return
+
+    def _write(self, commits: List[_Commit]) -> None:
+        """Write the saves queued for one store as a single save."""
+        store = commits[0].store
+        changes = [entry for commit in commits for entry in commit.changes]
+        state = commits[-1].state  # Saves are queued in order; the last is current
+        futures = [commit.future for commit in commits]
+        try:
+            store.save(lambda: state, changes, full=any(c.full for c in commits))
+            if self.fsync_policy == FSYNC_COMMIT:
+                store.sync()
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        self.writes += 1
+        self.saves += len(commits)
+        if self.fsync_policy == FSYNC_INTERVAL:
+            self._unsynced.setdefault(id(store), (store, []))[1].extend(futures)
+        else:
+            for future in futures:
+                future.set_result(True)
+
+    def _sync_unsynced(self) -> None:
+        """fsync every store written since the last fsync."""
+        unsynced, self._unsynced = self._unsynced, {}
+        self._last_sync = time.monotonic()
+        for store, futures in unsynced.values():
+            try:
+                store.sync()
+            except Exception as e:
+                logging.error(f"Failed to fsync state: {e}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future in futures:
+                future.set_result(True)
+
+
+# Global writer, shared by all stores
+_state_writer: Optional[StateWriter] = None
+
+
+def get_state_writer() -> StateWriter:
+    """
+    Get or create the global writer, configured by BINGO_FSYNC and
+    BINGO_FSYNC_INTERVAL.
+    """
+    global _state_writer
+    if _state_writer is None:
+        policy = os.getenv(FSYNC_POLICY_ENV, FSYNC_NONE).lower()
+        if policy not in FSYNC_POLICIES:
+            logging.warning(f"Unknown fsync policy {policy!r}, using {FSYNC_NONE}")
+            policy = FSYNC_NONE
+        interval = float(os.getenv(FSYNC_INTERVAL_ENV, DEFAULT_FSYNC_INTERVAL))
+        _state_writer = StateWriter(policy, interval)
+    return _state_writer
@@ -0,0 +1,329 @@
+"""
+Win pattern registry and bitboard win detection for the Bingo application.
+
+Win patterns are declared as data (name, cells, category, message template)
+and compiled into a PatternRegistry: the board's clicked state is packed into
+a 25-bit integer (bit row * 5 + col), every pattern becomes a mask, so checking
+a pattern is a single `state & mask == mask`, and a tile -> patterns index
+limits the check after a toggle to the patterns that include the toggled tile.
+
+Extra patterns can be loaded from a JSON file (see load_patterns_file), e.g.:
+
+    {"patterns": [
+        {"name": "postage_stamp", "cells": [[0, 3], [0, 4], [1, 3], [1, 4]]}
+    ]}
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.types.ui_types import BingoPattern, Coordinate
+
+BOARD_SIZE = 5
+
+# Standard patterns (lines) are announced together as a multi-bingo;
+# every other category is announced pattern by pattern
+STANDARD_CATEGORY = "standard"
+SPECIAL_CATEGORY = "special"
+
+# Message templates; fields: name, title (the name title-cased), count
+# (completed patterns in the category) and multiplier ("", "DOUBLE ", ...)
+STANDARD_MESSAGE = "{multiplier}BINGO!"
+SPECIAL_MESSAGE = "{title} Bingo!"
+
+# Extra patterns are read from this file, if it exists
+PATTERNS_FILE_ENV = "BINGO_PATTERNS_FILE"
+DEFAULT_PATTERNS_FILE = "patterns.json"
+
+
+@dataclass(frozen=True)
+class WinPattern:
+    """A winning shape on the board."""
+
+    name: BingoPattern
+    cells: Tuple[Coordinate, ...]
+    category: str = SPECIAL_CATEGORY
+    message: str = SPECIAL_MESSAGE
+
+    def format_message(self, count: int) -> str:
+        """Format this pattern's announcement, with `count` wins in its category."""
+        return self.message.format(
+            name=self.name,
+            title=self.name.replace("_", " ").title(),
+            count=count,
+            multiplier=multiplier_text(count),
+        )
+
+
+def multiplier_text(count: int) -> str:
+    """Return the multi-bingo prefix for a number of wins, e.g. "DOUBLE "."""
+    names = {1: "", 2: "DOUBLE ", 3: "TRIPLE ", 4: "QUADRUPLE ", 5: "QUINTUPLE "}
+    return names.get(count, f"{count}-WAY ")
+
+
+def tile_bit(row: int, col: int) -> int:
+    """Return the bitmask bit for a tile."""
+    return 1 << (row * BOARD_SIZE + col)
+
+
+def tiles_to_mask(tiles: Iterable[Coordinate]) -> int:
+    """Pack (row, col) tiles into an int, one bit per tile in row-major order."""
+    mask = 0
+    for row, col in tiles:
+        mask |= tile_bit(row, col)
+    return mask
+
+
+def default_patterns() -> List[WinPattern]:
+    """Return the built-in win patterns, in the order wins are announced."""
+    last = BOARD_SIZE - 1
+    center = BOARD_SIZE // 2
+    cells = range(BOARD_SIZE)
+
+    def standard(name: str, tiles: Iterable[Coordinate]) -> WinPattern:
+        return WinPattern(name, tuple(tiles), STANDARD_CATEGORY, STANDARD_MESSAGE)
+
+    def special(name: str, tiles: Iterable[Coordinate]) -> WinPattern:
+        return WinPattern(name, tuple(sorted(set(tiles))))
+
+    patterns: List[WinPattern] = []
+
+    # Rows and columns
+    for i in cells:
+        patterns.append(standard(f"row{i}", ((i, j) for j in cells)))
+        patterns.append(standard(f"col{i}", ((j, i) for j in cells)))
+
+    # Diagonals
+    diag_main = [(i, i) for i in cells]
+    diag_anti = [(i, last - i) for i in cells]
+    patterns.append(standard("diag_main", diag_main))
+    patterns.append(standard("diag_anti", diag_anti))
+
+    # Additional winning variations
+    patterns.append(special("blackout", ((r, c) for r in cells for c in cells)))
+    patterns.append(
+        special("four_corners", [(0, 0), (0, last), (last, 0), (last, last)])
+    )
+    patterns.append(
+        special("plus", [(center, c) for c in cells] + [(r, center) for r in cells])
+    )
+    patterns.append(special("x_shape", diag_main + diag_anti))
+    patterns.append(
+        special(
+            "perimeter",
+            [(0, c) for c in cells]
+            + [(last, c) for c in cells]
+            + [(r, 0) for r in cells]
+            + [(r, last) for r in cells],
+        )
+    )
+    return patterns
+
+
+def pattern_from_dict(data: Dict[str, Any]) -> WinPattern:
+    """
+    Build a pattern from its config entry.
+
+    Raises:
+        ValueError: If the entry has no name or cells, a cell is off the board,
+            or its message template does not format
+    """
+    name = data.get("name")
+    raw_cells = data.get("cells")
+    if not name or not raw_cells:
+        raise ValueError(f"Pattern needs a name and cells: {data!r}")
+    cells = tuple(sorted({(int(row), int(col)) for row, col in raw_cells}))
+    for row, col in cells:
+        if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
+            raise ValueError(f"Pattern {name!r} has a cell off the board: {(row, col)}")
+    category = data.get("category", SPECIAL_CATEGORY)
+    default_message = (
+        STANDARD_MESSAGE if category == STANDARD_CATEGORY else SPECIAL_MESSAGE
+    )
+    pattern = WinPattern(
+        str(name), cells, category, data.get("message", default_message)
+    )
+    # Format the template once now, so a bad one fails here and not on the winning click
+    try:
+        pattern.format_message(1)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(
+            f"Pattern {name!r} has an invalid message {pattern.message!r}: {e!r}"
+        ) from e
+    return pattern
+
+
+def load_patterns_file(path: Path) -> List[WinPattern]:
+    """
+    Read extra win patterns from a JSON file with a "patterns" list.
+
+    Returns:
+        The patterns, or an empty list if the file is missing or invalid
+    """
+    if not path.exists():
+        return []
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return [pattern_from_dict(entry) for entry in data.get("patterns", [])]
+    except Exception as e:
+        logging.error(f"Failed to load win patterns from {path}: {e}")
+        return []
+
+
+class PatternRegistry:
+    """Win patterns compiled into masks and a tile -> patterns index."""
+
+    def __init__(self, patterns: Iterable[WinPattern]) -> None:
+        """
+        Compile the patterns; a later pattern replaces an earlier one of the same name.
+
+        Args:
+            patterns: The patterns, in announcement order
+        """
+        self.patterns: Dict[BingoPattern, WinPattern] = {}
+        for pattern in patterns:
+            self.patterns.pop(pattern.name, None)
+            self.patterns[pattern.name] = pattern
+
+        self.masks: Dict[BingoPattern, int] = {
+            name: tiles_to_mask(pattern.cells)
+            for name, pattern in self.patterns.items()
+        }
+
+        # For each tile (by bit index), the patterns that include it, in
+        # announcement order
+        self.tile_index: Tuple[Tuple[Tuple[BingoPattern, int], ...], ...] = tuple(
+            tuple(
+                (name, mask) for name, mask in self.masks.items() if mask >> index & 1
+            )
+            for index in range(BOARD_SIZE * BOARD_SIZE)
+        )
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.patterns
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def category(self, name: BingoPattern) -> str:
+        """Return a pattern's category; unknown patterns count as standard."""
+        pattern = self.patterns.get(name)
+        return pattern.category if pattern is not None else STANDARD_CATEGORY
+
+    def completed(
+        self, state: int, toggled: Optional[Coordinate] = None
+    ) -> List[BingoPattern]:
+        """
+        Return the win patterns fully covered by the clicked state.
+
+        Args:
+            state: Clicked tiles as a bitmask (see tiles_to_mask)
+            toggled: If given, only the patterns through this tile are checked
+
+        Returns:
+            The completed patterns, in announcement order
+        """
+        if toggled is None:
+            candidates: Iterable[Tuple[BingoPattern, int]] = self.masks.items()
+        else:
+            row, col = toggled
+            candidates = self.tile_index[row * BOARD_SIZE + col]
+        return [name for name, mask in candidates if state & mask == mask]
+
+
+class PatternTracker:
+    """
+    The completed patterns of a game with a running count per category.
+
+    Adding or retracting the patterns through a toggled tile touches only
+    those patterns, so the multi-bingo count never needs a rescan.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no completed patterns."""
+        self.completed: Set[BingoPattern] = set()
+        self.counts: Dict[str, int] = {}
+        self._counted: Set[BingoPattern] = set()  # The patterns in counts
+
+    def bind(self, completed: Set[BingoPattern], registry: PatternRegistry) -> None:
+        """
+        Track the given set of completed patterns, recounting only if it was
+        replaced or changed behind the tracker's back. Changes are caught by
+        content, so swapping one pattern for another in place is noticed.
+        """
+        if completed is self.completed and completed == self._counted:
+            return
+        self.completed = completed
+        self.counts = {}
+        self._counted = set(completed)
+        for name in completed:
+            category = registry.category(name)
+            self.counts[category] = self.counts.get(category, 0) + 1
+
+    def count(self, category: str) -> int:
+        """Return the number of completed patterns in a category."""
+        return self.counts.get(category, 0)
+
+    def add(self, name: BingoPattern, registry: PatternRegistry) -> None:
+        """Record a newly completed pattern."""
+        if name in self.completed:
+            return
+        self.completed.add(name)
+        self._counted.add(name)
+        category = registry.category(name)
+        self.counts[category] = self.counts.get(category, 0) + 1
+
+    def retract(
+        self, tile: Coordinate, registry: PatternRegistry
+    ) -> List[BingoPattern]:
+        """
+        Drop the completed patterns through a tile that was just un-clicked.
+
+        Returns:
+            The retracted patterns
+        """
+        row, col = tile
+        retracted = [
+            name
+            for name, _ in registry.tile_index[row * BOARD_SIZE + col]
+            if name in self.completed
+        ]
+        for name in retracted:
+            self.completed.discard(name)
+            self._counted.discard(name)
+            self.counts[registry.category(name)] -= 1
+        return retracted
+
+
+# Global registry, compiled on first use
+_registry: Optional[PatternRegistry] = None
+
+
+def get_pattern_registry() -> PatternRegistry:
+    """Get or compile the global registry: built-in patterns plus the patterns file."""
+    global _registry
+    if _registry is None:
+        path = Path(os.getenv(PATTERNS_FILE_ENV, DEFAULT_PATTERNS_FILE))
+        extra = load_patterns_file(path)
+        if extra:
+            logging.info(f"Loaded {len(extra)} win patterns from {path}")
+        _registry = PatternRegistry(default_patterns() + extra)
+    return _registry
+
+
+def set_pattern_registry(registry: Optional[PatternRegistry]) -> None:
+    """Replace the global registry; None recompiles it on next use."""
+    global _registry
+    _registry = registry
+
+
+def completed_patterns(
+    state: int, toggled: Optional[Coordinate] = None
+) -> List[BingoPattern]:
+    """Return the patterns of the global registry completed by the clicked state."""
+    return get_pattern_registry().completed(state, toggled)
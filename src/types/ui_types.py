@@ -2,7 +2,7 @@
 UI Type definitions for the Bingo application.
 """
 
-from typing import Dict, List, Set, Tuple, Union
+from typing import Dict, List, Set, Tuple
 
 from nicegui import ui
 
@@ -14,8 +14,7 @@ BingoPattern = str
 BingoPatterns = Set[BingoPattern]
 
 # UI Element types
-TileLabelInfo = Dict[str, Union[ui.label, str]]
-TileInfo = Dict[str, Union[ui.card, List[TileLabelInfo]]]
+TileInfo = Dict[str, ui.html]  # "card": the tile's single pre-rendered element
 TileButtonsDict = Dict[Coordinate, TileInfo]
 BoardViewTuple = Tuple[ui.element, TileButtonsDict]
 BoardViews = Dict[str, BoardViewTuple]
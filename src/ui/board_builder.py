@@ -2,31 +2,24 @@
 Board builder UI component for the Bingo application.
 """
 
-from typing import Callable, cast
+from typing import Callable
 
-from nicegui import app, ui
+from nicegui import ui
 
 from src.config.constants import (
-    BOARD_TILE_FONT,
-    BOARD_TILE_FONT_STYLE,
-    BOARD_TILE_FONT_WEIGHT,
-    CARD_CLASSES,
+    BOARD_RENDER_CLIENT,
+    BOARD_RENDER_SERVER,
     CLOSED_MESSAGE_COLOR,
     CLOSED_MESSAGE_TEXT,
+    FIT_CONTAINER_CLASS,
     FREE_SPACE_TEXT,
-    FREE_SPACE_TEXT_COLOR,
     GRID_CLASSES,
     GRID_CONTAINER_CLASS,
     HEADER_FONT_FAMILY,
-    LABEL_CLASSES,
-    LABEL_SMALL_CLASSES,
-    TILE_CLICKED_BG_COLOR,
-    TILE_CLICKED_TEXT_COLOR,
-    TILE_UNCLICKED_BG_COLOR,
-    TILE_UNCLICKED_TEXT_COLOR,
+    TILE_CARD_CLASSES,
 )
-from src.types.ui_types import BoardType, ClickedTiles, Coordinate, TileButtonsDict
-from src.utils.text_processing import get_line_style_for_lines, split_phrase_into_lines
+from src.types.ui_types import BoardType, ClickedTiles, TileButtonsDict
+from src.ui.tile_layout import get_layout_cache, tile_classes
 
 
 def build_closed_message(parent: ui.element) -> None:
@@ -36,29 +29,36 @@ def build_closed_message(parent: ui.element) -> None:
     Args:
         parent: The parent UI element to build the message in
     """
-    import logging
+    from src.ui.client_board import clear_client_board
+    from src.ui.head import header_font_size
+
+    # The message replaces the view's client board, if it had one
+    clear_client_board(parent)
 
     with parent:
         with ui.element("div").classes(GRID_CONTAINER_CLASS):
             with ui.element("div").classes(
-                "flex justify-center items-center h-full w-full"
+                f"flex justify-center items-center h-full w-full {FIT_CONTAINER_CLASS}"
             ):
                 ui.label(CLOSED_MESSAGE_TEXT).classes("text-center fit-header").style(
-                    f"font-family: {HEADER_FONT_FAMILY}; color: {CLOSED_MESSAGE_COLOR}; font-size: 6rem;"
+                    f"font-family: {HEADER_FONT_FAMILY}; color: {CLOSED_MESSAGE_COLOR}; "
+                    f"{header_font_size(CLOSED_MESSAGE_TEXT)}"
                 )
 
-    # Run JavaScript to ensure text is resized properly
-    try:
-        js_code = """
-            setTimeout(function() {
-                if (typeof fitty !== 'undefined') {
-                    fitty('.fit-header', { multiLine: true, minSize: 10, maxSize: 2000 });
-                }
-            }, 50);
-        """
-        ui.run_javascript(js_code)
-    except Exception as e:
-        logging.debug(f"JavaScript execution failed: {e}")
+
+def build_tile_html(phrase: str) -> str:
+    """
+    Pre-render the inner HTML of a tile so the whole tile is a single UI element.
+    Produces the same markup a column of one row and label per line would.
+    The phrase's layout comes from the tile layout cache.
+
+    Args:
+        phrase: The tile's phrase
+
+    Returns:
+        The tile's inner HTML; the text takes the colour of the tile's state class
+    """
+    return get_layout_cache().get(phrase).html
 
 
 def build_board(
@@ -71,6 +71,7 @@ def build_board(
     """
     Build the common Bingo board in the given parent element.
     The resulting tile UI elements are added to tile_buttons_dict.
+    Each tile is a single element whose text lines are pre-rendered HTML.
 
     Args:
         parent: The parent UI element to build the board in
@@ -87,79 +88,84 @@ def build_board(
             with ui.grid(columns=5).classes(GRID_CLASSES):
                 for row_idx, row in enumerate(board):
                     for col_idx, phrase in enumerate(row):
-                        card = ui.card().classes(CARD_CLASSES).style("cursor: pointer;")
-                        labels_list = []  # initialize list for storing label metadata
-                        with card:
-                            with ui.column().classes(
-                                "flex flex-col items-center justify-center gap-0 w-full"
-                            ):
-                                default_text_color = (
-                                    FREE_SPACE_TEXT_COLOR
-                                    if phrase.upper() == FREE_SPACE_TEXT
-                                    else TILE_UNCLICKED_TEXT_COLOR
-                                )
-                                lines = split_phrase_into_lines(phrase)
-                                line_count = len(lines)
-                                for line in lines:
-                                    with ui.row().classes(
-                                        "w-full items-center justify-center"
-                                    ):
-                                        base_class = (
-                                            LABEL_SMALL_CLASSES
-                                            if len(line) <= 3
-                                            else LABEL_CLASSES
-                                        )
-                                        lbl = (
-                                            ui.label(line)
-                                            .classes(base_class)
-                                            .style(
-                                                get_line_style_for_lines(
-                                                    line_count, default_text_color
-                                                )
-                                            )
-                                        )
-                                        labels_list.append(
-                                            {
-                                                "ref": lbl,
-                                                "base_classes": base_class,
-                                                "base_style": get_line_style_for_lines(
-                                                    line_count, default_text_color
-                                                ),
-                                            }
-                                        )
-                        tile_buttons_dict[(row_idx, col_idx)] = {
-                            "card": card,
-                            "labels": labels_list,
-                        }
-
-                        # Apply appropriate styling based on clicked state
-                        if (row_idx, col_idx) in clicked_tiles:
-                            card.style(
-                                f"background-color: {TILE_CLICKED_BG_COLOR}; color: {TILE_CLICKED_TEXT_COLOR}; border: none; outline: 3px solid {TILE_CLICKED_TEXT_COLOR};"
-                            )
+                        # The tile's look comes from its state classes; the
+                        # free space keeps its own colour
+                        is_free = phrase.upper() == FREE_SPACE_TEXT
+                        clicked = (row_idx, col_idx) in clicked_tiles
+                        card = ui.html(build_tile_html(phrase)).classes(
+                            f"{TILE_CARD_CLASSES} {tile_classes(clicked, is_free)}"
+                        )
+                        tile_buttons_dict[(row_idx, col_idx)] = {"card": card}
 
                         # Don't allow clicking the free space
-                        if phrase.upper() == FREE_SPACE_TEXT:
-                            card.style(
-                                f"color: {FREE_SPACE_TEXT_COLOR}; border: none; outline: 3px solid {TILE_CLICKED_TEXT_COLOR};"
-                            )
-                        else:
+                        if not is_free:
                             card.on(
                                 "click",
                                 lambda e, r=row_idx, c=col_idx: on_tile_click(r, c),
                             )
+
+    # The new tiles already show these clicks, so later syncs only diff against them
+    from src.ui.sync import mark_view_rendered
+
+    mark_view_rendered(parent, None, clicked_tiles)
+    return tile_buttons_dict
+
+
+def rebuild_board(
+    parent: ui.element,
+    tile_buttons_dict: TileButtonsDict,
+    on_tile_click: Callable[[int, int], None],
+    board: BoardType,
+    clicked_tiles: ClickedTiles,
+) -> TileButtonsDict:
+    """
+    Build the board again in a view's container, keeping the view's render mode:
+    a client-side board for client-mode views, otherwise build_board.
+
+    Args:
+        parent: The view's board container
+        tile_buttons_dict: The view's tile UI elements (unused by client boards)
+        on_tile_click: Callback function when a tile is clicked
+        board: 2D array of phrases
+        clicked_tiles: Set of (row, col) tuples that are clicked
+
+    Returns:
+        The updated tile_buttons_dict
+    """
+    from src.ui.client_board import build_client_board, is_client_view
+
+    if not is_client_view(parent):
+        return build_board(
+            parent, tile_buttons_dict, on_tile_click, board, clicked_tiles
+        )
+
+    from src.core.game_logic import bingo_patterns
+    from src.core.state_manager import get_state_manager
+
+    build_client_board(
+        parent,
+        on_tile_click,
+        board,
+        clicked_tiles,
+        bingo_patterns,
+        get_state_manager().version,
+    )
     return tile_buttons_dict
 
 
-def create_board_view(background_color: str, is_global: bool) -> None:
+def create_board_view(
+    background_color: str, is_global: bool, render_mode: str = BOARD_RENDER_SERVER
+) -> None:
     """
     Creates a board page view based on the background color and a flag.
     If is_global is True, the board uses global variables (home page)
     otherwise it uses a local board (stream page).
+    render_mode selects build_board ("server") or the client-side board ("client").
     """
     import logging
 
     from src.core.game_logic import (
+        bingo_patterns,
         board,
         board_views,
         clicked_tiles,
@@ -167,11 +173,29 @@ def create_board_view(background_color: str, is_global: bool) -> None:
         toggle_tile,
     )
     from src.ui.head import setup_head
-    from src.utils.file_monitor import check_phrases_file_change
+    from src.ui.sync import register_board_view
 
     # Set up common head elements
     setup_head(background_color)
 
+    def build_view_board(
+        parent: ui.element, tile_buttons_dict: TileButtonsDict
+    ) -> None:
+        if render_mode == BOARD_RENDER_CLIENT:
+            from src.core.state_manager import get_state_manager
+            from src.ui.client_board import build_client_board
+
+            build_client_board(
+                parent,
+                toggle_tile,
+                board,
+                clicked_tiles,
+                bingo_patterns,
+                get_state_manager().version,
+            )
+        else:
+            build_board(parent, tile_buttons_dict, toggle_tile, board, clicked_tiles)
+
     # Create the board container. For the home view, assign an ID to capture it.
     if is_global:
         container = ui.element("div").classes(
@@ -194,28 +218,19 @@ def create_board_view(background_color: str, is_global: bool) -> None:
         except Exception as e:
             logging.debug(f"Setting stream container ID failed: {e}")
 
+    if render_mode == BOARD_RENDER_CLIENT:
+        from src.ui.client_board import register_client_view
+
+        register_client_view(container)
+
     if is_global:
-        from src.core.game_logic import generate_new_board, reset_board
         from src.ui.controls import create_controls_row
-        from src.utils.file_operations import read_phrases_file
-
-        # Define the callback for phrases file changes
-        def on_phrases_change(phrases):
-            generate_new_board(phrases)
 
         # Build the home view with controls
         tile_buttons: TileButtonsDict = {}  # Start with an empty dictionary
-        build_board(container, tile_buttons, toggle_tile, board, clicked_tiles)
+        build_view_board(container, tile_buttons)
         board_views["home"] = (container, tile_buttons)
-
-        # Add timers for synchronizing the global board
-        try:
-            check_timer = ui.timer(
-                1, lambda: check_phrases_file_change(on_phrases_change)
-            )
-            app.on_disconnect(check_timer.cancel)
-        except Exception as e:
-            logging.warning(f"Error setting up timer: {e}")
+        register_board_view("home", container, tile_buttons)
 
         # Add control buttons (reset, new board, etc.)
         controls_row = create_controls_row()
@@ -226,7 +241,9 @@ def create_board_view(background_color: str, is_global: bool) -> None:
         if is_game_closed:
             build_closed_message(container)
             board_views["stream"] = (container, {})  # Empty tiles dict since no board
+            register_board_view("stream", container, {})
         else:
             local_tile_buttons: TileButtonsDict = {}
-            build_board(container, local_tile_buttons, toggle_tile, board, clicked_tiles)
+            build_view_board(container, local_tile_buttons)
             board_views["stream"] = (container, local_tile_buttons)
+            register_board_view("stream", container, local_tile_buttons)
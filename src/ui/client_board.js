@@ -0,0 +1,59 @@
+// Client-side Bingo board: renders all 25 tiles from a compact state payload.
+// The phrases arrive once per board; every later change is a single
+// applyState(version, clickedBitmask, patterns) call.
+export default {
+  template: `
+    <div :class="theme.grid_container" :data-board-version="state.version" :data-patterns="state.patterns.join(' ')">
+      <div :class="theme.grid" style="grid-template-columns: repeat(5, minmax(0, 1fr))">
+        <div
+          v-for="(markup, index) in phrases"
+          :key="index"
+          :class="[theme.tile, tileClass(index)]"
+          @click="onTileClick(index)"
+          v-html="markup"
+        ></div>
+      </div>
+    </div>
+  `,
+  props: {
+    board_version: Number,
+    phrases: Array,
+    clicked_bitmask: Number,
+    patterns: Array,
+    free_bitmask: Number,
+    theme: Object,
+  },
+  data() {
+    return {
+      state: {
+        version: this.board_version,
+        clicked: this.clicked_bitmask,
+        patterns: this.patterns,
+      },
+    };
+  },
+  watch: {
+    // A full props update (e.g. a new board) replaces the local state
+    board_version() {
+      this.applyState(this.board_version, this.clicked_bitmask, this.patterns);
+    },
+  },
+  methods: {
+    applyState(version, clicked, patterns) {
+      // Ignore messages that arrive after a newer state
+      if (version < this.state.version) return;
+      this.state = { version: version, clicked: clicked, patterns: patterns };
+    },
+    isSet(mask, index) {
+      return Math.floor(mask / 2 ** index) % 2 === 1;
+    },
+    tileClass(index) {
+      const state = this.isSet(this.state.clicked, index) ? this.theme.clicked : this.theme.unclicked;
+      return this.isSet(this.free_bitmask, index) ? state + " " + this.theme.free : state;
+    },
+    onTileClick(index) {
+      if (this.isSet(this.free_bitmask, index)) return;
+      this.$emit("tile_click", index);
+    },
+  },
+};
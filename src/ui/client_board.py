@@ -0,0 +1,199 @@
+"""
+Client-side board component for the Bingo application.
+
+An alternative to build_board: the whole 5x5 board is one browser component
+that renders itself from a compact state payload, so a change to the game
+costs a single small message instead of style updates for many elements.
+"""
+
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from nicegui import ui
+
+from src.config.constants import (
+    FREE_SPACE_TEXT,
+    GRID_CLASSES,
+    GRID_CONTAINER_CLASS,
+    TILE_CARD_CLASSES,
+    TILE_CLICKED_CLASS,
+    TILE_FREE_CLASS,
+    TILE_UNCLICKED_CLASS,
+)
+from src.core.win_patterns import BOARD_SIZE, tiles_to_mask
+from src.types.ui_types import BingoPatterns, BoardType, ClickedTiles, Coordinate
+
+# Static look of the board, sent once with the component; tiles are styled
+# by the tile stylesheet's state classes
+CLIENT_BOARD_THEME: Dict[str, str] = {
+    "grid_container": GRID_CONTAINER_CLASS,
+    "grid": f"nicegui-grid {GRID_CLASSES}",
+    "tile": TILE_CARD_CLASSES,
+    "clicked": TILE_CLICKED_CLASS,
+    "unclicked": TILE_UNCLICKED_CLASS,
+    "free": TILE_FREE_CLASS,
+}
+
+
+def board_state_payload(
+    version: int,
+    board: BoardType,
+    clicked_tiles: ClickedTiles,
+    bingo_patterns: BingoPatterns,
+) -> Dict[str, Any]:
+    """
+    Build the full state payload a client board is created with.
+
+    Phrases are sent pre-rendered as tile markup, so the browser shows exactly
+    what build_board would.
+
+    Args:
+        version: The state version the payload reflects
+        board: 2D array of phrases
+        clicked_tiles: Set of (row, col) tuples that are clicked
+        bingo_patterns: Winning patterns found so far
+
+    Returns:
+        The component props: board_version, phrases, clicked_bitmask, patterns
+        and free_bitmask
+    """
+    from src.ui.board_builder import build_tile_html
+
+    phrases: List[str] = []
+    free_tiles: List[Coordinate] = []
+    for row_idx, row in enumerate(board):
+        for col_idx, phrase in enumerate(row):
+            is_free = phrase.upper() == FREE_SPACE_TEXT
+            if is_free:
+                free_tiles.append((row_idx, col_idx))
+            phrases.append(build_tile_html(phrase))
+
+    return {
+        "board_version": version,
+        "phrases": phrases,
+        "clicked_bitmask": tiles_to_mask(clicked_tiles),
+        "patterns": sorted(bingo_patterns),
+        "free_bitmask": tiles_to_mask(free_tiles),
+    }
+
+
+class ClientBoard(ui.element, component="client_board.js"):
+    """A whole Bingo board rendered in the browser from a compact state payload."""
+
+    def __init__(
+        self,
+        on_tile_click: Callable[[int, int], None],
+        payload: Dict[str, Any],
+    ) -> None:
+        """
+        Create the board component.
+
+        Args:
+            on_tile_click: Callback function when a tile is clicked
+            payload: The initial state, see board_state_payload
+        """
+        super().__init__()
+        self._props.update(payload)
+        self._props["theme"] = CLIENT_BOARD_THEME
+        self.on(
+            "tile_click",
+            lambda e: on_tile_click(*divmod(int(e.args), BOARD_SIZE)),
+        )
+
+    @property
+    def version(self) -> int:
+        """The state version the board shows."""
+        return self._props["board_version"]
+
+    def push_state(
+        self, version: int, clicked_tiles: ClickedTiles, bingo_patterns: BingoPatterns
+    ) -> bool:
+        """
+        Send a state change to the browser as one applyState call.
+
+        The props are updated without an element update so a reconnecting
+        client still renders the current state.
+
+        Returns:
+            True if a message was sent, False if the board was already current
+        """
+        clicked_bitmask = tiles_to_mask(clicked_tiles)
+        patterns = sorted(bingo_patterns)
+        if (
+            clicked_bitmask == self._props["clicked_bitmask"]
+            and patterns == self._props["patterns"]
+        ):
+            self._props["board_version"] = version
+            return False
+
+        self._props["board_version"] = version
+        self._props["clicked_bitmask"] = clicked_bitmask
+        self._props["patterns"] = patterns
+        self.run_method("applyState", version, clicked_bitmask, patterns)
+        return True
+
+
+# Client board shown in each client-mode board view, keyed by the view's
+# container; None while the view shows no board (e.g. the game is closed)
+_client_boards: "weakref.WeakKeyDictionary[ui.element, Optional[ClientBoard]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def register_client_view(container: ui.element) -> None:
+    """Put a board view in client render mode, so rebuilds keep using client boards."""
+    _client_boards.setdefault(container, None)
+
+
+def is_client_view(container: ui.element) -> bool:
+    """Return True if the board view in this container renders client-side."""
+    return container in _client_boards
+
+
+def build_client_board(
+    parent: ui.element,
+    on_tile_click: Callable[[int, int], None],
+    board: BoardType,
+    clicked_tiles: ClickedTiles,
+    bingo_patterns: BingoPatterns,
+    version: int = 0,
+) -> ClientBoard:
+    """
+    Build the client-side board in the given parent element.
+    The counterpart of build_board for views in client render mode.
+
+    Args:
+        parent: The parent UI element to build the board in
+        on_tile_click: Callback function when a tile is clicked
+        board: 2D array of phrases
+        clicked_tiles: Set of (row, col) tuples that are clicked
+        bingo_patterns: Winning patterns found so far
+        version: The state version the board reflects
+
+    Returns:
+        The board component
+    """
+    payload = board_state_payload(version, board, clicked_tiles, bingo_patterns)
+    with parent:
+        client_board = ClientBoard(on_tile_click, payload)
+    _client_boards[parent] = client_board
+
+    from src.ui.sync import mark_view_rendered
+
+    mark_view_rendered(parent, version, clicked_tiles)
+    return client_board
+
+
+def clear_client_board(container: ui.element) -> None:
+    """
+    Forget the client board of a view whose container was cleared, e.g. for
+    the closed message, so no state is pushed to the removed component. The
+    view stays in client render mode.
+    """
+    if container in _client_boards:
+        _client_boards[container] = None
+
+
+def get_client_board(container: ui.element) -> Optional["ClientBoard"]:
+    """Return the client board of a view, or None if the view shows no client board."""
+    return _client_boards.get(container)
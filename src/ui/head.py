@@ -2,30 +2,64 @@
 Head setup module for the Bingo application.
 """
 
-import logging
+from functools import lru_cache
 
 from nicegui import ui
 
 from src.config.constants import (
-    BOARD_TILE_FONT,
-    BOARD_TILE_FONT_STYLE,
-    BOARD_TILE_FONT_WEIGHT,
+    FIT_CONTAINER_CLASS,
     HEADER_FONT_FAMILY,
+    HEADER_FONT_FILE,
     HEADER_TEXT,
     HEADER_TEXT_COLOR,
 )
-from src.utils.text_processing import get_google_font_css
+from src.ui.tile_layout import fitted_font_size, tile_stylesheet_url
+from src.utils.font_metrics import get_font_metrics
+from src.utils.text_processing import fit_line_sizes
+
+HEADER_TEXT_FILL = 95.0  # Share of the header's width its text fills, in cqw
+
+
+@lru_cache(maxsize=None)
+def header_font_size(text: str) -> str:
+    """
+    The font size that makes a header line (e.g. the header or the closed
+    message) fill its container's width, from the header font's metrics.
+
+    Args:
+        text: The header text
+
+    Returns:
+        A CSS font-size declaration
+    """
+    metrics = get_font_metrics(HEADER_FONT_FILE)
+    # One line; a header's height is not limited
+    (size,) = fit_line_sizes([text], metrics, HEADER_TEXT_FILL, float("inf"))
+    return f"font-size: {fitted_font_size(size)};"
+
+
+def set_header_text(label: ui.label, text: str) -> None:
+    """
+    Show new text in a header label, resized to fit.
+
+    Args:
+        label: The header label
+        text: The new header text
+    """
+    label.set_text(text)
+    label.style(header_font_size(text))
+    label.update()
 
 
 def setup_head(background_color: str):
     """
-    Set up common head elements: fonts, fitty JS, and background color.
+    Set up common head elements: fonts, fitted text containers, and background color.
+    Both the header and the tiles use the bundled Super Carnival font.
     """
     # Set the header label in the game_logic module
     from src.core.game_logic import header_label
 
-    ui.add_css(
-        """
+    ui.add_css("""
         
             @font-face {
                 font-family: 'Super Carnival';
@@ -34,33 +68,19 @@ def setup_head(background_color: str):
                 /* Load the local .woff file from the static folder (URL-encoded for Safari) */
                 src: url('/static/Super%20Carnival.woff') format('woff');
             }
-        
-    """
-    )
-
-    ui.add_head_html(
-        f"""
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family={BOARD_TILE_FONT.replace(" ", "+")}&display=swap" rel="stylesheet">
-    """
-    )
 
-    # Add CSS class for board tile fonts
-    ui.add_head_html(
-        get_google_font_css(
-            BOARD_TILE_FONT, BOARD_TILE_FONT_WEIGHT, BOARD_TILE_FONT_STYLE, "board_tile"
-        )
-    )
+            /* Fitted text is sized relative to these (see FIT_CONTAINER_CLASS) */
+            .fit-container {
+                container-type: inline-size;
+            }
+        
+    """)
 
-    # Add fitty.js for text resizing
-    ui.add_head_html(
-        '<script src="https://cdn.jsdelivr.net/npm/fitty@2.3.6/dist/fitty.min.js"></script>'
-    )
+    # The tile state and line-count classes, from a stylesheet browsers cache
+    ui.add_head_html(f'<link rel="stylesheet" href="{tile_stylesheet_url()}">')
 
     # Add html2canvas library and capture function.
-    ui.add_head_html(
-        """
+    ui.add_head_html("""
     <script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
     <script>
     function captureBoardAndDownload(seed) {
@@ -69,12 +89,6 @@ def setup_head(background_color: str):
             alert("Board container not found!");
             return;
         }
-        // Run fitty to ensure text is resized and centered
-        if (typeof fitty !== 'undefined') {
-            fitty('.fit-text', { multiLine: true, minSize: 10, maxSize: 1000 });
-            fitty('.fit-text-small', { multiLine: true, minSize: 10, maxSize: 72 });
-        }
-    
         // Wait a short period to ensure that the board is fully rendered and styles have settled.
         setTimeout(function() {
             html2canvas(boardElem, {
@@ -90,48 +104,21 @@ def setup_head(background_color: str):
             });
         }, 500);  // Adjust delay if necessary
     }
-    
-    // Function to safely apply fitty
-    function applyFitty() {
-        if (typeof fitty !== 'undefined') {
-            fitty('.fit-text', { multiLine: true, minSize: 10, maxSize: 1000 });
-            fitty('.fit-text-small', { multiLine: true, minSize: 10, maxSize: 72 });
-            fitty('.fit-header', { multiLine: true, minSize: 10, maxSize: 2000 });
-        }
-    }
     </script>
-    """
-    )
+    """)
 
     # Set background color
     ui.add_head_html(f"<style>body {{ background-color: {background_color}; }}</style>")
 
-    # Add event listeners for fitty
-    ui.add_head_html(
-        """<script>
-        // Run fitty when DOM is loaded
-        document.addEventListener('DOMContentLoaded', function() {
-            setTimeout(applyFitty, 100);  // Slight delay to ensure all elements are rendered
-        });
-        
-        // Run fitty when window is resized
-        let resizeTimer;
-        window.addEventListener('resize', function() {
-            clearTimeout(resizeTimer);
-            resizeTimer = setTimeout(applyFitty, 100);  // Debounce resize events
-        });
-        
-        // Periodically check and reapply fitty for any dynamic changes
-        setInterval(applyFitty, 1000);
-    </script>"""
-    )
-
     # Create header with full width
-    with ui.element("div").classes("w-full"):
+    with ui.element("div").classes(f"w-full {FIT_CONTAINER_CLASS}"):
         ui_header_label = (
             ui.label(f"{HEADER_TEXT}")
             .classes("fit-header text-center")
-            .style(f"font-family: {HEADER_FONT_FAMILY}; color: {HEADER_TEXT_COLOR};")
+            .style(
+                f"font-family: {HEADER_FONT_FAMILY}; color: {HEADER_TEXT_COLOR}; "
+                f"{header_font_size(HEADER_TEXT)}"
+            )
         )
 
     # Make the header label available in game_logic module
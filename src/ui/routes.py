@@ -7,11 +7,19 @@ import logging
 import uuid
 from typing import Dict, Set
 
+from fastapi import Response
 from nicegui import app, ui
 
-from src.config.constants import HOME_BG_COLOR, STREAM_BG_COLOR
+from src.config.constants import (
+    BOARD_RENDER_MODES,
+    BOARD_RENDER_SERVER,
+    HOME_BG_COLOR,
+    STREAM_BG_COLOR,
+)
+from src.core.state_manager import get_state_manager
 from src.ui.board_builder import create_board_view
-from src.ui.sync import sync_board_state
+from src.ui.sync import subscribe_to_state_changes
+from src.ui.tile_layout import TILE_STYLESHEET_PATH, tile_stylesheet
 
 # Track connected clients by path
 # Key is path, value is set of client IDs
@@ -24,10 +32,19 @@ connected_clients: Dict[str, Set[str]] = {
 active_home_users = 0
 
 
+def resolve_render_mode(render: str) -> str:
+    """Return the board render mode requested by a page's ?render= parameter."""
+    if render in BOARD_RENDER_MODES:
+        return render
+    logging.debug(f"Unknown board render mode {render!r}, using {BOARD_RENDER_SERVER}")
+    return BOARD_RENDER_SERVER
+
+
 @ui.page("/")
-def home_page():
+def home_page(render: str = BOARD_RENDER_SERVER):
     """
     Main page with the interactive bingo board and controls.
+    Pass ?render=client to render the board as a client-side component.
     """
     global active_home_users
     
@@ -40,7 +57,7 @@ def home_page():
         connected_clients["/"].add(client_id)
         logging.info(f"Home user connected. Active users: {active_home_users}")
     
-    create_board_view(HOME_BG_COLOR, True)
+    create_board_view(HOME_BG_COLOR, True, resolve_render_mode(render))
 
     # Display active user count
     with ui.card():
@@ -48,9 +65,9 @@ def home_page():
         ui.timer(5, lambda: active_users_label.set_text(f"Connections: {active_home_users}"))
     
     try:
-        # Create a timer that deactivates when the client disconnects
-        # Use a faster timer (0.05 seconds) to ensure quick synchronization
-        timer = ui.timer(0.05, sync_board_state)
+        # Re-render this client only when the game state changes
+        client = ui.context.client
+        unsubscribe = subscribe_to_state_changes(client)
         
         # Handle disconnection
         def on_disconnect():
@@ -59,17 +76,18 @@ def home_page():
                 connected_clients["/"].remove(client_id)
                 active_home_users -= 1
                 logging.info(f"Home user disconnected. Active users: {active_home_users}")
-            timer.cancel()
+            unsubscribe()
         
-        app.on_disconnect(on_disconnect)
+        client.on_disconnect(on_disconnect)
     except Exception as e:
-        logging.warning(f"Error creating timer: {e}")
+        logging.warning(f"Error subscribing to state changes: {e}")
 
 
 @ui.page("/stream")
-def stream_page():
+def stream_page(render: str = BOARD_RENDER_SERVER):
     """
     Stream view of the bingo board (without controls, for display purposes).
+    Pass ?render=client to render the board as a client-side component.
     """
     # Track this client connection
     client_id = app.storage.user.get('client_id', str(uuid.uuid4()))
@@ -79,23 +97,33 @@ def stream_page():
         connected_clients["/stream"].add(client_id)
         logging.info(f"Stream user connected. Total stream users: {len(connected_clients['/stream'])}")
     
-    create_board_view(STREAM_BG_COLOR, False)
+    create_board_view(STREAM_BG_COLOR, False, resolve_render_mode(render))
     
     try:
-        # Create a timer that deactivates when the client disconnects
-        # Use a faster timer (0.05 seconds) to ensure quick synchronization
-        timer = ui.timer(0.05, sync_board_state)
+        # Re-render this client only when the game state changes
+        client = ui.context.client
+        unsubscribe = subscribe_to_state_changes(client)
         
         # Handle disconnection
         def on_disconnect():
             if client_id in connected_clients["/stream"]:
                 connected_clients["/stream"].remove(client_id)
                 logging.info(f"Stream user disconnected. Total stream users: {len(connected_clients['/stream'])}")
-            timer.cancel()
+            unsubscribe()
         
-        app.on_disconnect(on_disconnect)
+        client.on_disconnect(on_disconnect)
     except Exception as e:
-        logging.warning(f"Error creating timer: {e}")
+        logging.warning(f"Error subscribing to state changes: {e}")
+
+
+@app.get(TILE_STYLESHEET_PATH)
+def tile_styles():
+    """The generated tile stylesheet; its URL is versioned, so it is cached for good."""
+    return Response(
+        tile_stylesheet(),
+        media_type="text/css",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
 
 
 @app.get("/health")
@@ -103,7 +131,8 @@ def health():
     return json.dumps({
         "health": "ok",
         "active_players": active_home_users,
-        "stream_viewers": len(connected_clients["/stream"])
+        "stream_viewers": len(connected_clients["/stream"]),
+        "persistence": get_state_manager().saves.stats()
     }, indent=4, sort_keys=True)
 
 
@@ -3,37 +3,202 @@ UI synchronization module for the Bingo application.
 """
 
 import logging
+import weakref
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Iterable, Optional, Set
 
-from nicegui import ui
+from nicegui import Client, ui
 
-from src.config.constants import CLOSED_HEADER_TEXT, HEADER_TEXT
-from src.core.game_logic import board_views, header_label, is_game_closed
-from src.utils.text_processing import get_line_style_for_lines, split_phrase_into_lines
+from src.config.constants import (
+    CLOSED_HEADER_TEXT,
+    HEADER_TEXT,
+    TILE_CLICKED_CLASS,
+    TILE_UNCLICKED_CLASS,
+)
+from src.core import game_logic
+from src.core.state_events import StateEvent
+from src.core.state_manager import get_state_manager
+from src.types.ui_types import BoardViews, Coordinate, TileButtonsDict
+from src.ui.head import set_header_text
 
 
-def sync_board_state():
+@dataclass
+class ViewRenderState:
+    """What a board view currently shows on the client."""
+
+    version: Optional[int] = None  # State version rendered, if known
+    clicked: Optional[FrozenSet[Coordinate]] = None  # Clicked tiles shown, if known
+
+
+@dataclass
+class RenderStats:
+    """Counts of element updates sent to clients, to measure sync cost."""
+
+    element_updates: int = 0  # Total since startup
+    toggles: int = 0
+    last_toggle_updates: int = 0  # Sent for the most recent tile toggle
+
+    def record_toggle(self, updates: int) -> None:
+        """Record the element updates one tile toggle cost."""
+        self.toggles += 1
+        self.last_toggle_updates = updates
+
+
+render_stats = RenderStats()
+
+# Render state of each board view, keyed by the view's container
+_view_states: "weakref.WeakKeyDictionary[ui.element, ViewRenderState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+# Board views of each client, keyed by the client, so a client's state
+# subscription re-renders its own views; game_logic.board_views only holds the
+# most recently opened ones
+_client_views: "weakref.WeakKeyDictionary[Client, BoardViews]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def register_board_view(
+    name: str, container: ui.element, tile_buttons: TileButtonsDict
+) -> None:
+    """
+    Record a board view as one of its client's views.
+
+    Args:
+        name: The view's name, e.g. "home" or "stream"
+        container: The view's board container; its client owns the view
+        tile_buttons: The view's tile UI elements
+    """
+    _client_views.setdefault(container.client, {})[name] = (container, tile_buttons)
+
+
+def client_board_views(client: Client) -> BoardViews:
+    """Return the board views registered for a client, by name."""
+    return _client_views.get(client, {})
+
+
+def is_view_current(container: ui.element, version: int) -> bool:
+    """Return True if the view in this container already shows the given version."""
+    state = _view_states.get(container)
+    return state is not None and state.version == version
+
+
+def mark_view_rendered(
+    container: ui.element,
+    version: Optional[int],
+    clicked: Optional[Iterable[Coordinate]] = None,
+) -> None:
+    """
+    Record what the view in this container now shows.
+
+    Args:
+        container: The view's board container
+        version: The state version rendered, or None if unknown
+        clicked: The clicked tiles rendered, or None if the tiles are not shown
+    """
+    _view_states[container] = ViewRenderState(
+        version, frozenset(clicked) if clicked is not None else None
+    )
+
+
+def dirty_tiles(
+    container: ui.element, clicked: FrozenSet[Coordinate]
+) -> Optional[Set[Coordinate]]:
+    """
+    Return the tiles whose clicked state differs from what the view shows.
+
+    Returns:
+        The flipped tiles, or None if the view's tiles must all be restyled
+    """
+    state = _view_states.get(container)
+    if state is None or state.clicked is None:
+        return None
+    return set(state.clicked ^ clicked)
+
+
+def render_board_views(version: int, board_views: Optional[BoardViews] = None) -> int:
+    """
+    Bring the tiles of every outdated board view up to date with the game state.
+    Only tiles whose clicked state flipped since the view was last rendered are
+    restyled; client-side boards get a single state message instead.
+
+    Args:
+        version: The current state version
+        board_views: The views to render; game_logic.board_views if None
+
+    Returns:
+        The number of element updates sent
+    """
+    from src.ui.client_board import get_client_board
+
+    if board_views is None:
+        board_views = game_logic.board_views
+
+    clicked = frozenset(game_logic.clicked_tiles)
+    updates = 0
+    for container, tile_buttons_local in board_views.values():
+        if is_view_current(container, version):
+            continue
+        client_board = get_client_board(container)
+        if client_board is not None:
+            # Client-side boards take the whole change as one small message
+            if client_board.push_state(version, clicked, game_logic.bingo_patterns):
+                updates += 1
+            mark_view_rendered(container, version, clicked)
+            continue
+        dirty = dirty_tiles(container, clicked)
+        if dirty is None or dirty:
+            updates += update_tile_styles(tile_buttons_local, dirty)
+        mark_view_rendered(container, version, clicked)
+    render_stats.element_updates += updates
+    return updates
+
+
+def sync_board_state(board_views: Optional[BoardViews] = None):
     """
     Update tile styles in every board view (e.g., home and stream).
     Also handles the game closed state to ensure consistency across views.
+    Views that already show the current state version are left untouched.
+
+    Args:
+        board_views: The views to sync; game_logic.board_views if None
     """
+    # Read the game globals at call time; they are rebound by game_logic
+    if board_views is None:
+        board_views = game_logic.board_views
+    header_label = game_logic.header_label
+    is_game_closed = game_logic.is_game_closed
+
+    version = get_state_manager().version
+    stale_views = [
+        (container, tile_buttons_local)
+        for container, tile_buttons_local in board_views.values()
+        if not is_view_current(container, version)
+    ]
+    if not stale_views:
+        return
+
     try:
         # If game is closed, make sure all views reflect that
         if is_game_closed:
             # Update header if available
             if header_label:
-                header_label.set_text(CLOSED_HEADER_TEXT)
-                header_label.update()
+                set_header_text(header_label, CLOSED_HEADER_TEXT)
 
             # Show closed message in all board views
             from src.ui.board_builder import build_closed_message
 
-            for view_key, (container, _) in board_views.items():
+            for container, _ in stale_views:
                 container.clear()
                 build_closed_message(container)
                 container.update()
+                mark_view_rendered(container, version, None)
 
             # Make sure controls row is showing only the Start New Game button
-            from src.core.game_logic import controls_row, reopen_game
+            controls_row = game_logic.controls_row
+            reopen_game = game_logic.reopen_game
 
             if controls_row:
 
@@ -53,73 +218,71 @@ def sync_board_state():
         else:
             # Ensure header text is correct when game is open
             if header_label and header_label.text != HEADER_TEXT:
-                header_label.set_text(HEADER_TEXT)
-                header_label.update()
+                set_header_text(header_label, HEADER_TEXT)
 
         # Normal update if game is not closed
-        # Update tile styles in every board view (e.g., home and stream)
-        for view_key, (container, tile_buttons_local) in board_views.items():
-            update_tile_styles(tile_buttons_local)
-
-        # Safely run JavaScript to resize text
-        try:
-            # Add a slight delay to ensure DOM updates have propagated
-            js_code = """
-                setTimeout(function() {
-                    if (typeof fitty !== 'undefined') {
-                        fitty('.fit-text', { multiLine: true, minSize: 10, maxSize: 1000 });
-                        fitty('.fit-text-small', { multiLine: true, minSize: 10, maxSize: 72 });
-                    }
-                }, 50);
-            """
-            ui.run_javascript(js_code)
-        except Exception as e:
-            logging.debug(
-                f"JavaScript execution failed (likely disconnected client): {e}"
-            )
+        # Restyle changed tiles in every outdated board view (e.g., home and stream)
+        render_board_views(version, board_views)
     except Exception as e:
         logging.debug(f"Error in sync_board_state: {e}")
 
 
-def update_tile_styles(tile_buttons_dict: dict):
+def subscribe_to_state_changes(client: Client) -> Callable[[], None]:
     """
-    Update styles for each tile and its text labels based on the clicked_tiles set.
+    Re-render the given client's board views whenever the game state changes.
+
+    Replaces per-client polling timers: nothing runs while the game is idle,
+    and a change is pushed to every client as soon as it is published. Each
+    subscription syncs only the views registered for its own client.
+
+    Args:
+        client: The NiceGUI client whose context the updates run in
+
+    Returns:
+        A callable that cancels the subscription
     """
-    from src.config.constants import (
-        FREE_SPACE_TEXT,
-        TILE_CLICKED_BG_COLOR,
-        TILE_CLICKED_TEXT_COLOR,
-        TILE_UNCLICKED_BG_COLOR,
-        TILE_UNCLICKED_TEXT_COLOR,
-    )
-    from src.core.game_logic import board, clicked_tiles
 
-    for (r, c), tile in tile_buttons_dict.items():
-        # tile is a dict with keys "card" and "labels"
-        phrase = board[r][c]
+    def on_state_change(event: StateEvent) -> None:
+        with client:
+            sync_board_state(client_board_views(client))
 
-        if (r, c) in clicked_tiles:
-            new_card_style = f"background-color: {TILE_CLICKED_BG_COLOR}; color: {TILE_CLICKED_TEXT_COLOR}; border: none; outline: 3px solid {TILE_CLICKED_TEXT_COLOR};"
-            new_label_color = TILE_CLICKED_TEXT_COLOR
-        else:
-            new_card_style = f"background-color: {TILE_UNCLICKED_BG_COLOR}; color: {TILE_UNCLICKED_TEXT_COLOR}; border: none;"
-            new_label_color = TILE_UNCLICKED_TEXT_COLOR
+    return get_state_manager().subscribe(on_state_change)
+
+
+def update_tile_styles(
+    tile_buttons_dict: TileButtonsDict,
+    tiles: Optional[Iterable[Coordinate]] = None,
+) -> int:
+    """
+    Update the state class of each tile based on the clicked_tiles set.
+
+    Args:
+        tile_buttons_dict: The view's tile UI elements
+        tiles: Restrict the update to these tiles; all tiles if None
+
+    Returns:
+        The number of element updates sent
+    """
+    from src.core.game_logic import clicked_tiles
 
-        # Update the card style.
-        tile["card"].style(new_card_style)
+    if tiles is None:
+        items = list(tile_buttons_dict.items())
+    else:
+        items = [
+            (key, tile_buttons_dict[key]) for key in tiles if key in tile_buttons_dict
+        ]
+
+    updates = 0
+    for (r, c), tile in items:
+        # The tile's text inherits the card's colour, so only the card changes
+        clicked = (r, c) in clicked_tiles
+
+        # Swap the card's state class; the stylesheet does the rest
+        if clicked:
+            tile["card"].classes(TILE_CLICKED_CLASS, remove=TILE_UNCLICKED_CLASS)
+        else:
+            tile["card"].classes(TILE_UNCLICKED_CLASS, remove=TILE_CLICKED_CLASS)
         tile["card"].update()
+        updates += 1
 
-        # Recalculate the line count for the current phrase.
-        lines = split_phrase_into_lines(phrase)
-        line_count = len(lines)
-        # Recalculate label style based on the new color.
-        new_label_style = get_line_style_for_lines(line_count, new_label_color)
-
-        # Update all label elements for this tile.
-        for label_info in tile["labels"]:
-            lbl = label_info["ref"]
-            # Reapply the stored base classes.
-            lbl.classes(label_info["base_classes"])
-            # Update inline style (which may now use a new color due to tile click state).
-            lbl.style(new_label_style)
-            lbl.update()
+    return updates
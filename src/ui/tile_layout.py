@@ -0,0 +1,225 @@
+"""
+Per-phrase tile layout cache and tile stylesheet for the Bingo application.
+
+How a phrase is laid out on a tile (its lines, their font sizes, the label
+classes and the tile's pre-rendered markup) depends on nothing but the
+phrase, so it is worked out once per phrase instead of for every tile on
+every render. The cache is filled when the phrases are loaded and started
+over when phrases.txt is reloaded; render paths only look layouts up.
+
+Everything else about a tile's look is in a generated stylesheet, served once
+and cached by browsers: a tile shows its state through a class (clicked,
+unclicked, free) and its text through a line-count class, so clicking a tile
+is a single class swap.
+"""
+
+import html
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from src.config.constants import (
+    BOARD_TILE_FONT,
+    BOARD_TILE_FONT_FILE,
+    BOARD_TILE_FONT_STYLE,
+    BOARD_TILE_FONT_WEIGHT,
+    FREE_SPACE_TEXT,
+    FREE_SPACE_TEXT_COLOR,
+    LABEL_CLASSES,
+    LABEL_SMALL_CLASSES,
+    LINE_COUNT_CLASS_PREFIX,
+    TILE_CLICKED_BG_COLOR,
+    TILE_CLICKED_CLASS,
+    TILE_CLICKED_TEXT_COLOR,
+    TILE_COLUMN_CLASSES,
+    TILE_FREE_CLASS,
+    TILE_ROW_CLASSES,
+    TILE_UNCLICKED_BG_COLOR,
+    TILE_UNCLICKED_CLASS,
+    TILE_UNCLICKED_TEXT_COLOR,
+)
+from src.utils.font_metrics import get_font_metrics
+from src.utils.text_processing import (
+    MAX_PHRASE_LINES,
+    fit_line_sizes,
+    line_height_for_lines,
+    split_phrase_into_lines,
+)
+
+TILE_STYLESHEET_PATH = "/tile-styles.css"
+
+# Tile text is sized in cqw, hundredths of the tile's width, so a phrase's
+# sizes hold for every tile size. Tiles are about square; the text fills this
+# share of the tile, inside the card's padding.
+TILE_TEXT_FILL = 80.0
+SMALL_LINE_MAX_SIZE = 40.0  # Cap for lines of up to 3 characters
+MIN_FONT_SIZE = "10px"
+
+
+def fitted_font_size(size: float) -> str:
+    """A CSS font size in cqw, never below MIN_FONT_SIZE."""
+    return f"max({MIN_FONT_SIZE}, {size:.2f}cqw)"
+
+
+def line_count_class(line_count: int) -> str:
+    """The class of a tile text column with line_count lines."""
+    return f"{LINE_COUNT_CLASS_PREFIX}{line_count}"
+
+
+def tile_classes(clicked: bool, free: bool = False) -> str:
+    """The state classes of a tile."""
+    state = TILE_CLICKED_CLASS if clicked else TILE_UNCLICKED_CLASS
+    return f"{state} {TILE_FREE_CLASS}" if free else state
+
+
+@lru_cache(maxsize=None)
+def tile_stylesheet() -> str:
+    """
+    Generate the tile stylesheet: the tile state classes and the text
+    style of each line count.
+
+    Returns:
+        The stylesheet
+    """
+    line_counts = [line_count_class(n) for n in range(1, MAX_PHRASE_LINES + 1)]
+    clicked = f".q-card.{TILE_CLICKED_CLASS}"
+    unclicked = f".q-card.{TILE_UNCLICKED_CLASS}"
+    outline = f"outline: 3px solid {TILE_CLICKED_TEXT_COLOR};"
+    # Tiles are cards; .q-card raises the rules above Quasar's card colours
+    rules = [
+        f"{clicked}, {unclicked} {{ cursor: pointer; border: none; }}",
+        f"{clicked} {{ background-color: {TILE_CLICKED_BG_COLOR}; "
+        f"color: {TILE_CLICKED_TEXT_COLOR}; {outline} }}",
+        f"{unclicked} {{ background-color: {TILE_UNCLICKED_BG_COLOR}; "
+        f"color: {TILE_UNCLICKED_TEXT_COLOR}; }}",
+        # After the state classes, so the free space keeps its own colours
+        f".q-card.{TILE_FREE_CLASS} {{ color: {FREE_SPACE_TEXT_COLOR}; {outline} }}",
+        # Inherited by the lines; a unitless line-height scales with each
+        # line's own font size
+        f"{', '.join('.' + c for c in line_counts)} {{ "
+        f"font-family: '{BOARD_TILE_FONT}', sans-serif; "
+        f"font-weight: {BOARD_TILE_FONT_WEIGHT}; "
+        f"font-style: {BOARD_TILE_FONT_STYLE}; }}",
+    ]
+    rules += [
+        f".{c} {{ line-height: {line_height_for_lines(n)}; }}"
+        for n, c in enumerate(line_counts, 1)
+    ]
+    return "\n".join(rules) + "\n"
+
+
+def tile_stylesheet_url() -> str:
+    """
+    The stylesheet's URL; it changes with the stylesheet, so it can be cached
+    for good.
+    """
+    return f"{TILE_STYLESHEET_PATH}?v={zlib.crc32(tile_stylesheet().encode()):08x}"
+
+
+@dataclass(frozen=True)
+class TileLayout:
+    """How one phrase is laid out on a tile."""
+
+    lines: Tuple[str, ...]
+    font_sizes: Tuple[str, ...]  # CSS font size of each line
+    label_classes: Tuple[str, ...]  # One per line
+    html: str  # The tile's inner markup; the text takes the tile's colour
+
+    @property
+    def line_count(self) -> int:
+        return len(self.lines)
+
+
+def render_tile_html(
+    lines: Sequence[str],
+    font_sizes: Sequence[str],
+    label_classes: Sequence[str],
+) -> str:
+    """
+    Render a tile's inner HTML: a column of one row and label per line.
+
+    Args:
+        lines: The phrase's lines
+        font_sizes: The font size of each line
+        label_classes: The classes of each line's label
+
+    Returns:
+        The tile's inner HTML; the text takes the tile's colour
+    """
+    rows = "".join(
+        f'<div class="{TILE_ROW_CLASSES}">'
+        f'<div class="{classes}" style="font-size: {size};">'
+        f"{html.escape(line)}</div>"
+        "</div>"
+        for line, size, classes in zip(lines, font_sizes, label_classes)
+    )
+    column_classes = f"{TILE_COLUMN_CLASSES} {line_count_class(len(lines))}"
+    return f'<div class="{column_classes}">{rows}</div>'
+
+
+def layout_phrase(phrase: str) -> TileLayout:
+    """Work out a phrase's layout; see TileLayoutCache for the cached one."""
+    lines = tuple(split_phrase_into_lines(phrase))
+    small = [len(line) <= 3 for line in lines]
+    label_classes = tuple(LABEL_SMALL_CLASSES if s else LABEL_CLASSES for s in small)
+    sizes = fit_line_sizes(
+        lines,
+        get_font_metrics(BOARD_TILE_FONT_FILE),
+        TILE_TEXT_FILL,
+        TILE_TEXT_FILL,
+        [SMALL_LINE_MAX_SIZE if s else TILE_TEXT_FILL for s in small],
+    )
+    font_sizes = tuple(fitted_font_size(size) for size in sizes)
+    return TileLayout(
+        lines=lines,
+        font_sizes=font_sizes,
+        label_classes=label_classes,
+        html=render_tile_html(lines, font_sizes, label_classes),
+    )
+
+
+class TileLayoutCache:
+    """
+    The layouts of the loaded phrases. A phrase that was not loaded (e.g. on
+    a board restored from an older phrases.txt) is laid out on first use and
+    kept until the next reload.
+    """
+
+    def __init__(self) -> None:
+        self._layouts: Dict[str, TileLayout] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+    def get(self, phrase: str) -> TileLayout:
+        """Return a phrase's layout."""
+        layout = self._layouts.get(phrase)
+        if layout is not None:
+            self.hits += 1
+            return layout
+        self.misses += 1
+        layout = self._layouts[phrase] = layout_phrase(phrase)
+        return layout
+
+    def load(self, phrases: Iterable[str]) -> None:
+        """
+        Lay out a new set of phrases, dropping all other layouts. The new
+        layouts are swapped in at once, so renders never see a partial cache.
+        """
+        layouts = {phrase: layout_phrase(phrase) for phrase in phrases}
+        layouts.setdefault(FREE_SPACE_TEXT, layout_phrase(FREE_SPACE_TEXT))
+        self._layouts = layouts
+
+
+_layout_cache: Optional[TileLayoutCache] = None
+
+
+def get_layout_cache() -> TileLayoutCache:
+    """Get or create the global tile layout cache."""
+    global _layout_cache
+    if _layout_cache is None:
+        _layout_cache = TileLayoutCache()
+    return _layout_cache
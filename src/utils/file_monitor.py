@@ -1,31 +1,224 @@
 """
 File monitoring utilities for the Bingo application.
+
+One watcher per process follows phrases.txt: when the file changes it reads
+the corpus once and publishes a single CORPUS_CHANGED event, however many
+clients are connected. It waits on inotify where the platform has it and
+compares the file's mtime and size at an interval otherwise.
 """
 
+import asyncio
+import ctypes
+import ctypes.util
 import logging
 import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Final, List, Optional, Tuple
+
+from src.core.state_events import StateEvent, StateEventBus, StateListener
+from src.utils.file_operations import PHRASES_FILE, read_phrases_file
+
+CORPUS_CHANGED: Final[str] = "corpus_changed"  # data: {"phrases": [...]}
+
+PHRASES_POLL_INTERVAL = 1.0  # Seconds between checks without inotify
+PHRASES_POLL_INTERVAL_ENV = "BINGO_PHRASES_POLL_INTERVAL"
+SETTLE_DELAY = 0.1  # Seconds to let an editor finish writing before reading
+
+# inotify(7)
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_EVENT = struct.Struct("iIII")
+
+# What identifies a version of the file: (mtime_ns, size, inode), or None if missing
+FileSignature = Optional[Tuple[int, int, int]]
+
+
+def file_signature(path: Path) -> FileSignature:
+    """The file's current signature; None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class PhrasesWatcher:
+    """
+    Watches the phrases file from a background thread and publishes a
+    CORPUS_CHANGED event, with the reloaded phrases, once per change.
+    """
+
+    def __init__(
+        self,
+        path: str = PHRASES_FILE,
+        poll_interval: float = PHRASES_POLL_INTERVAL,
+        use_inotify: bool = True,
+    ) -> None:
+        """
+        Args:
+            path: The phrases file
+            poll_interval: Seconds between checks when polling
+            use_inotify: Wait on inotify if available; poll if False
+        """
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.events = StateEventBus()
+        self.changes = 0  # Changes detected and published
+        self.mode: Optional[str] = None  # "inotify" or "poll", once started
+        self._signature = file_signature(self.path)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
 
-from src.utils.file_operations import last_phrases_mtime, read_phrases_file
+    def subscribe(self, listener: StateListener) -> Callable[[], None]:
+        """
+        Subscribe to CORPUS_CHANGED events.
 
+        Returns:
+            A callable that cancels the subscription
+        """
+        return self.events.subscribe(listener)
 
-def check_phrases_file_change(update_callback):
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start watching; does nothing if already started.
+
+        Args:
+            loop: Listeners are called on this loop; on the watcher thread if None
+        """
+        if self._thread is not None:
+            return
+        self._loop = loop
+        self._stop.clear()
+        fd = _inotify_watch(self.path.parent) if self.use_inotify else None
+        self.mode = "poll" if fd is None else "inotify"
+        self._thread = threading.Thread(
+            target=self._run, args=(fd,), name="bingo-phrases-watcher", daemon=True
+        )
+        self._thread.start()
+        logging.info(f"Watching {self.path} ({self.mode})")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop watching."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
+
+    def check(self) -> bool:
+        """
+        Publish the corpus if the file changed since it was last seen.
+
+        Returns:
+            True if a change was published
+        """
+        signature = file_signature(self.path)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        if signature is None:
+            logging.warning(f"{self.path} was removed, keeping the current phrases")
+            return False
+        try:
+            phrases = read_phrases_file(str(self.path))
+        except Exception as e:
+            logging.error(f"Error reading {self.path}: {e}")
+            return False
+        logging.info(f"{self.path} changed, reloading {len(phrases)} phrases")
+        self.changes += 1
+        event = StateEvent(CORPUS_CHANGED, {"phrases": phrases})
+        if self._loop is None:
+            self.events.publish(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.events.publish, event)
+        return True
+
+    def _run(self, fd: Optional[int]) -> None:
+        """The watcher thread: wait for changes until stopped."""
+        try:
+            while not self._stop.is_set():
+                if fd is None:
+                    self._stop.wait(self.poll_interval)
+                elif not self._wait_inotify(fd):
+                    continue
+                elif self._stop.wait(SETTLE_DELAY):
+                    break
+                else:
+                    _drain(fd)
+                try:
+                    self.check()
+                except Exception as e:
+                    logging.error(f"Error checking {self.path}: {e}")
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def _wait_inotify(self, fd: int) -> bool:
+        """Wait up to a poll interval for an event about the file."""
+        ready, _, _ = select.select([fd], [], [], self.poll_interval)
+        return bool(ready) and self.path.name in _drain(fd)
+
+
+def _inotify_watch(directory: Path) -> Optional[int]:
     """
-    Check if phrases.txt has changed. If so, re-read the file and call the update callback.
+    Watch a directory with inotify. The directory, not the file, is watched,
+    so editors that save by replacing the file are followed too.
 
-    Args:
-        update_callback: Function to call with the new phrases when the file changes
+    Returns:
+        The inotify file descriptor, or None if inotify is unavailable
     """
-    global last_phrases_mtime
     try:
-        mtime = os.path.getmtime("phrases.txt")
-    except Exception as e:
-        logging.error(f"Error checking phrases.txt: {e}")
-        return
-
-    if mtime != last_phrases_mtime:
-        logging.info("phrases.txt changed, reloading board.")
-        last_phrases_mtime = mtime
-
-        # Re-read phrases.txt and invoke the callback
-        phrases = read_phrases_file()
-        update_callback(phrases)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError) as e:
+        logging.debug(f"inotify is unavailable, polling instead: {e}")
+        return None
+    if fd < 0:
+        logging.debug(
+            f"inotify_init1 failed, polling instead: {os.strerror(ctypes.get_errno())}"
+        )
+        return None
+    mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        error = os.strerror(ctypes.get_errno())
+        logging.debug(f"inotify_add_watch failed, polling instead: {error}")
+        os.close(fd)
+        return None
+    return fd
+
+
+def _drain(fd: int) -> List[str]:
+    """Read all pending inotify events; returns the names of the files they concern."""
+    names = []
+    while True:
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _IN_EVENT.unpack_from(data, offset)
+            offset += _IN_EVENT.size
+            names.append(
+                data[offset : offset + length].rstrip(b"\0").decode(errors="replace")
+            )
+            offset += length
+
+
+_phrases_watcher: Optional[PhrasesWatcher] = None
+
+
+def get_phrases_watcher() -> PhrasesWatcher:
+    """Get or create the process-wide phrases watcher."""
+    global _phrases_watcher
+    if _phrases_watcher is None:
+        interval = float(os.getenv(PHRASES_POLL_INTERVAL_ENV, PHRASES_POLL_INTERVAL))
+        _phrases_watcher = PhrasesWatcher(poll_interval=interval)
+    return _phrases_watcher
@@ -3,10 +3,8 @@ File operation utilities for the Bingo application.
 """
 
 import logging
-import os
 
-# Global variable to track phrases.txt modification time.
-last_phrases_mtime = os.path.getmtime("phrases.txt")
+PHRASES_FILE = "phrases.txt"
 
 
 def has_too_many_repeats(phrase, threshold=0.5):
@@ -28,12 +26,12 @@ def has_too_many_repeats(phrase, threshold=0.5):
     return False
 
 
-def read_phrases_file():
+def read_phrases_file(path: str = PHRASES_FILE):
     """
     Read phrases from phrases.txt, removing duplicates and filtering phrases with too many repeats.
     Returns a list of unique, valid phrases.
     """
-    with open("phrases.txt", "r") as f:
+    with open(path, "r") as f:
         raw_phrases = [line.strip().upper() for line in f if line.strip()]
 
     # Remove duplicates while preserving order.
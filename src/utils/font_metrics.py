@@ -0,0 +1,180 @@
+"""
+Font metrics for the Bingo application.
+
+Reads the glyph advance widths of a bundled TrueType/OpenType font, plain or
+WOFF-wrapped, so text can be sized on the server instead of measured in every
+browser. Kerning is ignored; it shifts a line's width by far less than the
+margin text is fitted with.
+"""
+
+import logging
+import struct
+import zlib
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Estimated advance widths, in ems, of a bold sans-serif font; for fonts
+# that are not bundled
+_APPROXIMATE_ADVANCES: Dict[str, float] = {
+    **{c: 0.70 for c in "ABCDEFGHKLNOPQRSTUVXYZ"},
+    "I": 0.30,
+    "J": 0.56,
+    "M": 0.88,
+    "W": 0.98,
+    **{c: 0.58 for c in "abcdeghknopqsuvxyz"},
+    "f": 0.38,
+    "i": 0.26,
+    "j": 0.26,
+    "l": 0.26,
+    "m": 0.90,
+    "r": 0.40,
+    "t": 0.38,
+    "w": 0.80,
+    **{c: 0.62 for c in "0123456789"},
+    **{c: 0.28 for c in " .,:;!'|"},
+}
+_APPROXIMATE_DEFAULT = 0.60
+
+
+class FontMetrics:
+    """The advance widths of a font's characters."""
+
+    def __init__(self, advances: Dict[int, float], default_advance: float) -> None:
+        """
+        Args:
+            advances: Advance width in ems by code point
+            default_advance: The advance of characters the font has no glyph for
+        """
+        self.advances = advances
+        self.default_advance = default_advance
+
+    def text_width(self, text: str) -> float:
+        """The width of a line of text, in ems."""
+        advances = self.advances
+        default = self.default_advance
+        return sum(advances.get(ord(c), default) for c in text)
+
+    @classmethod
+    def from_font(cls, data: bytes) -> "FontMetrics":
+        """
+        Read the metrics of a font file.
+
+        Args:
+            data: A TrueType/OpenType font, plain or WOFF
+
+        Returns:
+            The font's metrics
+
+        Raises:
+            ValueError: If the font cannot be read
+        """
+        try:
+            tables = _read_tables(data)
+            units_per_em = struct.unpack_from(">H", tables[b"head"], 18)[0]
+            metric_count = struct.unpack_from(">H", tables[b"hhea"], 34)[0]
+            hmtx = tables[b"hmtx"]
+            glyph_advances = [
+                struct.unpack_from(">H", hmtx, 4 * i)[0] for i in range(metric_count)
+            ]
+            cmap = _read_cmap(tables[b"cmap"])
+        except (KeyError, struct.error, zlib.error) as e:
+            raise ValueError(f"Unreadable font: {e}") from e
+
+        def advance(glyph: int) -> float:
+            # Glyphs past the last metric share its advance
+            return glyph_advances[min(glyph, metric_count - 1)] / units_per_em
+
+        advances = {code: advance(glyph) for code, glyph in cmap.items()}
+        return cls(advances, advance(0))
+
+    @classmethod
+    def approximate(cls) -> "FontMetrics":
+        """Estimated metrics of a bold sans-serif font."""
+        advances = {ord(c): width for c, width in _APPROXIMATE_ADVANCES.items()}
+        return cls(advances, _APPROXIMATE_DEFAULT)
+
+
+def _read_tables(data: bytes) -> Dict[bytes, bytes]:
+    """Split a font file into its tables, decompressing WOFF tables."""
+    tables: Dict[bytes, bytes] = {}
+    if data[:4] == b"wOFF":
+        table_count = struct.unpack_from(">H", data, 12)[0]
+        for i in range(table_count):
+            tag, offset, length, original_length, _ = struct.unpack_from(
+                ">4sIIII", data, 44 + 20 * i
+            )
+            table = data[offset : offset + length]
+            tables[tag] = zlib.decompress(table) if length < original_length else table
+        return tables
+    table_count = struct.unpack_from(">H", data, 4)[0]
+    for i in range(table_count):
+        tag, _, offset, length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+        tables[tag] = data[offset : offset + length]
+    return tables
+
+
+def _read_cmap(cmap: bytes) -> Dict[int, int]:
+    """Map code points to glyphs, from a format 12 or format 4 Unicode subtable."""
+    subtables = {}
+    count = struct.unpack_from(">H", cmap, 2)[0]
+    for i in range(count):
+        platform, encoding, offset = struct.unpack_from(">HHI", cmap, 4 + 8 * i)
+        if platform in (0, 3):
+            subtables[struct.unpack_from(">H", cmap, offset)[0]] = offset
+
+    mapping: Dict[int, int] = {}
+    if 12 in subtables:
+        offset = subtables[12]
+        groups = struct.unpack_from(">I", cmap, offset + 12)[0]
+        for i in range(groups):
+            start, end, glyph = struct.unpack_from(">III", cmap, offset + 16 + 12 * i)
+            for code in range(start, end + 1):
+                mapping[code] = glyph + code - start
+        return mapping
+    if 4 not in subtables:
+        raise KeyError("no Unicode cmap")
+
+    offset = subtables[4]
+    segments = struct.unpack_from(">H", cmap, offset + 6)[0] // 2
+    ends = offset + 14
+    starts = ends + 2 * segments + 2
+    deltas = starts + 2 * segments
+    range_offsets = deltas + 2 * segments
+    for s in range(segments):
+        end = struct.unpack_from(">H", cmap, ends + 2 * s)[0]
+        start = struct.unpack_from(">H", cmap, starts + 2 * s)[0]
+        delta = struct.unpack_from(">h", cmap, deltas + 2 * s)[0]
+        range_offset = struct.unpack_from(">H", cmap, range_offsets + 2 * s)[0]
+        for code in range(start, min(end, 0xFFFE) + 1):
+            if range_offset == 0:
+                glyph = (code + delta) & 0xFFFF
+            else:
+                address = range_offsets + 2 * s + range_offset + 2 * (code - start)
+                glyph = struct.unpack_from(">H", cmap, address)[0]
+                if glyph:
+                    glyph = (glyph + delta) & 0xFFFF
+            if glyph:
+                mapping[code] = glyph
+    return mapping
+
+
+@lru_cache(maxsize=None)
+def get_font_metrics(path: Optional[str]) -> FontMetrics:
+    """
+    Get the metrics of a bundled font file.
+
+    Args:
+        path: The font file
+
+    Returns:
+        The font's metrics, or estimated ones if the file is missing or unreadable
+    """
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                return FontMetrics.from_font(f.read())
+        except FileNotFoundError:
+            logging.debug(f"Font {path} is not bundled, estimating its metrics")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to read font metrics from {path}: {e}")
+    return FontMetrics.approximate()
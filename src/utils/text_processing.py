@@ -2,21 +2,153 @@
 Text processing utilities for the Bingo application.
 """
 
+from typing import Callable, List, Optional, Sequence, Tuple
+
 from src.config.constants import (
     BOARD_TILE_FONT,
     BOARD_TILE_FONT_STYLE,
     BOARD_TILE_FONT_WEIGHT,
 )
+from src.utils.font_metrics import FontMetrics
+
+# Lines a phrase is split into at most
+MAX_PHRASE_LINES = 4
+
+# A balance objective scores a split by the lengths of its longest and
+# shortest lines; lower is better. It must not decrease as the longest line
+# grows or the shortest shrinks.
+LineObjective = Callable[[int, int], int]
+
+
+def line_spread(longest: int, shortest: int) -> int:
+    """Balance objective: the difference between the longest and shortest line."""
+    return longest - shortest
+
+
+def line_width(longest: int, shortest: int) -> int:
+    """Balance objective: the longest line, i.e. the width of the text."""
+    return longest
+
+
+# The (longest, shortest) line lengths a split of some words can reach, with
+# dominated pairs dropped
+_Extremes = List[Tuple[int, int]]
+
+
+def _pareto(pairs: List[Tuple[int, int]]) -> _Extremes:
+    """Drop the pairs another pair beats on both the longest and the shortest line."""
+    pairs.sort(key=lambda pair: (pair[0], -pair[1]))
+    front: _Extremes = [pairs[0]]
+    for pair in pairs:
+        if pair[1] > front[-1][1]:
+            front.append(pair)
+    return front
+
+
+def _line_extremes(prefix: List[int], max_lines: int) -> List[List[_Extremes]]:
+    """
+    The dynamic program of partition_words: reach[r][i] holds the extremes
+    of splitting the words from i on into r lines, for r up to max_lines.
+    """
+    n = len(prefix) - 1
+    reach: List[List[_Extremes]] = [[], []]
+    for i in range(n):
+        last = prefix[n] - prefix[i] + n - i - 1
+        reach[1].append([(last, last)])
+    for r in range(2, max_lines + 1):
+        rest = reach[r - 1]
+        level: List[_Extremes] = []
+        for i in range(n - r + 1):
+            pairs = []
+            for j in range(i + 1, n - r + 2):
+                line = prefix[j] - prefix[i] + j - i - 1
+                for longest, shortest in rest[j]:
+                    pairs.append((max(line, longest), min(line, shortest)))
+            level.append(_pareto(pairs))
+        reach.append(level)
+    return reach
+
+
+def _earliest_breaks(
+    prefix: List[int],
+    reach: List[List[_Extremes]],
+    line_count: int,
+    objective: LineObjective,
+    best: int,
+) -> List[int]:
+    """The earliest line breaks of a split into line_count lines scoring best."""
+    n = len(prefix) - 1
+    breaks: List[int] = []
+    # Extremes of the lines so far; no line is longer than all the words
+    start, longest_so_far, shortest_so_far = 0, 0, prefix[n] + n
+    for r in range(line_count, 1, -1):
+        # The earliest break from which the best score is still reachable
+        for j in range(start + 1, n - r + 2):
+            line = prefix[j] - prefix[start] + j - start - 1
+            longest = max(longest_so_far, line)
+            shortest = min(shortest_so_far, line)
+            if any(
+                objective(max(longest, rest[0]), min(shortest, rest[1])) == best
+                for rest in reach[r - 1][j]
+            ):
+                break
+        breaks.append(j)
+        start, longest_so_far, shortest_so_far = j, longest, shortest
+    return breaks
+
+
+def _prefix_lengths(words: Sequence[str]) -> List[int]:
+    """prefix[i] is the length of the first i words, without spaces."""
+    prefix = [0]
+    for word in words:
+        prefix.append(prefix[-1] + len(word))
+    return prefix
+
+
+def partition_words(
+    words: Sequence[str], line_count: int, objective: LineObjective = line_spread
+) -> Tuple[int, List[int]]:
+    """
+    Split words into line_count non-empty lines, balanced by the objective
+    (linear partition).
 
+    Line lengths, spaces included, come from prefix sums of the word
+    lengths. For each suffix of the words and each number of lines, a dynamic
+    program keeps the (longest, shortest) line pairs its splits can reach,
+    which is all a monotone objective needs. Among equally good splits, the
+    one with the earliest line breaks wins.
 
-def split_phrase_into_lines(phrase: str, forced_lines: int = None) -> list:
+    Args:
+        words: The words, at least line_count of them
+        line_count: The number of lines
+        objective: Scores a split by its longest and shortest line
+
+    Returns:
+        The score of the best split and the index of the first word of
+        each line after the first
+    """
+    if not 1 <= line_count <= len(words):
+        raise ValueError(f"Cannot split {len(words)} words into {line_count} lines")
+    prefix = _prefix_lengths(words)
+    reach = _line_extremes(prefix, line_count)
+    best = min(objective(*extremes) for extremes in reach[line_count][0])
+    return best, _earliest_breaks(prefix, reach, line_count, objective, best)
+
+
+def split_phrase_into_lines(
+    phrase: str,
+    forced_lines: int = None,
+    max_lines: int = MAX_PHRASE_LINES,
+    objective: LineObjective = line_spread,
+) -> list:
     """
     Splits the phrase into balanced lines.
     For phrases of up to 3 words, return one word per line.
-    For longer phrases, try splitting the phrase into 2, 3, or 4 lines so that the total
-    number of characters (including spaces) in each line is as similar as possible.
-    The function will never return more than 4 lines.
-    If 'forced_lines' is provided (2, 3, or 4), then the candidate with that many lines is chosen
+    For longer phrases, try splitting the phrase into 2 to max_lines lines (and
+    fewer lines than words) so that the total number of characters (including
+    spaces) in each line is as similar as possible, or whatever the objective
+    prefers; the fewest lines win a tie.
+    If 'forced_lines' is provided, then the candidate with that many lines is chosen
     if available; otherwise, the best candidate overall is returned.
     """
     words = phrase.split()
@@ -24,106 +156,81 @@ def split_phrase_into_lines(phrase: str, forced_lines: int = None) -> list:
     if n <= 3:
         return words
 
-    # Helper: total length of a list of words (including spaces between words).
-    def segment_length(segment):
-        return sum(len(word) for word in segment) + (len(segment) - 1 if segment else 0)
-
-    candidates = []  # list of tuples: (number_of_lines, diff, candidate)
-
-    # 2-line candidate
-    best_diff_2 = float("inf")
-    best_seg_2 = None
-    for i in range(1, n):
-        seg1 = words[:i]
-        seg2 = words[i:]
-        len1 = segment_length(seg1)
-        len2 = segment_length(seg2)
-        diff = abs(len1 - len2)
-        if diff < best_diff_2:
-            best_diff_2 = diff
-            best_seg_2 = [" ".join(seg1), " ".join(seg2)]
-    if best_seg_2 is not None:
-        candidates.append((2, best_diff_2, best_seg_2))
-
-    # 3-line candidate (if at least 4 words)
-    if n >= 4:
-        best_diff_3 = float("inf")
-        best_seg_3 = None
-        for i in range(1, n - 1):
-            for j in range(i + 1, n):
-                seg1 = words[:i]
-                seg2 = words[i:j]
-                seg3 = words[j:]
-                len1 = segment_length(seg1)
-                len2 = segment_length(seg2)
-                len3 = segment_length(seg3)
-                current_diff = max(len1, len2, len3) - min(len1, len2, len3)
-                if current_diff < best_diff_3:
-                    best_diff_3 = current_diff
-                    best_seg_3 = [" ".join(seg1), " ".join(seg2), " ".join(seg3)]
-        if best_seg_3 is not None:
-            candidates.append((3, best_diff_3, best_seg_3))
-
-    # 4-line candidate (if at least 5 words)
-    if n >= 5:
-        best_diff_4 = float("inf")
-        best_seg_4 = None
-        for i in range(1, n - 2):
-            for j in range(i + 1, n - 1):
-                for k in range(j + 1, n):
-                    seg1 = words[:i]
-                    seg2 = words[i:j]
-                    seg3 = words[j:k]
-                    seg4 = words[k:]
-                    len1 = segment_length(seg1)
-                    len2 = segment_length(seg2)
-                    len3 = segment_length(seg3)
-                    len4 = segment_length(seg4)
-                    diff = max(len1, len2, len3, len4) - min(len1, len2, len3, len4)
-                    if diff < best_diff_4:
-                        best_diff_4 = diff
-                        best_seg_4 = [
-                            " ".join(seg1),
-                            " ".join(seg2),
-                            " ".join(seg3),
-                            " ".join(seg4),
-                        ]
-        if best_seg_4 is not None:
-            candidates.append((4, best_diff_4, best_seg_4))
-
-    # If a forced number of lines is specified, try to return that candidate first.
-    if forced_lines is not None:
-        forced_candidates = [cand for cand in candidates if cand[0] == forced_lines]
-        if forced_candidates:
-            _, _, best_candidate = min(forced_candidates, key=lambda x: x[1])
-            return best_candidate
-
-    # Otherwise, choose the candidate with the smallest diff.
-    if candidates:
-        _, _, best_candidate = min(candidates, key=lambda x: x[1])
-        return best_candidate
-    else:
-        # fallback (should never happen)
+    line_counts = range(2, min(max_lines, n - 1) + 1)
+    if forced_lines in line_counts:
+        line_counts = range(forced_lines, forced_lines + 1)
+    if not line_counts:
         return [" ".join(words)]
 
+    # One dynamic program for all line counts; only the best count's breaks
+    # are worked out
+    prefix = _prefix_lengths(words)
+    reach = _line_extremes(prefix, line_counts[-1])
+    scores = [
+        (min(objective(*extremes) for extremes in reach[count][0]), count)
+        for count in line_counts
+    ]
+    best, line_count = min(scores)
+    breaks = _earliest_breaks(prefix, reach, line_count, objective, best)
+    bounds = [0] + breaks + [n]
+    return [" ".join(words[i:j]) for i, j in zip(bounds, bounds[1:])]
 
-def get_line_style_for_lines(line_count: int, default_text_color: str) -> str:
+
+def line_height_for_lines(line_count: int) -> float:
     """
-    Return a complete style string with an adjusted line-height based on the number of lines
-    that resulted from splitting the phrase.
+    The line-height, in ems, of a phrase split into line_count lines.
     Fewer lines (i.e. unsplit phrases) get a higher line-height, while more lines get a lower one.
     """
     if line_count == 1:
-        lh = "1.5em"  # More spacing for a single line.
+        return 1.5  # More spacing for a single line.
     elif line_count == 2:
-        lh = "1.2em"  # Slightly reduced spacing for two lines.
+        return 1.2  # Slightly reduced spacing for two lines.
     elif line_count == 3:
-        lh = "0.9em"  # Even tighter spacing for three lines.
+        return 0.9  # Even tighter spacing for three lines.
     else:
-        lh = "0.7em"  # For four or more lines.
+        return 0.7  # For four or more lines.
+
+
+def get_line_style_for_lines(line_count: int, default_text_color: str) -> str:
+    """
+    Return a complete style string with an adjusted line-height based on the number of lines
+    that resulted from splitting the phrase.
+    """
+    lh = f"{line_height_for_lines(line_count)}em"
     return f"font-family: '{BOARD_TILE_FONT}', sans-serif; font-weight: {BOARD_TILE_FONT_WEIGHT}; font-style: {BOARD_TILE_FONT_STYLE}; padding: 0; margin: 0; color: {default_text_color}; line-height: {lh};"
 
 
+def fit_line_sizes(
+    lines: Sequence[str],
+    metrics: FontMetrics,
+    width: float,
+    height: float,
+    max_sizes: Optional[Sequence[float]] = None,
+) -> List[float]:
+    """
+    Font sizes that make each line fill the width, as fitty's multi-line fit
+    would, scaled down together if the lines would not fit the height.
+
+    Args:
+        lines: The lines of text
+        metrics: The metrics of the font the lines are set in
+        width: The width to fill, in any unit
+        height: The height available, in the same unit
+        max_sizes: The largest size of each line, if capped
+
+    Returns:
+        The font size of each line, in the unit of width
+    """
+    sizes = [width / max(metrics.text_width(line), 0.01) for line in lines]
+    if max_sizes is not None:
+        sizes = [min(size, cap) for size, cap in zip(sizes, max_sizes)]
+    line_height = line_height_for_lines(len(lines))
+    total_height = sum(sizes) * line_height
+    if total_height > height:
+        sizes = [size * height / total_height for size in sizes]
+    return sizes
+
+
 def get_google_font_css(
     font_name: str, weight: str, style: str, uniquifier: str
 ) -> str:
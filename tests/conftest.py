@@ -0,0 +1,24 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+from src.core import state_manager
+from src.core.state_store import STATE_PATH_ENV
+
+
+@pytest.fixture(autouse=True)
+def default_state_file(tmp_path, monkeypatch):
+    """
+    Point the default state store at tmp_path, so its game_state.json,
+    .journal and .lock files never land in the repo root.
+
+    Tests that are not handed the fixture (unittest.TestCase setUp, say)
+    find the path in BINGO_STATE_PATH.
+    """
+    path = tmp_path / "game_state.json"
+    monkeypatch.setenv(STATE_PATH_ENV, str(path))
+    # The shared manager would keep its store on the previous path
+    monkeypatch.setattr(state_manager, "_state_manager", None)
+    return path
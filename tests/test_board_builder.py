@@ -23,8 +23,8 @@ class TestBoardBuilder(unittest.TestCase):
     def setUp(self):
         # Setup common test data and mocks
         self.patches = [
-            patch("src.config.constants.BOARD_TILE_FONT", "Inter"),
-            patch("src.config.constants.BOARD_TILE_FONT_WEIGHT", "700"),
+            patch("src.config.constants.BOARD_TILE_FONT", "Super Carnival"),
+            patch("src.config.constants.BOARD_TILE_FONT_WEIGHT", "400"),
             patch("src.config.constants.BOARD_TILE_FONT_STYLE", "normal"),
             patch("src.config.constants.TILE_CLICKED_BG_COLOR", "#100079"),
             patch("src.config.constants.TILE_CLICKED_TEXT_COLOR", "#1BEFF5"),
@@ -90,15 +90,16 @@ class TestBoardBuilder(unittest.TestCase):
         # Verify the inner div is created and has the correct classes
         # The code calls ui.element("div").classes(...) in a single chain
         # so we assert that element was called and its return value's classes method was called
-        mock_inner_div.classes.assert_called_with("flex justify-center items-center h-full w-full")
+        mock_inner_div.classes.assert_called_with(
+            "flex justify-center items-center h-full w-full fit-container"
+        )
         
         # Verify label was created with correct text and styling
         mock_ui.label.assert_called_with("GAME CLOSED")
         mock_label.classes.assert_called_with("text-center fit-header")
-        # Don't assert the exact style string as it depends on actual constants
-        
-        # Verify JavaScript was run
-        mock_ui.run_javascript.assert_called_once()
+        # The message is sized on the server, in units of its container
+        self.assertIn("cqw", mock_label.style.call_args[0][0])
+        mock_ui.run_javascript.assert_not_called()
 
     @patch("src.ui.board_builder.ui")
     def test_build_board(self, mock_ui):
@@ -112,10 +113,7 @@ class TestBoardBuilder(unittest.TestCase):
         # Setup UI element mocks
         mock_div = MagicMock()
         mock_grid = MagicMock()
-        mock_card = MagicMock()
-        mock_column = MagicMock()
-        mock_row = MagicMock()
-        mock_label = MagicMock()
+        mock_tile = MagicMock()
         
         # Configure ui.element to return our mock div
         mock_ui.element.return_value = mock_div
@@ -127,27 +125,11 @@ class TestBoardBuilder(unittest.TestCase):
         mock_grid.__enter__.return_value = mock_grid
         mock_grid.classes.return_value = mock_grid
         
-        # Configure ui.card to return our mock card
-        mock_ui.card.return_value = mock_card
-        mock_card.__enter__.return_value = mock_card
-        mock_card.classes.return_value = mock_card
-        mock_card.style.return_value = mock_card
-        mock_card.on.return_value = mock_card
-        
-        # Configure ui.column to return our mock column
-        mock_ui.column.return_value = mock_column
-        mock_column.__enter__.return_value = mock_column
-        mock_column.classes.return_value = mock_column
-        
-        # Configure ui.row to return our mock row
-        mock_ui.row.return_value = mock_row
-        mock_row.__enter__.return_value = mock_row
-        mock_row.classes.return_value = mock_row
-        
-        # Configure ui.label to return our mock label
-        mock_ui.label.return_value = mock_label
-        mock_label.classes.return_value = mock_label
-        mock_label.style.return_value = mock_label
+        # Configure ui.html to return our mock tile
+        mock_ui.html.return_value = mock_tile
+        mock_tile.classes.return_value = mock_tile
+        mock_tile.style.return_value = mock_tile
+        mock_tile.on.return_value = mock_tile
         
         # Create an empty dictionary for the tile buttons
         tile_buttons_dict: TileButtonsDict = {}
@@ -165,11 +147,12 @@ class TestBoardBuilder(unittest.TestCase):
         self.assertIn((1, 0), tile_buttons_dict)
         self.assertIn((1, 1), tile_buttons_dict)
         
-        # Verify each tile has card and labels
+        # Verify each tile is a single pre-rendered element
         for coord, tile_data in tile_buttons_dict.items():
-            self.assertIn("card", tile_data)
-            self.assertIn("labels", tile_data)
-            self.assertEqual(tile_data["card"], mock_card)
+            self.assertEqual(tile_data, {"card": mock_tile})
+        self.assertEqual(mock_ui.html.call_count, 4)
+        mock_ui.card.assert_not_called()
+        mock_ui.label.assert_not_called()
             
         # Verify UI components were created correctly
         # We can only check the last calls since we're reusing the same mocks
@@ -178,6 +161,20 @@ class TestBoardBuilder(unittest.TestCase):
         mock_ui.grid.assert_called_with(columns=5)
         # Don't verify specific calls to grid.classes() as it might be called differently in the actual code
 
+    def test_build_tile_html(self):
+        """Test that tile markup has one row and label per line, escaped"""
+        from src.ui.board_builder import build_tile_html
+        from src.utils.text_processing import split_phrase_into_lines
+
+        phrase = "FIX <TESTS> AND SHIP THE RELEASE"
+        markup = build_tile_html(phrase)
+
+        self.assertIn("&lt;TESTS&gt;", markup)
+        self.assertNotIn("<TESTS>", markup)
+        self.assertEqual(markup.count("nicegui-row"), len(split_phrase_into_lines(phrase)))
+        # The text takes the colour of the tile's state class
+        self.assertNotIn("color", markup)
+
     @patch("src.ui.head.setup_head")
     @patch("src.ui.board_builder.ui")
     @patch("src.ui.board_builder.build_board")
@@ -267,13 +264,12 @@ class TestBoardBuilderClosedGame(unittest.TestCase):
     """Test board builder behavior when game is closed."""
 
     @patch('src.ui.board_builder.ui')
-    @patch('src.ui.board_builder.app')
     @patch('src.ui.board_builder.build_closed_message')
     @patch('src.ui.board_builder.build_board')
     def test_stream_view_shows_closed_message_when_game_closed(self,
                                                                mock_build_board, 
                                                                mock_build_closed_message,
-                                                               mock_app, mock_ui):
+                                                               mock_ui):
         """Test that stream view shows closed message when game is closed on initial load."""
         # Arrange
         mock_container = MagicMock()
@@ -302,13 +298,12 @@ class TestBoardBuilderClosedGame(unittest.TestCase):
             self.assertEqual(board_views["stream"][1], {})  # Empty tiles dict
 
     @patch('src.ui.board_builder.ui')
-    @patch('src.ui.board_builder.app')
     @patch('src.ui.board_builder.build_closed_message')
     @patch('src.ui.board_builder.build_board')
     def test_stream_view_shows_board_when_game_open(self,
                                                     mock_build_board, 
                                                     mock_build_closed_message,
-                                                    mock_app, mock_ui):
+                                                    mock_ui):
         """Test that stream view shows board when game is open."""
         # Arrange
         mock_container = MagicMock()
@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the parent directory to sys.path to import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Mock NiceGUI imports before importing modules that use them
+sys.modules["nicegui"] = MagicMock()
+sys.modules["nicegui.ui"] = MagicMock()
+
+from src.config.constants import FREE_SPACE_TEXT
+from src.core.win_patterns import tile_bit
+from src.ui.client_board import (
+    _client_boards,
+    board_state_payload,
+    get_client_board,
+    is_client_view,
+    register_client_view,
+)
+
+
+class TestClientBoard(unittest.TestCase):
+    def setUp(self):
+        self.board = [[f"PHRASE {r}{c}" for c in range(5)] for r in range(5)]
+        self.board[2][2] = FREE_SPACE_TEXT
+
+    def test_board_state_payload(self):
+        """Test the payload carries the phrases, clicked tiles and patterns"""
+        payload = board_state_payload(
+            12, self.board, {(2, 2), (0, 4)}, {"row0", "col4"}
+        )
+
+        self.assertEqual(payload["board_version"], 12)
+        self.assertEqual(len(payload["phrases"]), 25)
+        self.assertIn(">01<", payload["phrases"][1])
+        self.assertEqual(payload["clicked_bitmask"], tile_bit(2, 2) | tile_bit(0, 4))
+        self.assertEqual(payload["free_bitmask"], tile_bit(2, 2))
+        self.assertEqual(payload["patterns"], ["col4", "row0"])
+
+    def test_closed_message_replaces_client_board(self):
+        """Test a view showing the closed message has no client board to push to"""
+        from src.ui.board_builder import build_closed_message
+
+        container = MagicMock()
+        register_client_view(container)
+        _client_boards[container] = MagicMock()
+
+        build_closed_message(container)
+
+        self.assertIsNone(get_client_board(container))
+        self.assertTrue(is_client_view(container))
+
+
+if __name__ == "__main__":
+    unittest.main()
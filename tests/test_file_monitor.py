@@ -0,0 +1,138 @@
+"""
+Tests for the process-wide phrases.txt watcher.
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import file_monitor
+from src.utils.file_monitor import CORPUS_CHANGED, PhrasesWatcher
+
+
+def write_phrases(path, *phrases):
+    path.write_text("\n".join(phrases) + "\n")
+
+
+@pytest.fixture
+def phrases_file(tmp_path):
+    path = tmp_path / "phrases.txt"
+    write_phrases(path, "first phrase", "second phrase")
+    return path
+
+
+def collect(watcher):
+    """Subscribe to the watcher; returns the events seen and an Event set on each."""
+    seen = []
+    arrived = threading.Event()
+
+    def listener(event):
+        seen.append(event)
+        arrived.set()
+
+    watcher.subscribe(listener)
+    return seen, arrived
+
+
+@pytest.mark.unit
+class TestPhrasesWatcherCheck:
+    """Test change detection, without the watcher thread."""
+
+    def test_unchanged_file_is_not_published(self, phrases_file):
+        """Test nothing is published while the file stays the same."""
+        watcher = PhrasesWatcher(str(phrases_file))
+        seen, _ = collect(watcher)
+
+        assert not watcher.check()
+        assert seen == []
+
+    def test_change_is_published_once(self, phrases_file):
+        """Test one change reads the corpus once, for every subscriber."""
+        watcher = PhrasesWatcher(str(phrases_file))
+        seen, _ = collect(watcher)
+        other, _ = collect(watcher)
+        write_phrases(phrases_file, "a new phrase", "another new phrase, longer")
+
+        with patch.object(
+            file_monitor, "read_phrases_file", wraps=file_monitor.read_phrases_file
+        ) as reader:
+            assert watcher.check()
+            assert not watcher.check()
+        reader.assert_called_once()
+
+        assert len(seen) == len(other) == 1
+        assert seen[0].kind == CORPUS_CHANGED
+        assert seen[0].data["phrases"] == ["A NEW PHRASE", "ANOTHER NEW PHRASE, LONGER"]
+        assert watcher.changes == 1
+
+    def test_removed_file_keeps_the_corpus(self, phrases_file):
+        """Test a removed file is not published as an empty corpus."""
+        watcher = PhrasesWatcher(str(phrases_file))
+        seen, _ = collect(watcher)
+        phrases_file.unlink()
+
+        assert not watcher.check()
+        write_phrases(phrases_file, "back again")
+        assert watcher.check()
+        assert seen[0].data["phrases"] == ["BACK AGAIN"]
+
+
+@pytest.mark.unit
+class TestPhrasesWatcherThread:
+    """Test the watcher thread notices changes by itself."""
+
+    @pytest.mark.parametrize("use_inotify", [False, True])
+    def test_change_is_noticed(self, phrases_file, use_inotify):
+        """Test an edit is published once, by inotify or by polling."""
+        watcher = PhrasesWatcher(
+            str(phrases_file), poll_interval=0.05, use_inotify=use_inotify
+        )
+        seen, arrived = collect(watcher)
+        watcher.start()
+        try:
+            if use_inotify and watcher.mode != "inotify":
+                pytest.skip("inotify is unavailable")
+            write_phrases(phrases_file, "edited phrase")
+            assert arrived.wait(5)
+        finally:
+            watcher.stop(5)
+
+        assert [event.data["phrases"] for event in seen] == [["EDITED PHRASE"]]
+
+    def test_replaced_file_is_noticed(self, phrases_file):
+        """Test a file saved by renaming a new one over it is followed."""
+        watcher = PhrasesWatcher(str(phrases_file), poll_interval=0.05)
+        seen, arrived = collect(watcher)
+        watcher.start()
+        try:
+            replacement = phrases_file.with_suffix(".tmp")
+            write_phrases(replacement, "replaced phrase")
+            replacement.replace(phrases_file)
+            assert arrived.wait(5)
+        finally:
+            watcher.stop(5)
+
+        assert seen[-1].data["phrases"] == ["REPLACED PHRASE"]
+
+    async def test_listeners_run_on_the_loop(self, phrases_file):
+        """Test events are delivered on the event loop the watcher was started with."""
+        loop = asyncio.get_running_loop()
+        delivered = asyncio.Event()
+        threads = []
+
+        def listener(event):
+            threads.append(threading.current_thread())
+            delivered.set()
+
+        watcher = PhrasesWatcher(str(phrases_file), poll_interval=0.05)
+        watcher.subscribe(listener)
+        watcher.start(loop)
+        try:
+            write_phrases(phrases_file, "on the loop")
+            await asyncio.wait_for(delivered.wait(), 5)
+        finally:
+            watcher.stop(5)
+
+        assert threads == [threading.main_thread()]
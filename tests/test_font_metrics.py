@@ -0,0 +1,43 @@
+"""
+Pure unit tests for reading font metrics.
+"""
+
+import pytest
+
+from src.config.constants import BOARD_TILE_FONT_FILE, HEADER_FONT_FILE
+from src.utils.font_metrics import FontMetrics, get_font_metrics
+
+
+@pytest.mark.unit
+class TestFontMetrics:
+    """Test advance widths read from font files."""
+
+    def test_reads_bundled_woff(self):
+        """Test the bundled header font's widths are read from its tables."""
+        with open(HEADER_FONT_FILE, "rb") as f:
+            metrics = FontMetrics.from_font(f.read())
+
+        assert all(ord(c) in metrics.advances for c in "COMMIT !BINGO")
+        assert metrics.text_width("W") > metrics.text_width("I") > 0
+        assert metrics.text_width("BINGO") == pytest.approx(
+            sum(metrics.text_width(c) for c in "BINGO")
+        )
+
+    def test_tile_font_is_bundled(self):
+        """Test tiles are fitted with the tile font's own metrics, not estimates."""
+        metrics = get_font_metrics(BOARD_TILE_FONT_FILE)
+
+        assert metrics.advances != FontMetrics.approximate().advances
+        assert all(ord(c) in metrics.advances for c in "AZ az 09 !?'")
+
+    def test_unreadable_font_raises(self):
+        """Test a file that is not a font is rejected."""
+        with pytest.raises(ValueError):
+            FontMetrics.from_font(b"wOFF" + b"\0" * 40)
+
+    def test_missing_font_is_estimated(self, tmp_path):
+        """Test a font that is not bundled gets estimated metrics."""
+        metrics = get_font_metrics(str(tmp_path / "missing.woff"))
+
+        assert metrics.text_width("MW") > metrics.text_width("il") > 0
+        assert metrics.text_width("☃") == metrics.default_advance
@@ -10,6 +10,7 @@ import pytest
 
 from src.config.constants import FREE_SPACE_TEXT
 from src.core.game_logic import check_winner, generate_board
+from src.core.win_patterns import tiles_to_mask
 
 
 @pytest.mark.unit
@@ -81,6 +82,7 @@ class TestWinConditions:
         # Mock the global state
         import src.core.game_logic as gl
         gl.clicked_tiles = set()
+        gl.clicked_mask = 0
         gl.bingo_patterns = set()
         gl.is_game_closed = False
     
@@ -215,6 +217,50 @@ class TestWinConditions:
         
         mock_notify.assert_not_called()
 
+    @patch('src.core.game_logic.ui.notify')
+    def test_check_winner_retracts_on_untoggle(self, mock_notify):
+        """Test that un-clicking a tile withdraws the wins through it."""
+        import src.core.game_logic as gl
+
+        gl.clicked_tiles = {(0, c) for c in range(5)} | {(r, 0) for r in range(5)}
+        check_winner()
+        assert gl.bingo_patterns == {"row0", "col0"}
+
+        # Breaking row0 keeps col0; re-completing row0 is a double bingo again
+        gl.clicked_tiles.discard((0, 3))
+        check_winner((0, 3))
+        assert gl.bingo_patterns == {"col0"}
+        assert gl.win_tracker.count("standard") == 1
+
+        mock_notify.reset_mock()
+        gl.clicked_tiles.add((0, 3))
+        check_winner((0, 3))
+        assert gl.bingo_patterns == {"row0", "col0"}
+        mock_notify.assert_called_once_with("DOUBLE BINGO!", color="green", duration=5)
+
+    @patch('src.core.game_logic.ui.notify')
+    def test_check_winner_custom_pattern(self, mock_notify):
+        """Test that registered custom shapes are detected and announced."""
+        import src.core.game_logic as gl
+        from src.core.win_patterns import (
+            PatternRegistry,
+            WinPattern,
+            default_patterns,
+            set_pattern_registry,
+        )
+
+        stamp = WinPattern("postage_stamp", ((0, 3), (0, 4), (1, 3), (1, 4)))
+        set_pattern_registry(PatternRegistry(default_patterns() + [stamp]))
+        try:
+            gl.clicked_tiles = {(0, 3), (0, 4), (1, 3), (1, 4)}
+            gl.clicked_mask = tiles_to_mask(gl.clicked_tiles)
+            check_winner((1, 4))
+        finally:
+            set_pattern_registry(None)
+
+        assert gl.bingo_patterns == {"postage_stamp"}
+        mock_notify.assert_called_once_with("Postage Stamp Bingo!", color="blue", duration=5)
+
 
 @pytest.mark.unit
 class TestStateManagement:
@@ -224,6 +270,7 @@ class TestStateManagement:
         """Reset game state before each test."""
         import src.core.game_logic as gl
         gl.clicked_tiles = set()
+        gl.clicked_mask = 0
         gl.bingo_patterns = set()
         gl.is_game_closed = False
         gl.board = []
@@ -260,4 +307,45 @@ class TestStateManagement:
                 assert len(row) == 5
             
             # Should always have free space at center
-            assert board[2][2] == FREE_SPACE_TEXT
\ No newline at end of file
+            assert board[2][2] == FREE_SPACE_TEXT
+    @patch('src.core.game_logic.publish_state_change')
+    @patch('src.core.game_logic.apply_state_change')
+    def test_generate_new_board_is_one_change(self, mock_apply, mock_publish):
+        """Test a new board is committed and published once, wins and clicks reset."""
+        import src.core.game_logic as gl
+        from src.core.state_events import BOARD_REPLACED
+
+        gl.bingo_patterns = {"row0"}
+        gl.clicked_tiles = {(0, c) for c in range(5)}
+        with patch('src.core.game_logic.board_views', {}):
+            gl.generate_new_board([f"PHRASE_{i}" for i in range(30)])
+
+        assert gl.board_iteration == 2
+        assert gl.bingo_patterns == set()
+        assert gl.clicked_tiles == {(2, 2)}
+        mock_apply.assert_called_once_with(
+            BOARD_REPLACED, board=gl.board, iteration=2, seed=gl.today_seed
+        )
+        mock_publish.assert_called_once_with(BOARD_REPLACED, iteration=2, seed=gl.today_seed)
+
+    @patch('src.core.game_logic.publish_state_change')
+    @patch('src.core.game_logic.apply_state_change')
+    @patch('src.core.game_logic.ui')
+    def test_toggle_tile_saves_delta(self, mock_ui, mock_apply, mock_publish):
+        """Test a toggle saves just the tile and the wins it changed."""
+        import src.core.game_logic as gl
+        from src.core.state_events import TILE_TOGGLED
+
+        gl.clicked_tiles = {(0, c) for c in range(4)}
+        gl.clicked_mask = tiles_to_mask(gl.clicked_tiles)
+        gl.toggle_tile(0, 4)
+        mock_apply.assert_called_once_with(
+            TILE_TOGGLED, row=0, col=4, clicked=True, won=["row0"]
+        )
+
+        mock_apply.reset_mock()
+        gl.toggle_tile(0, 4)
+        mock_apply.assert_called_once_with(
+            TILE_TOGGLED, row=0, col=4, clicked=False, lost=["row0"]
+        )
+        assert gl.bingo_patterns == set()
@@ -2,9 +2,7 @@
 BDD tests for multi-session concurrent access scenarios.
 """
 
-import json
 import time
-from pathlib import Path
 from threading import Lock, Thread
 from unittest.mock import MagicMock, patch
 
@@ -12,6 +10,7 @@ import pytest
 from pytest_bdd import given, parsers, scenarios, then, when
 
 from src.core import game_logic
+from src.core.state_manager import GameStateManager
 
 # Load scenarios from feature file
 scenarios('features/multi_session_concurrent.feature')
@@ -22,9 +21,9 @@ pytestmark = [pytest.mark.integration, pytest.mark.slow, pytest.mark.bdd]
 
 # Shared test data
 @pytest.fixture
-def state_file():
+def state_file(default_state_file):
     """Path to state file."""
-    return Path("game_state.json")
+    return default_state_file
 
 
 @pytest.fixture
@@ -77,6 +76,8 @@ def app_running():
 def board_generated(test_board):
     """Generate test board."""
     game_logic.board = test_board
+    # Start the saved game from this board, as app startup does
+    game_logic.save_state_to_storage()
 
 
 # Multi-user scenarios
@@ -248,8 +249,8 @@ def then_tiles_marked(count):
 def then_state_file_contains(count, state_file):
     """Verify state file contents."""
     assert state_file.exists()
-    with open(state_file, 'r') as f:
-        state = json.load(f)
+    # Read back through the manager: the snapshot plus its journal
+    state = GameStateManager(state_file).get_full_state()
     assert len(state['clicked_tiles']) == count
 
 
@@ -325,8 +326,8 @@ def then_all_clicks_registered(user_sessions):
 def then_no_clicks_lost(state_file):
     """Verify state was saved properly."""
     assert state_file.exists()
-    with open(state_file, 'r') as f:
-        state = json.load(f)
+    # Read back through the manager: the snapshot plus its journal
+    state = GameStateManager(state_file).get_full_state()
     # Verify state matches memory
     assert len(state['clicked_tiles']) == len(game_logic.clicked_tiles)
 
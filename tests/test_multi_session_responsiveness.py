@@ -3,7 +3,7 @@ Tests for multi-session responsiveness when buttons are clicked from multiple ro
 """
 
 import asyncio
-import json
+import os
 import time
 import unittest
 from concurrent.futures import ThreadPoolExecutor
@@ -15,6 +15,7 @@ import pytest
 
 from src.core import game_logic
 from src.core.state_manager import GameStateManager, get_state_manager
+from src.core.state_store import STATE_PATH_ENV
 
 
 @pytest.mark.integration
@@ -25,7 +26,7 @@ class TestMultiSessionResponsiveness(unittest.TestCase):
     def setUp(self):
         """Set up test environment."""
         # Clean up any existing state file
-        self.state_file = Path("game_state.json")
+        self.state_file = Path(os.environ[STATE_PATH_ENV])
         if self.state_file.exists():
             self.state_file.unlink()
         
@@ -57,6 +58,8 @@ class TestMultiSessionResponsiveness(unittest.TestCase):
                             ["C1", "C2", "FREE SPACE", "C4", "C5"],
                             ["D1", "D2", "D3", "D4", "D5"],
                             ["E1", "E2", "E3", "E4", "E5"]]
+        # Start the saved game from this board, as app startup does
+        game_logic.save_state_to_storage()
         
         # Track clicks from each session
         session_clicks = {
@@ -106,8 +109,8 @@ class TestMultiSessionResponsiveness(unittest.TestCase):
         
         # Verify state was persisted
         self.assertTrue(self.state_file.exists())
-        with open(self.state_file, 'r') as f:
-            saved_state = json.load(f)
+        # Read back through the manager: the snapshot plus its journal
+        saved_state = GameStateManager(self.state_file).get_full_state()
         
         self.assertEqual(len(saved_state['clicked_tiles']), len(expected_clicks))
 
@@ -130,7 +133,7 @@ class TestMultiSessionResponsiveness(unittest.TestCase):
         def read_state_from_session(session_id):
             """Simulate reading state from a session."""
             # Create a new GameStateManager instance (simulating different process/thread)
-            state_manager = GameStateManager()
+            state_manager = GameStateManager(self.state_file)
             
             # Get state (get_full_state is synchronous)
             state = state_manager.get_full_state()
@@ -243,17 +246,11 @@ class TestMultiSessionResponsiveness(unittest.TestCase):
         }
         
         # Create a single tile for position (0,0) that all clients will see
-        home_tile = {
-            "card": MagicMock(),
-            "labels": [{"ref": MagicMock(), "base_classes": "some-class"}]
-        }
+        home_tile = {"card": MagicMock()}
         mock_board_views["home"][1][(0, 0)] = home_tile
         
         # Create a single tile for stream view  
-        stream_tile = {
-            "card": MagicMock(),
-            "labels": [{"ref": MagicMock(), "base_classes": "some-class"}]
-        }
+        stream_tile = {"card": MagicMock()}
         mock_board_views["stream"][1][(0, 0)] = stream_tile
         
         # Setup board
@@ -274,11 +271,11 @@ class TestMultiSessionResponsiveness(unittest.TestCase):
             toggle_tile(0, 0)
             
             # Verify home view tile received updates
-            home_tile["card"].style.assert_called()
+            home_tile["card"].classes.assert_called()
             home_tile["card"].update.assert_called()
             
             # Verify stream view tile received updates
-            stream_tile["card"].style.assert_called()
+            stream_tile["card"].classes.assert_called()
             stream_tile["card"].update.assert_called()
 
     def test_rapid_concurrent_state_changes(self):
@@ -357,7 +354,7 @@ class TestAsyncMultiSessionOperations(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.state_file = Path("game_state.json")
+        self.state_file = Path(os.environ[STATE_PATH_ENV])
         if self.state_file.exists():
             self.state_file.unlink()
         
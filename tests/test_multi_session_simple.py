@@ -2,7 +2,7 @@
 Simple multi-session tests that work with the current implementation.
 """
 
-import json
+import os
 import time
 import unittest
 from concurrent.futures import ThreadPoolExecutor
@@ -13,6 +13,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.core import game_logic
+from src.core.state_manager import GameStateManager
+from src.core.state_store import STATE_PATH_ENV
 
 # Mark all tests in this module as slow integration tests
 pytestmark = [pytest.mark.integration, pytest.mark.slow]
@@ -24,7 +26,7 @@ class TestSimpleMultiSession(unittest.TestCase):
     def setUp(self):
         """Set up test environment."""
         # Clean up any existing state file
-        self.state_file = Path("game_state.json")
+        self.state_file = Path(os.environ[STATE_PATH_ENV])
         if self.state_file.exists():
             self.state_file.unlink()
         
@@ -50,6 +52,8 @@ class TestSimpleMultiSession(unittest.TestCase):
                             ["C1", "C2", "FREE SPACE", "C4", "C5"],
                             ["D1", "D2", "D3", "D4", "D5"],
                             ["E1", "E2", "E3", "E4", "E5"]]
+        # Start the saved game from this board, as app startup does
+        game_logic.save_state_to_storage()
         
         # Session 1 clicks
         game_logic.toggle_tile(0, 0)  # A1
@@ -58,8 +62,8 @@ class TestSimpleMultiSession(unittest.TestCase):
         
         # Verify state saved
         self.assertTrue(self.state_file.exists())
-        with open(self.state_file, 'r') as f:
-            state1 = json.load(f)
+        # Read back through the manager: the snapshot plus its journal
+        state1 = GameStateManager(self.state_file).get_full_state()
         self.assertEqual(len(state1['clicked_tiles']), 2)
         
         # Session 2 loads state and adds more clicks
@@ -71,8 +75,8 @@ class TestSimpleMultiSession(unittest.TestCase):
         time.sleep(0.1)  # Allow save
         
         # Verify combined state
-        with open(self.state_file, 'r') as f:
-            state2 = json.load(f)
+        # Read back through the manager: the snapshot plus its journal
+        state2 = GameStateManager(self.state_file).get_full_state()
         self.assertEqual(len(state2['clicked_tiles']), 4)
         
         # Session 3 loads and verifies all clicks
@@ -161,10 +165,7 @@ class TestSimpleMultiSession(unittest.TestCase):
         for row in range(5):
             for col in range(5):
                 for view in ["home", "stream"]:
-                    tile = {
-                        "card": MagicMock(),
-                        "labels": [{"ref": MagicMock(), "base_classes": ""}]
-                    }
+                    tile = {"card": MagicMock()}
                     mock_board_views[view][1][(row, col)] = tile
         
         # Test with mocked views
@@ -179,7 +180,7 @@ class TestSimpleMultiSession(unittest.TestCase):
                 for i in range(3):
                     for j in range(3):
                         tile = mock_board_views[view][1][(i, j)]
-                        tile["card"].style.assert_called()
+                        tile["card"].classes.assert_called()
                         tile["card"].update.assert_called()
 
     def test_state_persistence_across_restarts(self):
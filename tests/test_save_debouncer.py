@@ -0,0 +1,140 @@
+"""Tests for the bounded-latency save debouncer."""
+
+import asyncio
+
+import pytest
+
+from src.core.save_debouncer import DebounceMetrics, SaveDebouncer
+
+
+class FlushRecorder:
+    """A flush function that counts its calls."""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise OSError("disk full")
+
+
+@pytest.mark.unit
+@pytest.mark.state
+class TestSaveDebouncer:
+    """Test flush timing and metrics of SaveDebouncer."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_one_flush_after_quiet_delay(self):
+        """Test a burst of changes is saved once, after the quiet delay."""
+        flush = FlushRecorder()
+        debouncer = SaveDebouncer(flush, delay=0.05, max_latency=1.0)
+        for _ in range(10):
+            debouncer.mark()
+        assert debouncer.pending == 10
+        assert flush.calls == 0
+
+        await asyncio.sleep(0.15)
+
+        assert flush.calls == 1
+        assert debouncer.pending == 0
+        assert debouncer.pending_age() == 0.0
+        assert debouncer.metrics.last_flush_changes == 10
+        debouncer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_storm_is_flushed_within_max_latency(self):
+        """Test continuous changes are still saved every max_latency seconds."""
+        flush = FlushRecorder()
+        debouncer = SaveDebouncer(flush, delay=0.1, max_latency=0.15)
+        for _ in range(40):
+            debouncer.mark()
+            await asyncio.sleep(0.01)
+
+        assert flush.calls >= 2
+        assert debouncer.metrics.max_flush_latency < 0.15 + 0.05
+        debouncer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_one_long_lived_task(self):
+        """Test marking changes reuses the flush task instead of replacing it."""
+        debouncer = SaveDebouncer(FlushRecorder(), delay=0.05)
+        debouncer.mark()
+        task = debouncer._task
+        for _ in range(100):
+            debouncer.mark()
+        assert debouncer._task is task
+        await asyncio.sleep(0.1)
+        debouncer.mark()
+        assert debouncer._task is task
+        debouncer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried_with_backoff(self):
+        """Test a failing flush keeps its changes pending and retries with backoff."""
+        flush = FlushRecorder(fail=True)
+        debouncer = SaveDebouncer(
+            flush, delay=0.01, retry_delay=0.02, max_retry_delay=0.04
+        )
+        debouncer.mark(3)
+        await asyncio.sleep(0.15)
+        # Flushes at about 0.01s, then retries 0.02s, 0.04s and 0.04s apart
+        assert 2 <= flush.calls <= 5
+        assert debouncer.metrics.failures == flush.calls
+        assert debouncer.metrics.flushes == 0
+        assert debouncer.pending == 3
+
+        flush.fail = False
+        await asyncio.sleep(0.1)
+        assert debouncer.pending == 0
+        assert debouncer.metrics.flushes == 1
+        assert debouncer.metrics.last_flush_changes == 3
+        assert debouncer.stats()["failed_flushes"] == flush.calls - 1
+        debouncer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_now_keeps_changes(self):
+        """Test flush_now raises on failure and leaves the changes pending."""
+        debouncer = SaveDebouncer(FlushRecorder(fail=True), delay=10)
+        debouncer.mark(2)
+        with pytest.raises(OSError):
+            await debouncer.flush_now()
+        assert debouncer.pending == 2
+
+    def test_metrics(self):
+        """Test the derived metrics."""
+        metrics = DebounceMetrics()
+        assert metrics.coalesced_per_flush == 0.0
+        metrics.record_flush(6, 0.5, now=100.0)
+        metrics.record_flush(2, 1.5, now=110.0)
+        assert metrics.coalesced_per_flush == 4.0
+        assert metrics.max_flush_latency == 1.5
+        assert metrics.flushes_per_sec(now=110.0) == 2 / 60
+        assert metrics.flushes_per_sec(now=165.0) == 1 / 60
+
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        """Test stats reports the pending changes and flush metrics."""
+        debouncer = SaveDebouncer(FlushRecorder(), delay=10)
+        debouncer.mark(3)
+        stats = debouncer.stats()
+        assert stats["pending_changes"] == 3
+        assert stats["pending_age"] >= 0
+        assert stats["flushes"] == 0
+        assert set(stats) >= {"flushes_per_sec", "coalesced_per_flush"}
+        debouncer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_flush_now(self):
+        """Test flush_now saves the pending changes without waiting."""
+        flush = FlushRecorder()
+        debouncer = SaveDebouncer(flush, delay=10)
+        debouncer.mark(4)
+        assert await debouncer.flush_now() == 4
+        assert flush.calls == 1
+        assert debouncer.pending == 0
+        assert debouncer.metrics.last_flush_changes == 4
+        # Nothing pending, nothing flushed
+        assert await debouncer.flush_now() == 0
+        assert flush.calls == 1
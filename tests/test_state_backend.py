@@ -0,0 +1,332 @@
+"""Tests for replicating the game state through a pub/sub backend."""
+
+import asyncio
+
+import pytest
+
+from src.core.resp import (
+    RespConnection,
+    RespError,
+    RespServer,
+    encode_command,
+    read_reply,
+)
+from src.core.state_backend import (
+    PUBSUB_URL_ENV,
+    LocalHub,
+    LocalStateBackend,
+    RedisStateBackend,
+    StateReplicator,
+    create_state_backend,
+)
+from src.core.state_events import (
+    BOARD_REPLACED,
+    STATE_RELOADED,
+    TILE_TOGGLED,
+    StateEvent,
+)
+from src.core.state_manager import GameStateManager
+
+BOARD = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+
+
+async def wait_for(condition, timeout=2.0):
+    """Wait until condition() is true."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def resp_server():
+    server = RespServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.state
+class TestResp:
+    """Test the Redis protocol client and stand-in server."""
+
+    @pytest.mark.asyncio
+    async def test_reply_round_trip(self):
+        """Test every reply type decodes as documented."""
+        reader = asyncio.StreamReader()
+        reader.feed_data(
+            b"+OK\r\n-ERR bad\r\n:42\r\n$3\r\nabc\r\n$-1\r\n*2\r\n:1\r\n$1\r\nx\r\n"
+        )
+        reader.feed_eof()
+
+        assert await read_reply(reader) == "OK"
+        error = await read_reply(reader)
+        assert isinstance(error, RespError) and str(error) == "ERR bad"
+        assert await read_reply(reader) == 42
+        assert await read_reply(reader) == b"abc"
+        assert await read_reply(reader) is None
+        assert await read_reply(reader) == [1, b"x"]
+        with pytest.raises(ConnectionError):
+            await read_reply(reader)
+
+    def test_encode_command(self):
+        """Test commands are arrays of bulk strings."""
+        assert (
+            encode_command("SET", "k", 1)
+            == b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\n1\r\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_commands_and_pubsub(self, resp_server):
+        """Test strings and pub/sub against the stand-in server."""
+        conn = await RespConnection.open(resp_server.url)
+        subscriber = await RespConnection.open(resp_server.url)
+        try:
+            assert await conn.execute("PING") == "PONG"
+            assert await conn.execute("GET", "key") is None
+            assert await conn.execute("SET", "key", "value") == "OK"
+            assert await conn.execute("GET", "key") == b"value"
+            with pytest.raises(RespError):
+                await conn.execute("HSET", "h", "f", "v")
+
+            await subscriber.send("SUBSCRIBE", "news")
+            assert await subscriber.read() == [b"subscribe", b"news", 1]
+            assert await conn.execute("PUBLISH", "news", "hello") == 1
+            assert await subscriber.read() == [b"message", b"news", b"hello"]
+        finally:
+            await conn.close()
+            await subscriber.close()
+
+    @pytest.mark.asyncio
+    async def test_transactions(self, resp_server):
+        """Test EXEC runs the queued commands unless a watched key was written."""
+        conn = await RespConnection.open(resp_server.url)
+        other = await RespConnection.open(resp_server.url)
+        try:
+            assert await conn.execute("WATCH", "key") == "OK"
+            assert await conn.execute("MULTI") == "OK"
+            assert await conn.execute("SET", "key", "mine") == "QUEUED"
+            assert await conn.execute("EXEC") == ["OK"]
+            assert await other.execute("GET", "key") == b"mine"
+
+            await conn.execute("WATCH", "key")
+            await other.execute("SET", "key", "theirs")
+            await conn.execute("MULTI")
+            await conn.execute("SET", "key", "mine again")
+            assert await conn.execute("EXEC") is None
+            assert await other.execute("GET", "key") == b"theirs"
+        finally:
+            await conn.close()
+            await other.close()
+
+
+class DroppingBackend(LocalStateBackend):
+    """An in-process backend whose subscriptions can be cut off."""
+
+    def __init__(self, hub):
+        super().__init__(hub)
+        self.connected = True
+
+    async def messages(self):
+        if not self.connected:
+            raise ConnectionError("unreachable")
+        async for message in super().messages():
+            if not self.connected:
+                raise ConnectionError("dropped")
+            yield message
+
+
+@pytest.mark.unit
+@pytest.mark.state
+class TestStateBackends:
+    """Test the backends' subscriptions and shared state."""
+
+    @pytest.mark.asyncio
+    async def test_subscription_is_in_place_when_returned(self, resp_server):
+        """Test a change published right after subscribe() returns is received."""
+        backend = RedisStateBackend(resp_server.url)
+        publisher = RedisStateBackend(resp_server.url)
+        subscription = await backend.subscribe()
+        try:
+            await publisher.publish({"kind": "x"})
+            assert await asyncio.wait_for(subscription.__anext__(), 2) == {"kind": "x"}
+        finally:
+            await subscription.aclose()
+            await publisher.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["memory", "redis"])
+    async def test_concurrent_updates_all_land(self, resp_server, kind):
+        """Test updates racing from several backends are applied one after another."""
+        hub = LocalHub()
+        backends = [
+            (
+                LocalStateBackend(hub)
+                if kind == "memory"
+                else RedisStateBackend(resp_server.url)
+            )
+            for _ in range(4)
+        ]
+
+        async def add(backend, n):
+            for i in range(5):
+                await backend.update_state(
+                    lambda current: {
+                        "seen": (current or {"seen": []})["seen"] + [f"{n}.{i}"]
+                    }
+                )
+
+        try:
+            await asyncio.gather(
+                *(add(backend, n) for n, backend in enumerate(backends))
+            )
+            state = await backends[0].fetch_state()
+            assert len(state["seen"]) == 20
+        finally:
+            for backend in backends:
+                await backend.close()
+
+
+@pytest.mark.unit
+@pytest.mark.state
+class TestStateReplicator:
+    """Test replicas sharing changes through a backend."""
+
+    @pytest.fixture(params=["memory", "redis"])
+    async def backends(self, request, resp_server):
+        """A factory for backends connected to the same hub or server."""
+        hub = LocalHub()
+        created = []
+
+        def make():
+            if request.param == "memory":
+                backend = LocalStateBackend(hub)
+            else:
+                backend = RedisStateBackend(resp_server.url)
+            created.append(backend)
+            return backend
+
+        yield make
+        for backend in created:
+            await backend.close()
+
+    async def replica(self, tmp_path, name, backend):
+        manager = GameStateManager(tmp_path / f"{name}.json")
+        replicator = StateReplicator(manager, backend, replica_id=name)
+        await replicator.start()
+        return manager, replicator
+
+    @pytest.mark.asyncio
+    async def test_changes_reach_other_replicas(self, tmp_path, backends):
+        """Test a change committed on one replica is applied on the others."""
+        first, first_replicator = await self.replica(tmp_path, "first", backends())
+        second, second_replicator = await self.replica(tmp_path, "second", backends())
+        events = []
+        second.subscribe(events.append)
+        try:
+            first.apply(StateEvent(BOARD_REPLACED, {"board": BOARD, "iteration": 2}))
+            await first.toggle_tile(0, 0)
+            await wait_for(lambda: (0, 0) in second.clicked_tiles)
+
+            assert second.board == first.board
+            assert second.board_iteration == 2
+            assert {event.kind for event in events} == {STATE_RELOADED}
+            # Applied changes are not sent back
+            await asyncio.sleep(0.05)
+            assert first_replicator.received == 0
+            assert second_replicator.published == 0
+        finally:
+            await first_replicator.stop()
+            await second_replicator.stop()
+
+    @pytest.mark.asyncio
+    async def test_clicks_on_both_replicas_merge(self, tmp_path, backends):
+        """Test concurrent clicks on different replicas all land on both."""
+        first, first_replicator = await self.replica(tmp_path, "first", backends())
+        second, second_replicator = await self.replica(tmp_path, "second", backends())
+        try:
+            for col in range(5):
+                first.apply(
+                    StateEvent(TILE_TOGGLED, {"row": 0, "col": col, "clicked": True})
+                )
+                second.apply(
+                    StateEvent(TILE_TOGGLED, {"row": 1, "col": col, "clicked": True})
+                )
+            await wait_for(
+                lambda: len(first.clicked_tiles) == len(second.clicked_tiles) == 10
+            )
+            assert first.clicked_tiles == second.clicked_tiles
+            # Neither replica's store overwrote the other's clicks
+            await wait_for(
+                lambda: first_replicator.published == second_replicator.published == 5
+            )
+            shared = await backends().fetch_state()
+            assert {
+                tuple(pos) for pos in shared["clicked_tiles"]
+            } == first.clicked_tiles
+        finally:
+            await first_replicator.stop()
+            await second_replicator.stop()
+
+    @pytest.mark.asyncio
+    async def test_new_replica_adopts_shared_state(self, tmp_path, backends):
+        """Test a replica starting later takes over the authoritative state."""
+        first, first_replicator = await self.replica(tmp_path, "first", backends())
+        try:
+            first.apply(StateEvent(BOARD_REPLACED, {"board": BOARD, "iteration": 3}))
+            first.apply(StateEvent(TILE_TOGGLED, {"row": 4, "col": 4, "clicked": True}))
+            await wait_for(lambda: first_replicator.published == 2)
+
+            late, late_replicator = await self.replica(tmp_path, "late", backends())
+            assert late.board_iteration == 3
+            assert late.clicked_tiles == {(4, 4)}
+            await late_replicator.stop()
+        finally:
+            await first_replicator.stop()
+
+    @pytest.mark.asyncio
+    async def test_resubscribing_catches_up(self, tmp_path, monkeypatch):
+        """Test changes published while a replica was cut off reach it once it is back."""
+        monkeypatch.setattr("src.core.state_backend.RECONNECT_DELAY", 0.01)
+        hub = LocalHub()
+        flaky = DroppingBackend(hub)
+        first, first_replicator = await self.replica(
+            tmp_path, "first", LocalStateBackend(hub)
+        )
+        second, second_replicator = await self.replica(tmp_path, "second", flaky)
+        try:
+            first.apply(StateEvent(BOARD_REPLACED, {"board": BOARD, "iteration": 2}))
+            await wait_for(lambda: second.board_iteration == 2)
+
+            flaky.connected = False
+            # The first change is what shows the subscription was lost
+            first.apply(StateEvent(TILE_TOGGLED, {"row": 0, "col": 0, "clicked": True}))
+            first.apply(StateEvent(TILE_TOGGLED, {"row": 1, "col": 1, "clicked": True}))
+            await wait_for(lambda: first_replicator.published == 3)
+            await asyncio.sleep(0.05)
+            assert (1, 1) not in second.clicked_tiles
+
+            flaky.connected = True
+            await wait_for(lambda: second_replicator.resubscribes == 1)
+            assert {(0, 0), (1, 1)} <= second.clicked_tiles
+        finally:
+            await first_replicator.stop()
+            await second_replicator.stop()
+
+
+@pytest.mark.unit
+class TestCreateStateBackend:
+    """Test choosing the backend from BINGO_PUBSUB_URL."""
+
+    def test_unset_means_no_replication(self, monkeypatch):
+        monkeypatch.delenv(PUBSUB_URL_ENV, raising=False)
+        assert create_state_backend() is None
+
+    def test_schemes(self, monkeypatch):
+        monkeypatch.setenv(PUBSUB_URL_ENV, "memory://")
+        assert isinstance(create_state_backend(), LocalStateBackend)
+        backend = create_state_backend("redis://cache:6380/1")
+        assert isinstance(backend, RedisStateBackend)
+        assert backend.url == "redis://cache:6380/1"
+        assert create_state_backend("kafka://broker") is None
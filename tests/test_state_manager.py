@@ -2,14 +2,39 @@
 
 import asyncio
 import json
+import multiprocessing
+import sqlite3
 import tempfile
+import threading
 import time
 from pathlib import Path
 
 import pytest
 
+from scripts.fault_inject_state import run_fault_injection
 from src.config.constants import FREE_SPACE_TEXT
+from src.core.state_events import (
+    BOARD_REPLACED,
+    BOARD_RESET,
+    GAME_CLOSED,
+    GAME_REOPENED,
+    HEADER_CHANGED,
+    STATE_RELOADED,
+    TILE_TOGGLED,
+    StateEvent,
+    StateEventBus,
+)
 from src.core.state_manager import GameState, GameStateManager, get_state_manager
+from src.core.state_store import (
+    CORRUPT_SUFFIX,
+    STATE_BACKEND_ENV,
+    BinaryFileStore,
+    JsonFileStore,
+    SqliteStateStore,
+    StateStore,
+    create_state_store,
+)
+from src.core.state_writer import FSYNC_COMMIT, FSYNC_INTERVAL, StateWriter
 
 
 @pytest.mark.unit
@@ -69,7 +94,7 @@ class TestGameStateManager:
         manager = GameStateManager(temp_state_file)
         
         # Verify state was loaded
-        assert manager.board == state_data['board']
+        assert manager.board == tuple(map(tuple, state_data['board']))
         assert manager.clicked_tiles == {(0, 0), (1, 1)}
         assert manager.is_game_closed is True
         assert manager.board_iteration == 5
@@ -147,7 +172,7 @@ class TestGameStateManager:
         
         await manager.update_board(test_board, 2, '20250101.2')
         
-        assert manager.board == test_board
+        assert manager.board == tuple(map(tuple, test_board))
         assert manager.board_iteration == 2
         assert manager.today_seed == '20250101.2'
         
@@ -248,6 +273,40 @@ class TestGameStateManager:
         
         assert len(data['clicked_tiles']) == 5
     
+    @pytest.mark.asyncio
+    async def test_version_bumped_by_every_mutation(self, manager):
+        """Test each mutating method advances the state version."""
+        board = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+        versions = [manager.version]
+        
+        await manager.toggle_tile(0, 0)
+        versions.append(manager.version)
+        await manager.update_board(board, 2)
+        versions.append(manager.version)
+        await manager.reset_board()
+        versions.append(manager.version)
+        await manager.close_game()
+        versions.append(manager.version)
+        await manager.reopen_game()
+        versions.append(manager.version)
+        await manager.update_header_text("Winner!")
+        versions.append(manager.version)
+        await manager.add_bingo_pattern("row0")
+        versions.append(manager.version)
+        
+        assert versions == sorted(set(versions))
+    
+    @pytest.mark.asyncio
+    async def test_version_survives_restart(self, temp_state_file):
+        """Test the version is persisted so it never goes backwards."""
+        manager1 = GameStateManager(temp_state_file)
+        await manager1.toggle_tile(1, 1)
+        await manager1.toggle_tile(2, 2)
+        await manager1.save_state(immediate=True)
+        
+        manager2 = GameStateManager(temp_state_file)
+        assert manager2.version == manager1.version == 2
+    
     def test_get_full_state(self, manager):
         """Test getting complete state as dictionary."""
         state = manager.get_full_state()
@@ -359,7 +418,7 @@ class TestGameStateManager:
         manager = GameStateManager(temp_state_file)
         
         # Should use defaults for missing fields
-        assert manager.board == partial_state['board']
+        assert manager.board == tuple(map(tuple, partial_state['board']))
         assert (0, 0) in manager.clicked_tiles
         assert manager.is_game_closed is True
         assert manager.board_iteration == 1  # Default
@@ -384,7 +443,7 @@ class TestGameStateManager:
         
         # Python will convert these to tuples, which is valid behavior
         # The important thing is that it doesn't crash
-        assert isinstance(manager.clicked_tiles, set)
+        assert isinstance(manager.clicked_tiles, frozenset)
         # The tuples will be created from the invalid data
         assert len(manager.clicked_tiles) > 0
     
@@ -413,7 +472,7 @@ class TestGameStateManager:
         await manager.update_board(small_board, 1)
         
         # Should handle gracefully
-        assert manager.board == small_board
+        assert manager.board == tuple(map(tuple, small_board))
         assert len(manager.clicked_tiles) == 0  # No free space position
     
     @pytest.mark.asyncio
@@ -428,8 +487,9 @@ class TestGameStateManager:
     
     @pytest.mark.asyncio
     async def test_property_thread_safety(self, manager):
-        """Test that property accessors return copies, not references."""
+        """Test that property accessors return immutable values, shared per version."""
         # Set up some state
+        await manager.update_board([['A1', 'A2'], ['B1', 'B2']], 1)
         await manager.toggle_tile(1, 1)
         await manager.add_bingo_pattern("Test")
         
@@ -438,17 +498,42 @@ class TestGameStateManager:
         patterns = manager.bingo_patterns
         board = manager.board
         
-        # Modify returned objects
-        clicked.add((9, 9))
-        patterns.add("Modified")
-        if board:
+        # Returned objects cannot be modified, not even the board rows
+        with pytest.raises(AttributeError):
+            clicked.add((9, 9))
+        with pytest.raises(AttributeError):
+            patterns.add("Modified")
+        with pytest.raises(TypeError):
             board[0] = ["Modified"]
+        with pytest.raises(TypeError):
+            board[0][0] = "Modified"
         
-        # Original state should be unchanged
-        assert (9, 9) not in manager.clicked_tiles
-        assert "Modified" not in manager.bingo_patterns
-        if manager.board:
-            assert "Modified" not in manager.board[0]
+        # Readers of the same version share one snapshot
+        assert manager.snapshot is manager.snapshot
+        assert manager.clicked_tiles is clicked
+        assert manager.board is board
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_follows_changes(self, manager):
+        """Test that a change replaces the snapshot and leaves the old one intact."""
+        await manager.update_board([['A1', 'A2'], ['B1', 'B2']], 1)
+        before = manager.snapshot
+        
+        await manager.toggle_tile(0, 1)
+        after = manager.snapshot
+        
+        assert after is not before
+        assert after.version == before.version + 1
+        assert (0, 1) in after.clicked_tiles
+        assert (0, 1) not in before.clicked_tiles
+        with pytest.raises(AttributeError):
+            after.version = 0
+        
+        # Replacing the whole state, like mirroring the globals, too
+        await manager.replace_state([['C1']], 2, None, {(0, 0)}, {"Row 1"}, False, "BINGO!")
+        assert manager.snapshot.version == after.version + 1
+        assert manager.snapshot.board == (('C1',),)
+        assert manager.bingo_patterns == {"Row 1"}
     
     @pytest.mark.asyncio
     async def test_file_permission_recovery(self, manager, tmp_path):
@@ -547,4 +632,877 @@ class TestGameStateManager:
         manager = GameStateManager(temp_state_file)
         assert len(manager.board) == 0
         assert len(manager.clicked_tiles) == 0
-        assert manager.is_game_closed is False
\ No newline at end of file
+        assert manager.is_game_closed is False
+
+@pytest.mark.unit
+@pytest.mark.state
+class TestStateEvents:
+    """Test state change events published by the GameStateManager."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a state manager backed by a temporary file."""
+        return GameStateManager(tmp_path / "state.json")
+    
+    @pytest.fixture
+    def events(self, manager):
+        """Collect every event the manager publishes."""
+        received = []
+        manager.subscribe(received.append)
+        return received
+    
+    @pytest.mark.asyncio
+    async def test_toggle_publishes_tile_event(self, manager, events):
+        """Test toggling a tile publishes its position and new state."""
+        await manager.toggle_tile(1, 3)
+        await manager.toggle_tile(1, 3)
+        
+        assert [e.kind for e in events] == [TILE_TOGGLED, TILE_TOGGLED]
+        assert events[0].data == {'row': 1, 'col': 3, 'clicked': True}
+        assert events[1].data['clicked'] is False
+    
+    @pytest.mark.asyncio
+    async def test_mutations_publish_matching_events(self, manager, events):
+        """Test each mutating method publishes its own event kind."""
+        board = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+        
+        await manager.update_board(board, 2, '20250101.2')
+        await manager.reset_board()
+        await manager.close_game()
+        await manager.reopen_game()
+        await manager.update_header_text("Winner!")
+        
+        assert [e.kind for e in events] == [
+            BOARD_REPLACED, BOARD_RESET, GAME_CLOSED, GAME_REOPENED, HEADER_CHANGED
+        ]
+        assert events[0].data == {'iteration': 2, 'seed': '20250101.2'}
+        assert events[-1].data == {'text': "Winner!"}
+    
+    @pytest.mark.asyncio
+    async def test_unsubscribe_stops_delivery(self, manager):
+        """Test a cancelled subscription receives no further events."""
+        received = []
+        unsubscribe = manager.subscribe(received.append)
+        
+        await manager.toggle_tile(0, 0)
+        unsubscribe()
+        await manager.toggle_tile(0, 1)
+        
+        assert len(received) == 1
+        assert len(manager.events) == 0
+    
+    def test_failing_listener_does_not_block_others(self):
+        """Test one broken subscriber cannot starve the rest."""
+        bus = StateEventBus()
+        received = []
+        
+        def broken(event):
+            raise RuntimeError("client went away")
+        
+        bus.subscribe(broken)
+        bus.subscribe(received.append)
+        bus.publish(StateEvent(GAME_CLOSED))
+        
+        assert [e.kind for e in received] == [GAME_CLOSED]
+
+
+@pytest.mark.unit
+@pytest.mark.state
+@pytest.mark.persistence
+class TestStateJournal:
+    """Test the append-only journal and snapshot compaction."""
+    
+    @pytest.fixture
+    def state_file(self, tmp_path):
+        return tmp_path / "state.json"
+    
+    @pytest.fixture
+    def board(self):
+        board = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+        board[2][2] = FREE_SPACE_TEXT
+        return board
+    
+    @pytest.mark.asyncio
+    async def test_changes_are_appended_after_first_snapshot(self, state_file, board):
+        """Test only the first save writes a snapshot; later saves append."""
+        manager = GameStateManager(state_file)
+        await manager.update_board(board, 1, 'seed')
+        await manager.save_state(immediate=True)
+        snapshot = state_file.read_text()
+        
+        await manager.toggle_tile(0, 0)
+        await manager.toggle_tile(1, 1)
+        await manager.save_state(immediate=True)
+        
+        assert state_file.read_text() == snapshot
+        lines = manager.store.journal.path.read_text().splitlines()
+        assert len(lines) == 3  # Header and two toggles
+        assert json.loads(lines[-1])['data'] == {'row': 1, 'col': 1, 'clicked': True}
+    
+    @pytest.mark.asyncio
+    async def test_restart_replays_journal(self, state_file, board):
+        """Test a new manager loads the snapshot and replays the journal tail."""
+        manager1 = GameStateManager(state_file)
+        await manager1.update_board(board, 1, 'seed')
+        await manager1.save_state(immediate=True)
+        await manager1.toggle_tile(0, 0)
+        await manager1.add_bingo_pattern("row0")
+        await manager1.update_header_text("Winner!")
+        await manager1.close_game()
+        await manager1.save_state(immediate=True)
+        
+        manager2 = GameStateManager(state_file)
+        
+        assert manager2.get_full_state() | {'timestamp': 0} == (
+            manager1.get_full_state() | {'timestamp': 0}
+        )
+        assert manager2.version == manager1.version
+    
+    @pytest.mark.asyncio
+    async def test_compaction_bounds_journal(self, state_file, board):
+        """Test the journal is folded into a snapshot at the entry threshold."""
+        manager = GameStateManager(state_file, compact_entries=5)
+        await manager.update_board(board, 1, 'seed')
+        await manager.save_state(immediate=True)
+        
+        for i in range(12):
+            await manager.toggle_tile(0, i % 5)
+            await manager.save_state(immediate=True)
+            assert manager.store.journal.entry_count < 5
+        
+        assert GameStateManager(state_file).clicked_tiles == manager.clicked_tiles
+    
+    @pytest.mark.asyncio
+    async def test_torn_journal_entry_is_skipped(self, state_file, board):
+        """Test a partially written last entry does not break startup."""
+        manager = GameStateManager(state_file)
+        await manager.update_board(board, 1, 'seed')
+        await manager.save_state(immediate=True)
+        await manager.toggle_tile(3, 3)
+        await manager.save_state(immediate=True)
+        with open(manager.store.journal.path, 'a') as f:
+            f.write('{"version": 99, "kind": "tile_tog')
+        
+        restored = GameStateManager(state_file)
+        
+        assert (3, 3) in restored.clicked_tiles
+        assert restored.version == manager.version
+        
+        # The torn entry was cut off, so the next one is not glued to it
+        await restored.toggle_tile(4, 4)
+        await restored.save_state(immediate=True)
+        assert (4, 4) in GameStateManager(state_file).clicked_tiles
+    
+    @pytest.mark.asyncio
+    async def test_journal_of_replaced_snapshot_is_ignored(self, state_file, board):
+        """Test entries are not replayed onto a snapshot they do not continue."""
+        manager = GameStateManager(state_file)
+        await manager.update_board(board, 1, 'seed')
+        await manager.save_state(immediate=True)
+        await manager.toggle_tile(0, 0)
+        await manager.save_state(immediate=True)
+        
+        # A snapshot written by hand, without a journal
+        state_file.write_text(json.dumps({'board': board, 'clicked_tiles': [[4, 4]]}))
+        
+        restored = GameStateManager(state_file)
+        
+        assert restored.clicked_tiles == {(4, 4)}
+
+
+@pytest.mark.unit
+@pytest.mark.state
+@pytest.mark.persistence
+class TestSqliteStateStore:
+    """Test the SQLite backend and backend selection."""
+    
+    @pytest.fixture
+    def db_file(self, tmp_path):
+        return tmp_path / "state.db"
+    
+    @pytest.fixture
+    def board(self):
+        board = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+        board[2][2] = FREE_SPACE_TEXT
+        return board
+    
+    @pytest.mark.asyncio
+    async def test_state_survives_restart(self, db_file, board):
+        """Test a new manager on the same database sees the saved state."""
+        manager1 = GameStateManager(store=SqliteStateStore(db_file))
+        await manager1.update_board(board, 3, 'seed')
+        await manager1.toggle_tile(0, 0)
+        await manager1.close_game()
+        await manager1.save_state(immediate=True)
+        manager1.store.close()
+        
+        manager2 = GameStateManager(store=SqliteStateStore(db_file))
+        
+        assert manager2.board == tuple(map(tuple, board))
+        assert manager2.board_iteration == 3
+        assert manager2.clicked_tiles == {(0, 0), (2, 2)}
+        assert manager2.is_game_closed
+        assert manager2.version == manager1.version
+        assert manager2.store.exists()
+    
+    def test_uses_wal_and_one_row_per_game(self, db_file, board):
+        """Test the database is in WAL mode and games do not share a row."""
+        store_a = SqliteStateStore(db_file, game_id="a")
+        store_b = SqliteStateStore(db_file, game_id="b")
+        for version in range(3):
+            store_a.save(lambda: {'board': board, 'version': version}, [])
+        store_b.save(lambda: {'board': [], 'version': 7}, [])
+        
+        conn = sqlite3.connect(str(db_file))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        rows = conn.execute("SELECT game_id, version FROM games ORDER BY game_id").fetchall()
+        conn.close()
+        assert rows == [("a", 2), ("b", 7)]
+        assert store_a.load() == ({'board': board, 'version': 2}, [])
+        store_a.close()
+        store_b.close()
+    
+    def test_missing_database(self, db_file):
+        """Test a store without a saved game starts fresh."""
+        store = SqliteStateStore(db_file)
+        assert not store.exists()
+        assert store.load() is None
+        assert GameStateManager(store=store).version == 0
+        store.close()
+    
+    def test_backend_selected_by_env(self, monkeypatch, tmp_path):
+        """Test BINGO_STATE_BACKEND picks the store."""
+        monkeypatch.setenv(STATE_BACKEND_ENV, "sqlite")
+        store = create_state_store(tmp_path / "x.db")
+        assert isinstance(store, SqliteStateStore)
+        store.close()
+        
+        monkeypatch.setenv(STATE_BACKEND_ENV, "binary")
+        assert isinstance(create_state_store(tmp_path / "x.bin"), BinaryFileStore)
+        
+        monkeypatch.delenv(STATE_BACKEND_ENV)
+        assert isinstance(create_state_store(tmp_path / "x.json"), JsonFileStore)
+        
+        monkeypatch.setenv(STATE_BACKEND_ENV, "bogus")
+        assert isinstance(create_state_store(tmp_path / "x.json"), JsonFileStore)
+
+
+class RecordingStore(StateStore):
+    """A store that records saves and syncs; the first save can be held."""
+    
+    def __init__(self, hold_first: bool = False, fail: bool = False):
+        self.path = Path("recording")
+        self.saves = []
+        self.syncs = 0
+        self.fail = fail
+        self.release = threading.Event()
+        self.holding = threading.Event()
+        if not hold_first:
+            self.release.set()
+    
+    def exists(self):
+        return bool(self.saves)
+    
+    def load(self):
+        return None
+    
+    def save(self, state, changes, full=False):
+        self.holding.set()
+        self.release.wait(5)
+        if self.fail:
+            raise OSError("disk full")
+        self.saves.append((state(), list(changes), full))
+    
+    def sync(self):
+        self.syncs += 1
+
+
+@pytest.mark.unit
+@pytest.mark.state
+@pytest.mark.persistence
+class TestStateWriter:
+    """Test the background writer's group commit and fsync policies."""
+    
+    def test_queued_saves_are_group_committed(self):
+        """Test saves queued behind a write become one write, in order."""
+        store = RecordingStore(hold_first=True)
+        writer = StateWriter()
+        first = writer.submit(store, {'version': 1}, [{'version': 1}])
+        assert store.holding.wait(5)
+        futures = [
+            writer.submit(store, {'version': v}, [{'version': v}]) for v in (2, 3, 4)
+        ]
+        store.release.set()
+        
+        assert all(f.result(5) for f in [first] + futures)
+        assert writer.stop(5)
+        assert store.saves == [
+            ({'version': 1}, [{'version': 1}], False),
+            ({'version': 4}, [{'version': 2}, {'version': 3}, {'version': 4}], False),
+        ]
+        assert (writer.writes, writer.saves) == (2, 4)
+    
+    def test_fsync_per_commit(self):
+        """Test the commit policy fsyncs every write."""
+        store = RecordingStore()
+        writer = StateWriter(FSYNC_COMMIT)
+        for v in range(3):
+            writer.submit(store, {'version': v}, []).result(5)
+        writer.stop(5)
+        assert store.syncs == 3
+    
+    def test_fsync_interval_completes_after_sync(self):
+        """Test the interval policy fsyncs once per interval and then completes saves."""
+        store = RecordingStore()
+        writer = StateWriter(FSYNC_INTERVAL, fsync_interval=0.05)
+        futures = [writer.submit(store, {'version': v}, []) for v in range(3)]
+        
+        assert all(f.result(5) for f in futures)
+        assert 1 <= store.syncs <= 3
+        writer.stop(5)
+    
+    def test_unknown_policy(self):
+        """Test an unknown fsync policy is rejected."""
+        with pytest.raises(ValueError):
+            StateWriter("sometimes")
+    
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried_in_full(self):
+        """Test a failed save fails its future and the next save writes everything."""
+        store = RecordingStore(fail=True)
+        manager = GameStateManager(store=store, writer=StateWriter())
+        await manager.update_header_text("Hello")
+        
+        assert await manager.save_state(immediate=True) is False
+        
+        store.fail = False
+        assert await manager.save_state(immediate=True) is True
+        state, changes, full = store.saves[-1]
+        assert full
+        assert state['header_text'] == "Hello"
+        assert [c['kind'] for c in changes] == [HEADER_CHANGED]
+        manager.writer.stop(5)
+    
+    @pytest.mark.asyncio
+    async def test_failed_debounced_save_is_retried(self):
+        """Test a failed debounced save is retried without waiting for another change."""
+        store = RecordingStore(fail=True)
+        manager = GameStateManager(store=store, writer=StateWriter(), save_delay=0.01)
+        manager.saves.retry_delay = 0.02
+        manager.apply(StateEvent(HEADER_CHANGED, {'text': "Hello"}))
+        
+        for _ in range(100):
+            if manager.saves.metrics.failures >= 2:
+                break
+            await asyncio.sleep(0.01)
+        assert manager.saves.metrics.failures >= 2
+        assert manager.saves.pending == 1
+        assert manager.has_unsaved_changes
+        
+        store.fail = False
+        for _ in range(100):
+            if store.saves:
+                break
+            await asyncio.sleep(0.01)
+        state, changes, full = store.saves[-1]
+        assert full
+        assert state['header_text'] == "Hello"
+        assert manager.saves.pending == 0
+        assert not manager.has_unsaved_changes
+        manager.saves.cancel()
+        manager.writer.stop(5)
+
+
+@pytest.mark.unit
+@pytest.mark.state
+class TestApply:
+    """Test applying single changes with GameStateManager.apply."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        board = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+        board[2][2] = FREE_SPACE_TEXT
+        manager = GameStateManager(tmp_path / "state.json")
+        manager.apply(StateEvent(BOARD_REPLACED, {'board': board, 'iteration': 1, 'seed': 's'}))
+        return manager
+    
+    def test_toggle_delta_with_patterns(self, manager):
+        """Test a toggle carries the win patterns it completed or broke."""
+        event = manager.apply(
+            StateEvent(TILE_TOGGLED, {'row': 0, 'col': 0, 'clicked': True, 'won': ['row0']})
+        )
+        assert event.version == manager.version == 2
+        assert (0, 0) in manager.clicked_tiles
+        assert manager.bingo_patterns == {'row0'}
+        
+        manager.apply(
+            StateEvent(TILE_TOGGLED, {'row': 0, 'col': 0, 'clicked': False, 'lost': ['row0']})
+        )
+        assert (0, 0) not in manager.clicked_tiles
+        assert manager.bingo_patterns == set()
+    
+    def test_close_and_reopen_set_header(self, manager):
+        """Test close and reopen deltas may carry the header text."""
+        manager.apply(StateEvent(GAME_CLOSED, {'header_text': 'Closed'}))
+        assert manager.is_game_closed
+        assert manager.header_text == 'Closed'
+        manager.apply(StateEvent(GAME_REOPENED, {'header_text': 'Open'}))
+        assert not manager.is_game_closed
+        assert manager.header_text == 'Open'
+    
+    def test_outside_event_loop_saves_before_returning(self, manager, tmp_path):
+        """Test apply without an event loop has saved the change when it returns."""
+        manager.apply(StateEvent(TILE_TOGGLED, {'row': 1, 'col': 1, 'clicked': True}))
+        
+        restored = GameStateManager(tmp_path / "state.json")
+        assert restored.clicked_tiles == {(1, 1), (2, 2)}
+        assert restored.version == manager.version
+    
+    @pytest.mark.asyncio
+    async def test_in_event_loop_uses_debounced_save(self, manager):
+        """Test clicks in the event loop are journaled by one debounced save."""
+        for col in range(5):
+            manager.apply(StateEvent(TILE_TOGGLED, {'row': 3, 'col': col, 'clicked': True}))
+        
+        assert len(manager._unjournaled) == 5
+        assert manager.saves.pending == 5
+        await asyncio.sleep(manager.saves.delay + 0.2)
+        assert manager._unjournaled == []
+        assert manager.saves.metrics.last_flush_changes == 5
+        assert manager.store.journal.entry_count == 5
+
+
+@pytest.mark.unit
+@pytest.mark.state
+class TestCopyOnWrite:
+    """Test lock-free reads and compare-and-swap commits."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return GameStateManager(tmp_path / "state.json")
+    
+    def test_conflicting_commit_is_recomputed(self, manager):
+        """Test a change is worked out again when another writer swaps first."""
+        calls = []
+        
+        def toggle(state):
+            calls.append(state.version)
+            if len(calls) == 1:
+                # Another writer commits while this change is being worked out
+                manager.apply(StateEvent(HEADER_CHANGED, {'text': 'Other'}))
+            clicked = (0, 0) not in state.clicked_tiles
+            return TILE_TOGGLED, {'row': 0, 'col': 0, 'clicked': clicked}
+        
+        new, _, _ = manager._commit(toggle)
+        
+        assert calls == [0, 1]
+        assert manager.conflicts == 1
+        assert new is manager.snapshot
+        assert new.version == 2
+        assert new.header_text == 'Other'
+        assert (0, 0) in new.clicked_tiles
+    
+    def test_concurrent_writers_lose_no_changes(self, manager, tmp_path):
+        """Test changes from many threads all land, journaled in version order."""
+        def click_row(row):
+            for col in range(5):
+                manager.apply(StateEvent(TILE_TOGGLED, {'row': row, 'col': col, 'clicked': True}))
+        
+        threads = [threading.Thread(target=click_row, args=(row,)) for row in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert manager.version == 25
+        assert len(manager.clicked_tiles) == 25
+        state, changes = manager.store.load()
+        versions = [entry['version'] for entry in changes]
+        assert versions == list(range(state['version'] + 1, 26))
+        assert GameStateManager(tmp_path / "state.json").clicked_tiles == manager.clicked_tiles
+    
+    def test_readers_never_see_torn_state(self, manager):
+        """Test a snapshot's fields always belong to the same change."""
+        stop = threading.Event()
+        torn = []
+        
+        def read():
+            while not stop.is_set():
+                state = manager.snapshot
+                if state.board and state.board[0][0] != str(state.board_iteration):
+                    torn.append(state)
+        
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            for iteration in range(1, 200):
+                board = [[str(iteration)] * 5 for _ in range(5)]
+                manager._commit(lambda state, board=board, iteration=iteration: (
+                    BOARD_REPLACED, {'board': board, 'iteration': iteration}
+                ))
+        finally:
+            stop.set()
+            reader.join()
+        
+        assert torn == []
+        assert manager.board_iteration == 199
+
+
+def _click_row_in_process(path: str, row: int) -> None:
+    """Click one board row from a separate process sharing the state files."""
+    manager = GameStateManager(Path(path), writer=StateWriter())
+    for col in range(5):
+        manager.apply(StateEvent(TILE_TOGGLED, {'row': row, 'col': col, 'clicked': True}))
+    manager.writer.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.state
+@pytest.mark.persistence
+class TestSharedStateFiles:
+    """Test processes sharing one state file, each with its own manager."""
+    
+    @pytest.fixture
+    def state_file(self, tmp_path):
+        state_file = tmp_path / "state.json"
+        manager = GameStateManager(state_file)
+        board = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+        manager.apply(StateEvent(BOARD_REPLACED, {'board': board, 'iteration': 1}))
+        return state_file
+    
+    def test_own_saves_are_not_changes(self, state_file):
+        """Test a store does not report its own saves as another process's."""
+        manager = GameStateManager(state_file)
+        assert not manager.store.changed()
+        manager.apply(StateEvent(TILE_TOGGLED, {'row': 0, 'col': 0, 'clicked': True}))
+        assert not manager.store.changed()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_are_merged(self, state_file):
+        """Test neither process's clicks are lost when both save."""
+        first = GameStateManager(state_file)
+        second = GameStateManager(state_file)
+        
+        await first.toggle_tile(0, 0)
+        await first.save_state(immediate=True)
+        await second.toggle_tile(4, 4)
+        await second.save_state(immediate=True)
+        
+        # The second save noticed the first and only journaled its click
+        assert second.store.changed()
+        assert await second.refresh()
+        assert second.clicked_tiles == {(0, 0), (4, 4)}
+        assert second.version == 3
+        assert not second.store.changed()
+        
+        assert await first.refresh()
+        assert first.clicked_tiles == {(0, 0), (4, 4)}
+        assert first.version == second.version
+        assert GameStateManager(state_file).clicked_tiles == {(0, 0), (4, 4)}
+    
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_unsaved_changes(self, state_file):
+        """Test changes not saved yet are re-applied on top of a reload."""
+        first = GameStateManager(state_file)
+        second = GameStateManager(state_file)
+        await second.toggle_tile(1, 1)
+        await second.save_state(immediate=True)
+        
+        await first.toggle_tile(3, 3)  # Debounced, not saved yet
+        events = []
+        first.subscribe(events.append)
+        assert await first.refresh()
+        
+        assert first.clicked_tiles == {(1, 1), (3, 3)}
+        assert [event.kind for event in events] == [STATE_RELOADED]
+        await first.save_state(immediate=True)
+        assert GameStateManager(state_file).clicked_tiles == {(1, 1), (3, 3)}
+    
+    @pytest.mark.asyncio
+    async def test_refresh_without_changes_does_nothing(self, state_file):
+        """Test nothing is reloaded while no other process saved."""
+        manager = GameStateManager(state_file)
+        state = manager.snapshot
+        assert not await manager.refresh()
+        assert manager.snapshot is state
+        assert manager.reloads == 0
+    
+    def test_worker_processes_lose_no_clicks(self, state_file):
+        """Test clicks saved by several processes at once all land."""
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=_click_row_in_process, args=(str(state_file), row))
+            for row in range(5)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+        
+        restored = GameStateManager(state_file)
+        assert len(restored.clicked_tiles) == 25
+        _, changes = restored.store.load()
+        versions = [entry['version'] for entry in changes]
+        assert versions == sorted(set(versions))
+
+
+@pytest.mark.unit
+@pytest.mark.state
+@pytest.mark.persistence
+class TestShutdown:
+    """Test saving pending changes when the app shuts down."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        manager = GameStateManager(tmp_path / "state.json")
+        manager.saves.delay = 10  # Only shutdown flushes
+        return manager
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_flushes_debounced_changes(self, manager, tmp_path):
+        """Test changes still waiting for the debouncer are saved and reported."""
+        await manager.toggle_tile(0, 0)
+        await manager.toggle_tile(1, 1)
+        assert manager.has_unsaved_changes
+        
+        report = await manager.shutdown(deadline=5.0)
+        
+        assert report == manager.shutdown_report
+        assert report['completed'] is True
+        assert report['changes'] == 2
+        assert report['duration'] < 5.0
+        assert not manager.has_unsaved_changes
+        assert GameStateManager(tmp_path / "state.json").clicked_tiles == {(0, 0), (1, 1)}
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_gives_up_at_deadline(self, manager):
+        """Test a save that hangs does not hold up the shutdown."""
+        async def hang():
+            await asyncio.sleep(10)
+        
+        manager.saves.flush = hang
+        await manager.toggle_tile(2, 2)
+        
+        report = await manager.shutdown(deadline=0.1)
+        
+        assert report['completed'] is False
+        assert report['duration'] < 1.0
+    
+    @pytest.mark.asyncio
+    async def test_immediate_save_skipped_when_current(self, manager):
+        """Test an immediate save with nothing new does not write again."""
+        await manager.toggle_tile(0, 0)
+        await manager.save_state(immediate=True)
+        saves = manager._saves_submitted
+        
+        assert await manager.save_state(immediate=True)
+        assert manager._saves_submitted == saves
+
+
+@pytest.mark.unit
+@pytest.mark.state
+@pytest.mark.persistence
+class TestBinaryFileStore:
+    """Test the file store with binary snapshots."""
+    
+    @pytest.fixture
+    def state_file(self, tmp_path):
+        return tmp_path / "state.bin"
+    
+    @pytest.fixture
+    def board(self):
+        board = [[f"{r}{c}" for c in range(5)] for r in range(5)]
+        board[2][2] = FREE_SPACE_TEXT
+        return board
+    
+    @pytest.mark.asyncio
+    async def test_restart_with_journal(self, state_file, board):
+        """Test the binary snapshot plus journal restores the state."""
+        manager1 = GameStateManager(store=BinaryFileStore(state_file))
+        await manager1.update_board(board, 2, 'seed')
+        await manager1.save_state(immediate=True)
+        await manager1.toggle_tile(0, 0)
+        await manager1.add_bingo_pattern("custom")
+        await manager1.save_state(immediate=True)
+        
+        manager2 = GameStateManager(store=BinaryFileStore(state_file))
+        
+        assert manager2.board == tuple(map(tuple, board))
+        assert manager2.clicked_tiles == {(0, 0), (2, 2)}
+        assert manager2.bingo_patterns == {"custom"}
+        assert manager2.version == manager1.version
+    
+    @pytest.mark.asyncio
+    async def test_phrase_table_written_only_for_new_phrases(self, state_file, board):
+        """Test a new board from known phrases reuses the phrase table file."""
+        manager = GameStateManager(store=BinaryFileStore(state_file))
+        await manager.update_board(board, 1, 'a')
+        await manager.compact()
+        tables = list(state_file.parent.glob("state.phrases-*.json"))
+        assert len(tables) == 1
+        mtime = tables[0].stat().st_mtime_ns
+        
+        await manager.update_board([list(reversed(row)) for row in board], 2, 'b')
+        await manager.compact()
+        assert list(state_file.parent.glob("state.phrases-*.json")) == tables
+        assert tables[0].stat().st_mtime_ns == mtime
+        
+        await manager.update_board([[p + "!" for p in row] for row in board], 3, 'c')
+        await manager.compact()
+        new_tables = set(state_file.parent.glob("state.phrases-*.json"))
+        # The older snapshot generations still need the old table
+        assert len(new_tables) == 2 and set(tables) < new_tables
+        assert GameStateManager(store=BinaryFileStore(state_file)).board_iteration == 3
+    
+    @pytest.mark.asyncio
+    async def test_corrupt_snapshot_detected_on_startup(self, state_file, board, caplog):
+        """Test a damaged snapshot without older generations is reported and not loaded."""
+        manager = GameStateManager(store=BinaryFileStore(state_file))
+        await manager.update_board(board, 1, 'seed')
+        await manager.compact()
+        data = bytearray(state_file.read_bytes())
+        data[30] ^= 0xFF
+        state_file.write_bytes(bytes(data))
+        
+        with caplog.at_level("ERROR"):
+            restored = GameStateManager(store=BinaryFileStore(state_file))
+        
+        assert restored.board == ()
+        assert "corrupt" in caplog.text
+    
+    @pytest.mark.asyncio
+    async def test_export_json(self, state_file, board):
+        """Test the snapshot can be exported as JSON."""
+        manager = GameStateManager(store=BinaryFileStore(state_file))
+        await manager.update_board(board, 1, 'seed')
+        await manager.compact()
+        
+        exported = json.loads(manager.store.export_json())
+        assert exported['board'] == board
+        assert exported['today_seed'] == 'seed'
+
+
+@pytest.mark.unit
+@pytest.mark.state
+@pytest.mark.persistence
+class TestSnapshotGenerations:
+    """Test checksummed snapshots, their older generations and the fallback to them."""
+    
+    @pytest.fixture(params=["json", "binary"])
+    def open_store(self, request, tmp_path):
+        store_class = BinaryFileStore if request.param == "binary" else JsonFileStore
+        path = tmp_path / f"state.{request.param}"
+        return lambda **kwargs: store_class(path, **kwargs)
+    
+    @pytest.fixture
+    def board(self):
+        return [[f"{r}{c}" for c in range(5)] for r in range(5)]
+    
+    async def snapshots(self, store, board, count):
+        """Write count snapshots, the nth with n clicked tiles in row 0."""
+        manager = GameStateManager(store=store)
+        await manager.update_board(board, 1, 'seed')
+        for n in range(count):
+            if n:
+                await manager.toggle_tile(0, n - 1)
+            await manager.compact()
+        return manager
+    
+    @pytest.mark.asyncio
+    async def test_generations_are_rotated(self, open_store, board):
+        """Test only the configured number of snapshots is kept."""
+        store = open_store(generations=3)
+        await self.snapshots(store, board, 5)
+        
+        assert [path.exists() for path in store.snapshot_paths()] == [True] * 3
+        assert not store.path.with_name(f"{store.path.name}.3").exists()
+    
+    @pytest.mark.asyncio
+    async def test_damaged_snapshot_falls_back_to_older_generation(self, open_store, board, caplog):
+        """Test a truncated snapshot is replaced by the newest intact generation."""
+        store = open_store()
+        await self.snapshots(store, board, 3)
+        data = store.path.read_bytes()
+        store.path.write_bytes(data[: len(data) // 2])
+        
+        with caplog.at_level("WARNING"):
+            restored = GameStateManager(store=open_store())
+        
+        assert restored.board == tuple(map(tuple, board))
+        assert restored.clicked_tiles == {(0, 0)}  # As of the second snapshot
+        assert "corrupt" in caplog.text and "older snapshot" in caplog.text
+    
+    @pytest.mark.asyncio
+    async def test_all_generations_damaged_are_moved_aside(self, open_store, board):
+        """Test snapshots that are all damaged survive the fresh state's saves."""
+        store = open_store()
+        await self.snapshots(store, board, 3)
+        damaged = {}
+        for path in store.snapshot_paths():
+            damaged[path] = path.read_bytes()[:10]
+            path.write_bytes(damaged[path])
+        
+        restored = GameStateManager(store=open_store())
+        assert restored.board == ()
+        for _ in range(3):
+            await restored.update_board(board, 2, 'fresh')
+            await restored.compact()
+        
+        for path, data in damaged.items():
+            assert path.with_name(path.name + CORRUPT_SUFFIX).read_bytes() == data
+    
+    @pytest.mark.asyncio
+    async def test_missing_snapshot_falls_back_with_journal(self, open_store, board):
+        """Test a crash between shifting generations and renaming the new snapshot loses nothing."""
+        store = open_store()
+        manager = await self.snapshots(store, board, 2)
+        await manager.toggle_tile(4, 4)
+        await manager.save_state(immediate=True)  # Journaled after the second snapshot
+        store.path.rename(store.snapshot_paths()[1])
+        
+        restored = GameStateManager(store=open_store())
+        
+        assert restored.clicked_tiles == manager.clicked_tiles
+        assert restored.version == manager.version
+    
+    @pytest.mark.asyncio
+    async def test_json_checksum_mismatch_detected(self, tmp_path, board):
+        """Test a JSON snapshot edited behind the store's back fails its checksum."""
+        path = tmp_path / "state.json"
+        await self.snapshots(JsonFileStore(path), board, 2)
+        data = json.loads(path.read_text())
+        data['header_text'] = 'Tampered'
+        path.write_text(json.dumps(data))
+        
+        restored = GameStateManager(path)
+        
+        assert restored.header_text != 'Tampered'
+        assert restored.board == tuple(map(tuple, board))
+    
+    @pytest.mark.asyncio
+    async def test_json_snapshot_is_compact(self, tmp_path, board):
+        """Test the JSON snapshot is written compact and exported indented."""
+        store = JsonFileStore(tmp_path / "state.json")
+        await self.snapshots(store, board, 1)
+        
+        assert b"\n" not in store.path.read_bytes()
+        exported = store.export_json()
+        assert "\n  " in exported
+        assert json.loads(exported)['board'] == board
+    
+    def test_snapshot_without_checksum_loads(self, tmp_path, board):
+        """Test snapshots written before checksums were added still load."""
+        path = tmp_path / "state.json"
+        path.write_text(json.dumps({'board': board, 'clicked_tiles': [[1, 1]]}))
+        
+        assert GameStateManager(path).clicked_tiles == {(1, 1)}
+    
+    @pytest.mark.parametrize("backend", ["json", "binary"])
+    def test_killed_writer_always_recovers(self, tmp_path, backend):
+        """Test a writer killed mid-write, sometimes tearing the write, always recovers."""
+        report = run_fault_injection(100, backend, tmp_path, seed=1)
+        
+        assert report.failures == []
+        assert report.damaged > 0
+        assert report.max_recovery < 1.0
@@ -3,6 +3,7 @@ Tests for state persistence functionality.
 """
 
 import json
+import os
 import random
 import unittest
 from unittest.mock import MagicMock, patch
@@ -10,6 +11,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.core import game_logic
+from src.core.state_events import TILE_TOGGLED
+from src.core.state_store import STATE_PATH_ENV
 from src.utils.file_operations import read_phrases_file
 
 # Don't import nicegui directly since we'll mock it
@@ -24,7 +27,7 @@ class TestStatePersistence(unittest.TestCase):
         """Set up test environment."""
         # Clean up any existing state file
         from pathlib import Path
-        self.state_file = Path("game_state.json")
+        self.state_file = Path(os.environ[STATE_PATH_ENV])
         if self.state_file.exists():
             self.state_file.unlink()
         
@@ -298,8 +301,8 @@ class TestStateSync(unittest.TestCase):
         # Verify ui.broadcast() is not used
         self.assertNotIn("ui.broadcast()", source_code)
         
-        # Also check that our timer-based approach is used
-        self.assertIn("synchronized by timers", source_code)
+        # Also check that changes are pushed through the state event bus
+        self.assertIn("publish_state_change(", source_code)
     
     @pytest.mark.flaky
     def test_view_synchronization(self):
@@ -314,8 +317,8 @@ class TestStateSync(unittest.TestCase):
         }
         
         # Setup test tile data
-        home_tile = {"card": MagicMock(), "labels": [{"ref": MagicMock(), "base_classes": "some-class"}]}
-        stream_tile = {"card": MagicMock(), "labels": [{"ref": MagicMock(), "base_classes": "some-class"}]}
+        home_tile = {"card": MagicMock()}
+        stream_tile = {"card": MagicMock()}
         
         # Setup board views with test tiles
         mock_board_views["home"][1][(0, 0)] = home_tile
@@ -332,14 +335,14 @@ class TestStateSync(unittest.TestCase):
             toggle_tile(0, 0)
             
             # Check that both views were updated
-            home_tile["card"].style.assert_called()
+            home_tile["card"].classes.assert_called()
             home_tile["card"].update.assert_called()
-            stream_tile["card"].style.assert_called()
+            stream_tile["card"].classes.assert_called()
             stream_tile["card"].update.assert_called()
             
             # In NiceGUI 2.11+, we rely on timer-based synchronization instead of broadcast
             # Verify the UI is updated without depending on broadcast
-            stream_tile["card"].style.assert_called()
+            stream_tile["card"].classes.assert_called()
             home_tile["card"].update.assert_called()
     
     def test_toggle_updates_all_clients(self):
@@ -359,7 +362,9 @@ class TestStateSync(unittest.TestCase):
              patch('src.core.game_logic.is_game_closed', False), \
              patch('src.core.game_logic.ui', mock_ui), \
              patch('src.core.game_logic.check_winner') as mock_check_winner, \
-             patch('src.core.game_logic.save_state_to_storage') as mock_save_state:
+             patch('src.core.game_logic.apply_state_change') as mock_save_state:
+            
+            mock_check_winner.return_value = []  # No wins
             
             # Create minimal board_views for test
             mock_board_views = {
@@ -384,8 +389,10 @@ class TestStateSync(unittest.TestCase):
                 # Verify state was updated
                 self.assertIn((0, 0), mock_clicked_tiles)
                 
-                # Verify state was saved
-                mock_save_state.assert_called_once()
+                # Verify the toggle was saved
+                mock_save_state.assert_called_once_with(
+                    TILE_TOGGLED, row=0, col=0, clicked=True
+                )
                 
                 # In NiceGUI 2.11+, we use timers instead of broadcast
                 # Verify state was updated properly
@@ -5,7 +5,6 @@ import json
 
 # Mock nicegui imports to avoid architecture issues
 import sys
-from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -21,9 +20,9 @@ from src.utils.file_operations import read_phrases_file
 
 # Fixtures for test data
 @pytest.fixture
-def clean_state():
+def clean_state(default_state_file):
     """Clean up state file before and after test."""
-    state_file = Path("game_state.json")
+    state_file = default_state_file
     if state_file.exists():
         state_file.unlink()
     
@@ -293,19 +292,19 @@ def test_corrupted_state():
 
 
 @given("the game has saved state")
-def has_saved_state(game_state):
+def has_saved_state(game_state, default_state_file):
     """Ensure game has saved state."""
     import time
     game_logic.toggle_tile(1, 1)
     game_logic.save_state_to_storage()
     time.sleep(0.1)
-    assert Path("game_state.json").exists()
+    assert default_state_file.exists()
 
 
 @when("the stored state becomes corrupted")
-def corrupt_stored_state():
+def corrupt_stored_state(default_state_file):
     """Corrupt the stored state."""
-    state_file = Path("game_state.json")
+    state_file = default_state_file
     if state_file.exists():
         # Corrupt the data
         with open(state_file, 'w') as f:
@@ -347,7 +346,7 @@ def verify_error_logged(game_state):
 
 
 # Test for architecture issues
-def test_nicegui_storage_architecture_issue():
+def test_nicegui_storage_architecture_issue(default_state_file):
     """
     This test verifies that the architectural issue with NiceGUI storage has been resolved.
     
@@ -360,7 +359,7 @@ def test_nicegui_storage_architecture_issue():
     The StateManager pattern successfully addresses the client-side storage limitations.
     """
     # This test now passes with the StateManager implementation
-    state_file = Path("game_state.json")
+    state_file = default_state_file
     
     try:
         # Save some state
@@ -382,9 +381,9 @@ def test_nicegui_storage_architecture_issue():
             state_file.unlink()
 
 
-def test_proposed_file_based_persistence():
+def test_proposed_file_based_persistence(default_state_file):
     """Test proposed file-based persistence solution."""
-    state_file = Path("game_state.json")
+    state_file = default_state_file
     
     # Test that file-based persistence has been implemented
     try:
@@ -4,6 +4,7 @@ These tests are expected to FAIL until we fix the underlying issues.
 """
 
 import asyncio
+import os
 
 # Mock nicegui imports
 import sys
@@ -16,6 +17,7 @@ sys.modules['nicegui.app'] = MagicMock()
 sys.modules['nicegui.ui'] = MagicMock()
 
 import src.core.game_logic as game_logic
+from src.core.state_store import STATE_PATH_ENV
 from src.utils.file_operations import read_phrases_file
 
 
@@ -27,7 +29,7 @@ class TestStatePersistenceBugs:
         from pathlib import Path
 
         # Clean up state file
-        self.state_file = Path("game_state.json")
+        self.state_file = Path(os.environ[STATE_PATH_ENV])
         if self.state_file.exists():
             self.state_file.unlink()
         
@@ -191,7 +193,7 @@ class TestBDDStyleStatePersistence:
         from pathlib import Path
 
         # Clean up state file
-        self.state_file = Path("game_state.json")
+        self.state_file = Path(os.environ[STATE_PATH_ENV])
         if self.state_file.exists():
             self.state_file.unlink()
         
@@ -43,7 +43,7 @@ class TestCurrentArchitectureIssues:
         """Clean up patches."""
         self.patcher.stop()
     
-    def test_issue_1_client_side_storage(self):
+    def test_issue_1_client_side_storage(self, default_state_file):
         """
         ISSUE #1: app.storage.general WAS client-side storage - NOW FIXED
         
@@ -58,7 +58,7 @@ class TestCurrentArchitectureIssues:
         from src.core.game_logic import save_state_to_storage, toggle_tile
 
         # Clean up any existing state file
-        state_file = Path("game_state.json")
+        state_file = default_state_file
         if state_file.exists():
             state_file.unlink()
         
@@ -257,7 +257,7 @@ class TestProposedSolutions:
         """Clean up patches."""
         self.patcher.stop()
     
-    def test_file_based_persistence_solution(self):
+    def test_file_based_persistence_solution(self, default_state_file):
         """
         PROPOSED SOLUTION: Server-side file persistence
         
@@ -265,7 +265,7 @@ class TestProposedSolutions:
         """
         from src.core.game_logic import board, clicked_tiles, is_game_closed
         
-        STATE_FILE = Path("game_state.json")
+        STATE_FILE = default_state_file
         
         def save_to_file():
             """Save game state to server file."""
@@ -467,7 +467,7 @@ class TestProposedSolutions:
                 DB_FILE.unlink()
     
     @pytest.mark.asyncio
-    async def test_async_state_manager_solution(self):
+    async def test_async_state_manager_solution(self, tmp_path):
         """
         PROPOSED SOLUTION: Async state manager with locking
         
@@ -489,7 +489,7 @@ class TestProposedSolutions:
                 self._state = GameState()
                 self._lock = asyncio.Lock()
                 self._save_lock = asyncio.Lock()
-                self._state_file = Path("async_game_state.json")
+                self._state_file = tmp_path / "async_game_state.json"
             
             async def toggle_tile(self, row: int, col: int):
                 """Thread-safe tile toggle."""
@@ -0,0 +1,96 @@
+"""Tests for the compact binary snapshot format."""
+
+import pytest
+
+from src.config.constants import FREE_SPACE_TEXT
+from src.core.state_snapshot import (
+    PhraseTable,
+    SnapshotError,
+    decode_snapshot,
+    encode_snapshot,
+    snapshot_table_digest,
+)
+
+
+@pytest.fixture
+def board():
+    board = [[f"Phrase {r}{c}" for c in range(5)] for r in range(5)]
+    board[2][2] = FREE_SPACE_TEXT
+    return board
+
+
+@pytest.fixture
+def state(board):
+    return {
+        "board": board,
+        "clicked_tiles": [[0, 0], [0, 1], [0, 2], [0, 3], [0, 4], [2, 2]],
+        "bingo_patterns": ["row0", "postage_stamp"],
+        "is_game_closed": True,
+        "board_iteration": 7,
+        "today_seed": "20250101.7",
+        "header_text": "GAME CLOSED",
+        "timestamp": 1700000000.25,
+        "version": 123,
+        "snapshot_id": "abc123",
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.persistence
+class TestStateSnapshot:
+    """Test encoding, decoding and corruption detection."""
+
+    def test_round_trip(self, state, board):
+        """Test a decoded snapshot equals the encoded state."""
+        table = PhraseTable(p for row in board for p in row)
+        data = encode_snapshot(state, table)
+
+        assert decode_snapshot(data, table) == state
+        assert snapshot_table_digest(data) == table.digest
+        assert len(data) < 200
+
+    def test_indices_into_larger_table(self, state, board):
+        """Test boards index into a table holding more phrases than the board."""
+        table = PhraseTable(["unused"] + [p for row in reversed(board) for p in row])
+        assert decode_snapshot(encode_snapshot(state, table), table)["board"] == board
+
+    def test_empty_state(self):
+        """Test a state without a board round-trips."""
+        state = {"board": [], "clicked_tiles": [], "bingo_patterns": []}
+        decoded = decode_snapshot(encode_snapshot(state, PhraseTable()), PhraseTable())
+        assert decoded["board"] == []
+        assert decoded["today_seed"] is None
+        assert decoded["snapshot_id"] is None
+
+    def test_every_bit_flip_is_detected(self, state, board):
+        """Test flipping any single bit makes the snapshot unreadable."""
+        table = PhraseTable(p for row in board for p in row)
+        data = encode_snapshot(state, table)
+        for position in range(len(data)):
+            corrupt = bytearray(data)
+            corrupt[position] ^= 0x10
+            with pytest.raises(SnapshotError):
+                decode_snapshot(bytes(corrupt), table)
+
+    def test_truncation_is_detected(self, state, board):
+        """Test a partially written snapshot is rejected."""
+        table = PhraseTable(p for row in board for p in row)
+        data = encode_snapshot(state, table)
+        for length in (0, 3, 10, len(data) - 1):
+            with pytest.raises(SnapshotError):
+                decode_snapshot(data[:length], table)
+
+    def test_wrong_phrase_table(self, state, board):
+        """Test a snapshot is not decoded with a different phrase table."""
+        table = PhraseTable(p for row in board for p in row)
+        data = encode_snapshot(state, table)
+        with pytest.raises(SnapshotError):
+            decode_snapshot(data, table.extended([["Another phrase"]]))
+
+    def test_unencodable_state(self, state, board):
+        """Test states the format cannot hold raise SnapshotError."""
+        table = PhraseTable(p for row in board for p in row)
+        with pytest.raises(SnapshotError):
+            encode_snapshot(state, PhraseTable(["only one"]))
+        with pytest.raises(SnapshotError):
+            encode_snapshot(dict(state, clicked_tiles=[[5, 0]]), table)
@@ -3,9 +3,19 @@ Pure unit tests for text processing utilities.
 Fast, isolated tests with no dependencies.
 """
 
+import itertools
+
 import pytest
 
-from src.utils.text_processing import get_line_style_for_lines, split_phrase_into_lines
+from src.utils.font_metrics import FontMetrics
+from src.utils.text_processing import (
+    fit_line_sizes,
+    get_line_style_for_lines,
+    line_spread,
+    line_width,
+    partition_words,
+    split_phrase_into_lines,
+)
 
 
 @pytest.mark.unit
@@ -93,6 +103,54 @@ class TestSplitPhraseIntoLines:
         assert len(result) == 3
         assert result == ["One", "Two", "Three"]
 
+    
+    def test_more_lines_allowed(self):
+        """Test max_lines lifts the four line limit."""
+        phrase = " ".join(["Word"] * 12)
+        assert split_phrase_into_lines(phrase, forced_lines=6, max_lines=8) == ["Word Word"] * 6
+        assert len(split_phrase_into_lines(phrase, forced_lines=6)) <= 4
+    
+    def test_width_objective(self):
+        """Test the narrowest split can differ from the most even one."""
+        phrase = "aaaaaaa bb ccc dd"
+        assert split_phrase_into_lines(phrase, forced_lines=2) == ["aaaaaaa", "bb ccc dd"]
+        assert split_phrase_into_lines(phrase, forced_lines=3, objective=line_width) == [
+            "aaaaaaa", "bb", "ccc dd"
+        ]
+
+
+@pytest.mark.unit
+class TestPartitionWords:
+    """Test the linear partition behind split_phrase_into_lines."""
+    
+    def test_matches_brute_force(self):
+        """Test the best score equals that of an exhaustive search."""
+        words = "one three fifteen a sixty seven ab".split()
+        lengths = [len(word) for word in words]
+        
+        def score(breaks, objective):
+            bounds = [0, *breaks, len(words)]
+            lines = [sum(lengths[i:j]) + j - i - 1 for i, j in zip(bounds, bounds[1:])]
+            return objective(max(lines), min(lines))
+        
+        for objective in (line_spread, line_width):
+            for line_count in range(1, len(words) + 1):
+                best, breaks = partition_words(words, line_count, objective)
+                exhaustive = min(
+                    score(combination, objective)
+                    for combination in itertools.combinations(range(1, len(words)), line_count - 1)
+                )
+                assert best == exhaustive == score(breaks, objective)
+    
+    def test_earliest_breaks_win_ties(self):
+        """Test equally good splits resolve to the earliest line breaks."""
+        assert partition_words(["ab", "cd", "ef"], 2) == (3, [1])
+    
+    def test_too_many_lines(self):
+        """Test more lines than words is rejected."""
+        with pytest.raises(ValueError):
+            partition_words(["one", "two"], 3)
+
 
 @pytest.mark.unit
 class TestGetLineStyleForLines:
@@ -144,4 +202,28 @@ class TestGetLineStyleForLines:
         style_white = get_line_style_for_lines(1, "#ffffff")
         
         assert "color: #000000" in style_black
-        assert "color: #ffffff" in style_white
\ No newline at end of file
+        assert "color: #ffffff" in style_white
+
+
+@pytest.mark.unit
+class TestFitLineSizes:
+    """Test fitting font sizes to a tile."""
+
+    # Every character is half an em wide
+    metrics = FontMetrics({}, 0.5)
+
+    def test_lines_fill_width(self):
+        """Test each line is sized to fill the width."""
+        sizes = fit_line_sizes(["ABCD", "AB"], self.metrics, 100, 1000)
+        assert sizes == [50, 100]
+
+    def test_overflowing_lines_scale_down_together(self):
+        """Test lines too tall for the height shrink in proportion."""
+        sizes = fit_line_sizes(["ABCD", "AB"], self.metrics, 100, 90)
+        # Two lines have a line-height of 1.2em: (50 + 100) * 1.2 = 180
+        assert sizes == pytest.approx([25, 50])
+
+    def test_caps(self):
+        """Test a line never grows past its cap."""
+        sizes = fit_line_sizes(["A", "ABCD"], self.metrics, 100, 1000, [40, 1000])
+        assert sizes == [40, 50]
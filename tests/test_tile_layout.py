@@ -0,0 +1,138 @@
+"""
+Pure unit tests for the tile layout cache.
+Fast, isolated tests with no dependencies.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.config.constants import (
+    FREE_SPACE_TEXT,
+    FREE_SPACE_TEXT_COLOR,
+    TILE_CLICKED_BG_COLOR,
+    TILE_UNCLICKED_BG_COLOR,
+)
+from src.ui.tile_layout import (
+    TileLayoutCache,
+    layout_phrase,
+    tile_classes,
+    tile_stylesheet,
+    tile_stylesheet_url,
+)
+from src.utils.text_processing import (
+    MAX_PHRASE_LINES,
+    line_height_for_lines,
+    split_phrase_into_lines,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.ui
+class TestLayoutPhrase:
+    """Test how a phrase is laid out."""
+
+    def test_lines_and_markup(self):
+        """Test the layout holds the split and the markup for its line count."""
+        phrase = "SHIP IT ON A FRIDAY AFTERNOON"
+        layout = layout_phrase(phrase)
+
+        assert list(layout.lines) == split_phrase_into_lines(phrase)
+        assert layout.line_count == len(layout.lines)
+        assert len(layout.label_classes) == layout.line_count
+        assert layout.html.count("nicegui-row") == layout.line_count
+        assert len(layout.font_sizes) == layout.line_count
+        assert all(f"font-size: {size}" in layout.html for size in layout.font_sizes)
+
+    def test_font_sizes_fit_the_tile(self):
+        """Test lines are sized in tile units, the longer line smaller."""
+        layout = layout_phrase("SHORT WORDS HERE AND THERE EVERYWHERE")
+        assert layout.lines == ("SHORT WORDS HERE", "AND THERE EVERYWHERE")
+        assert layout.font_sizes[0].startswith("max(10px, ")
+        short, long = (
+            float(size[len("max(10px, ") : -len("cqw)")]) for size in layout.font_sizes
+        )
+        assert short > long
+
+    def test_text_takes_the_tile_colour(self):
+        """Test the markup leaves colours and line height to the stylesheet."""
+        layout = layout_phrase(FREE_SPACE_TEXT)
+        assert "color" not in layout.html
+        assert "line-height" not in layout.html
+        assert f"line-count-{layout.line_count}" in layout.html
+
+
+@pytest.mark.unit
+@pytest.mark.ui
+class TestTileStylesheet:
+    """Test the generated tile stylesheet."""
+
+    def test_state_classes(self):
+        """Test each tile state class carries its colours."""
+        css = tile_stylesheet()
+        assert (
+            f".q-card.tile-clicked {{ background-color: {TILE_CLICKED_BG_COLOR};" in css
+        )
+        assert (
+            f".q-card.tile-unclicked {{ background-color: {TILE_UNCLICKED_BG_COLOR};"
+            in css
+        )
+        # The free space rule comes last, so it wins over the state classes
+        assert css.index(".tile-free") > css.index(".q-card.tile-unclicked {")
+        assert FREE_SPACE_TEXT_COLOR in css
+
+    def test_line_count_classes(self):
+        """Test every line count a phrase can have gets its line height."""
+        css = tile_stylesheet()
+        for n in range(1, MAX_PHRASE_LINES + 1):
+            assert (
+                f".line-count-{n} {{ line-height: {line_height_for_lines(n)}; }}" in css
+            )
+
+    def test_tile_classes(self):
+        """Test a tile's state classes."""
+        assert tile_classes(True) == "tile-clicked"
+        assert tile_classes(False, free=True) == "tile-unclicked tile-free"
+
+    def test_url_is_versioned(self):
+        """Test the stylesheet's URL names its content."""
+        assert tile_stylesheet_url().startswith("/tile-styles.css?v=")
+
+
+@pytest.mark.unit
+@pytest.mark.ui
+class TestTileLayoutCache:
+    """Test the per-phrase layout cache."""
+
+    def test_loaded_phrases_are_laid_out_once(self):
+        """Test lookups of loaded phrases never split a phrase again."""
+        cache = TileLayoutCache()
+        cache.load(["FIRST PHRASE", "A SECOND LONGER PHRASE"])
+        assert len(cache) == 3  # The free space is always laid out
+
+        with patch("src.ui.tile_layout.split_phrase_into_lines") as split:
+            for _ in range(10):
+                cache.get("FIRST PHRASE")
+                cache.get("A SECOND LONGER PHRASE")
+                cache.get(FREE_SPACE_TEXT)
+            split.assert_not_called()
+        assert cache.hits == 30
+        assert cache.misses == 0
+
+    def test_unknown_phrase_is_laid_out_on_first_use(self):
+        """Test a phrase that was not loaded is computed once, then cached."""
+        cache = TileLayoutCache()
+        first = cache.get("FROM AN OLDER PHRASES FILE")
+        assert cache.get("FROM AN OLDER PHRASES FILE") is first
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    def test_load_drops_old_layouts(self):
+        """Test reloading the phrases invalidates the old layouts."""
+        cache = TileLayoutCache()
+        cache.load(["OLD PHRASE"])
+        old = cache.get("OLD PHRASE")
+        cache.load(["NEW PHRASE"])
+
+        assert len(cache) == 2
+        assert cache.get("OLD PHRASE") is not old
+        assert cache.misses == 1
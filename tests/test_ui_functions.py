@@ -23,8 +23,8 @@ class TestUIFunctions(unittest.TestCase):
     def setUp(self):
         # Setup common test data and mocks
         self.patches = [
-            patch("src.config.constants.BOARD_TILE_FONT", "Inter"),
-            patch("src.config.constants.BOARD_TILE_FONT_WEIGHT", "700"),
+            patch("src.config.constants.BOARD_TILE_FONT", "Super Carnival"),
+            patch("src.config.constants.BOARD_TILE_FONT_WEIGHT", "400"),
             patch("src.config.constants.BOARD_TILE_FONT_STYLE", "normal"),
             patch("src.config.constants.TILE_CLICKED_BG_COLOR", "#100079"),
             patch("src.config.constants.TILE_CLICKED_TEXT_COLOR", "#1BEFF5"),
@@ -93,54 +93,174 @@ class TestUIFunctions(unittest.TestCase):
     @patch("src.ui.sync.ui.run_javascript")
     def test_update_tile_styles(self, mock_run_js):
         """Test updating tile styles based on clicked state"""
-        from src.config.constants import TILE_CLICKED_BG_COLOR, TILE_UNCLICKED_BG_COLOR
+        from src.config.constants import TILE_CLICKED_CLASS, TILE_UNCLICKED_CLASS
         from src.core.game_logic import clicked_tiles
 
         # Create mock tiles
         tile_buttons_dict = {}
 
-        # Create a mock for labels and cards
+        # Each tile is a single card element
         for r in range(2):
             for c in range(2):
-                mock_card = MagicMock()
-                mock_label = MagicMock()
-
-                # Create a label info dictionary with the required structure
-                label_info = {
-                    "ref": mock_label,
-                    "base_classes": "some-class",
-                    "base_style": "some-style",
-                }
-
-                tile_buttons_dict[(r, c)] = {"card": mock_card, "labels": [label_info]}
+                tile_buttons_dict[(r, c)] = {"card": MagicMock()}
 
         # Run the update_tile_styles function
         update_tile_styles(tile_buttons_dict)
 
         # Check that styles were applied to all tiles
         for (r, c), tile in tile_buttons_dict.items():
-            # The card's style should have been updated
-            tile["card"].style.assert_called_once()
+            # The card's state class should have been swapped
+            tile["card"].classes.assert_called_once()
+            tile["card"].style.assert_not_called()
             tile["card"].update.assert_called_once()
 
-            # Each label should have had its classes and style updated
-            for label_info in tile["labels"]:
-                label = label_info["ref"]
-                label.classes.assert_called_once_with(label_info["base_classes"])
-                label.style.assert_called_once()
-                label.update.assert_called_once()
-
-            # Check that clicked tiles have the clicked style
+            # Check that clicked tiles get the clicked class
             if (r, c) in clicked_tiles:
-                self.assertIn(TILE_CLICKED_BG_COLOR, tile["card"].style.call_args[0][0])
+                tile["card"].classes.assert_called_once_with(
+                    TILE_CLICKED_CLASS, remove=TILE_UNCLICKED_CLASS
+                )
             else:
-                self.assertIn(
-                    TILE_UNCLICKED_BG_COLOR, tile["card"].style.call_args[0][0]
+                tile["card"].classes.assert_called_once_with(
+                    TILE_UNCLICKED_CLASS, remove=TILE_CLICKED_CLASS
                 )
 
         # Note: In the new modular structure, we might not always run JavaScript
         # during the test, so we're not checking for this call
 
+    @patch("src.ui.sync.ui")
+    @patch("src.ui.sync.update_tile_styles")
+    @patch("src.ui.sync.get_state_manager")
+    def test_sync_board_state_skips_current_views(
+        self, mock_get_state_manager, mock_update_tile_styles, mock_ui
+    ):
+        """Test that views already showing the current version are not restyled"""
+        container = MagicMock()
+        tiles = {}
+        mock_get_state_manager.return_value.version = 7
+        mock_update_tile_styles.return_value = 25
+
+        with (
+            patch("src.core.game_logic.board_views", {"home": (container, tiles)}),
+            patch("src.core.game_logic.is_game_closed", False),
+        ):
+            sync_board_state()
+            sync_board_state()
+            self.assertEqual(mock_update_tile_styles.call_count, 1)
+            mock_update_tile_styles.assert_called_with(tiles, None)
+
+            # A new state version diffs the view and restyles only flipped tiles
+            from src.core import game_logic
+
+            game_logic.clicked_tiles.add((0, 1))
+            mock_get_state_manager.return_value.version = 8
+            sync_board_state()
+            self.assertEqual(mock_update_tile_styles.call_count, 2)
+            mock_update_tile_styles.assert_called_with(tiles, {(0, 1)})
+
+        # Text is fitted on the server, so no resize script is sent
+        mock_ui.run_javascript.assert_not_called()
+
+    @patch("src.ui.sync.get_state_manager")
+    def test_toggle_tile_restyles_only_flipped_tile(self, mock_get_state_manager):
+        """Test a click costs one card update per view, not the whole board"""
+        from src.core import game_logic
+        from src.ui.sync import mark_view_rendered, render_stats
+
+        views = {}
+        for view_key in ("home", "stream"):
+            tiles = {(r, c): {"card": MagicMock()} for r in range(2) for c in range(2)}
+            container = MagicMock()
+            mark_view_rendered(container, None, game_logic.clicked_tiles)
+            views[view_key] = (container, tiles)
+        mock_get_state_manager.return_value.version = 3
+
+        with (
+            patch("src.core.game_logic.board_views", views),
+            patch("src.core.game_logic.is_game_closed", False),
+            patch("src.core.game_logic.ui"),
+            patch("src.core.game_logic.check_winner"),
+            patch("src.core.game_logic.save_state_to_storage"),
+            patch("src.core.game_logic.publish_state_change"),
+        ):
+            game_logic.toggle_tile(0, 1)
+
+        # One card in each of the two views
+        self.assertEqual(render_stats.last_toggle_updates, 2)
+        for _, tiles in views.values():
+            tiles[(0, 1)]["card"].update.assert_called_once()
+            tiles[(0, 0)]["card"].update.assert_not_called()
+            tiles[(1, 1)]["card"].update.assert_not_called()
+
+    @patch("src.ui.sync.get_state_manager")
+    def test_state_push_reaches_every_client(self, mock_get_state_manager):
+        """Test a pushed toggle re-renders every client's views, each once"""
+        from src.core import game_logic
+        from src.core.state_events import TILE_TOGGLED, StateEvent, StateEventBus
+        from src.ui.sync import (
+            mark_view_rendered,
+            register_board_view,
+            subscribe_to_state_changes,
+        )
+
+        bus = StateEventBus()
+        mock_get_state_manager.return_value.subscribe = bus.subscribe
+        mock_get_state_manager.return_value.version = 5
+
+        # Two clients open the home page, one after the other
+        clients = []
+        for _ in range(2):
+            container = MagicMock()
+            tiles = {(r, c): {"card": MagicMock()} for r in range(2) for c in range(2)}
+            mark_view_rendered(container, None, game_logic.clicked_tiles)
+            register_board_view("home", container, tiles)
+            subscribe_to_state_changes(container.client)
+            clients.append((container.client, tiles))
+
+        with (
+            patch("src.core.game_logic.is_game_closed", False),
+            patch("src.core.game_logic.header_label", None),
+        ):
+            game_logic.clicked_tiles.add((0, 1))
+            bus.publish(StateEvent(TILE_TOGGLED, {"row": 0, "col": 1}, 5))
+
+        for client, tiles in clients:
+            tiles[(0, 1)]["card"].update.assert_called_once()
+            tiles[(0, 0)]["card"].update.assert_not_called()
+
+    @patch("src.core.state_manager.get_state_manager")
+    def test_toggle_tile_sends_one_message_per_client_board(
+        self, mock_get_state_manager
+    ):
+        """Test a click on client-rendered views costs one state message per view"""
+        from src.core import game_logic
+        from src.ui.sync import render_stats
+
+        client_boards = {}
+        views = {}
+        for view_key in ("home", "stream"):
+            container = MagicMock()
+            client_boards[container] = MagicMock()
+            client_boards[container].push_state.return_value = True
+            views[view_key] = (container, {})
+        mock_get_state_manager.return_value.version = 4
+
+        with (
+            patch("src.core.game_logic.board_views", views),
+            patch("src.core.game_logic.is_game_closed", False),
+            patch("src.core.game_logic.ui"),
+            patch("src.core.game_logic.check_winner"),
+            patch("src.core.game_logic.save_state_to_storage"),
+            patch("src.core.game_logic.publish_state_change"),
+            patch("src.ui.client_board.get_client_board", client_boards.get),
+        ):
+            game_logic.toggle_tile(0, 1)
+
+        self.assertEqual(render_stats.last_toggle_updates, 2)
+        for client_board in client_boards.values():
+            version, clicked, _ = client_board.push_state.call_args.args
+            self.assertEqual(version, 4)
+            self.assertIn((0, 1), clicked)
+
     @patch("src.core.game_logic.ui")
     @patch("src.core.game_logic.header_label")
     @patch("src.ui.board_builder.build_closed_message")
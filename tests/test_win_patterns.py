@@ -0,0 +1,215 @@
+"""
+Pure unit tests for the win pattern registry and bitboard win detection.
+"""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from src.core.win_patterns import (
+    SPECIAL_CATEGORY,
+    STANDARD_CATEGORY,
+    PatternRegistry,
+    PatternTracker,
+    WinPattern,
+    default_patterns,
+    load_patterns_file,
+    pattern_from_dict,
+    tile_bit,
+    tiles_to_mask,
+)
+
+ALL_TILES = [(r, c) for r in range(5) for c in range(5)]
+EXAMPLE_PATTERNS = Path(__file__).resolve().parent.parent / "patterns.example.json"
+
+
+@pytest.mark.unit
+class TestWinPatterns:
+    """Test the compiled pattern masks and tile index."""
+
+    def setup_method(self):
+        self.registry = PatternRegistry(default_patterns())
+
+    def test_tiles_to_mask(self):
+        """Test tiles pack into one bit each in row-major order."""
+        assert tiles_to_mask([]) == 0
+        assert tiles_to_mask([(0, 0)]) == 1
+        assert tiles_to_mask([(0, 1), (1, 0)]) == 0b100010
+        assert tile_bit(4, 4) == 1 << 24
+        assert tiles_to_mask(ALL_TILES) == (1 << 25) - 1
+
+    def test_default_pattern_masks(self):
+        """Test the mask sizes and categories of the built-in patterns."""
+        masks = self.registry.masks
+        assert len(masks) == 17
+        assert bin(masks["row3"]).count("1") == 5
+        assert masks["four_corners"] == tiles_to_mask([(0, 0), (0, 4), (4, 0), (4, 4)])
+        assert bin(masks["plus"]).count("1") == 9
+        assert bin(masks["x_shape"]).count("1") == 9
+        assert bin(masks["perimeter"]).count("1") == 16
+        assert self.registry.category("diag_anti") == STANDARD_CATEGORY
+        assert self.registry.category("blackout") == SPECIAL_CATEGORY
+
+    def test_tile_index(self):
+        """Test each tile indexes exactly the patterns that include it."""
+        for row, col in ALL_TILES:
+            indexed = {name for name, _ in self.registry.tile_index[row * 5 + col]}
+            expected = {
+                name
+                for name, mask in self.registry.masks.items()
+                if mask & tile_bit(row, col)
+            }
+            assert indexed == expected
+        # The centre tile lies on its row, column, both diagonals and more
+        center = {name for name, _ in self.registry.tile_index[12]}
+        assert {"row2", "col2", "diag_main", "diag_anti", "plus", "x_shape"} <= center
+        assert "perimeter" not in center
+
+    def test_completed_matches_set_scan(self):
+        """Test the bitboard agrees with checking every pattern cell by cell."""
+        rng = random.Random(7)
+        for _ in range(500):
+            clicked = {tile for tile in ALL_TILES if rng.random() < 0.8}
+            expected = [
+                pattern.name
+                for pattern in default_patterns()
+                if all(cell in clicked for cell in pattern.cells)
+            ]
+            assert self.registry.completed(tiles_to_mask(clicked)) == expected
+
+    def test_completed_through_toggled_tile(self):
+        """Test a toggle only reports completed patterns through that tile."""
+        state = tiles_to_mask((0, c) for c in range(5)) | tiles_to_mask(
+            (r, 4) for r in range(5)
+        )
+        assert self.registry.completed(state) == ["row0", "col4"]
+        assert self.registry.completed(state, (0, 1)) == ["row0"]
+        assert self.registry.completed(state, (3, 4)) == ["col4"]
+        assert self.registry.completed(state, (2, 2)) == []
+
+    def test_messages(self):
+        """Test the message templates of standard and special patterns."""
+        patterns = self.registry.patterns
+        assert patterns["row0"].format_message(1) == "BINGO!"
+        assert patterns["row0"].format_message(2) == "DOUBLE BINGO!"
+        assert patterns["row0"].format_message(7) == "7-WAY BINGO!"
+        assert patterns["four_corners"].format_message(1) == "Four Corners Bingo!"
+
+
+@pytest.mark.unit
+class TestCustomPatterns:
+    """Test patterns declared as data."""
+
+    def test_pattern_from_dict(self):
+        """Test a config entry becomes a special pattern by default."""
+        pattern = pattern_from_dict(
+            {"name": "stamp", "cells": [[1, 1], [0, 0], [0, 1], [1, 0]]}
+        )
+        assert pattern == WinPattern("stamp", ((0, 0), (0, 1), (1, 0), (1, 1)))
+        assert pattern.format_message(1) == "Stamp Bingo!"
+
+    @pytest.mark.parametrize(
+        "entry",
+        [
+            {"cells": [[0, 0]]},
+            {"name": "empty", "cells": []},
+            {"name": "off", "cells": [[5, 0]]},
+        ],
+    )
+    def test_pattern_from_dict_rejects_invalid(self, entry):
+        """Test entries without a name, without cells or off the board are rejected."""
+        with pytest.raises(ValueError):
+            pattern_from_dict(entry)
+
+    def test_load_example_file(self):
+        """Test the shipped example declares a T, an L and a postage stamp."""
+        patterns = load_patterns_file(EXAMPLE_PATTERNS)
+        assert [p.name for p in patterns] == ["t_shape", "l_shape", "postage_stamp"]
+
+    def test_load_invalid_file(self, tmp_path):
+        """Test a missing or broken patterns file adds no patterns."""
+        assert load_patterns_file(tmp_path / "missing.json") == []
+        broken = tmp_path / "patterns.json"
+        broken.write_text(json.dumps({"patterns": [{"name": "bad"}]}))
+        assert load_patterns_file(broken) == []
+
+    @pytest.mark.parametrize(
+        "message", ["{foo} Bingo!", "Bingo {", "{0}!", "{name.missing}", 7]
+    )
+    def test_invalid_message_is_rejected(self, tmp_path, message):
+        """Test a message template that would not format is rejected when loaded."""
+        entry = {"name": "stamp", "cells": [[0, 0], [0, 1]], "message": message}
+        with pytest.raises(ValueError, match="invalid message"):
+            pattern_from_dict(entry)
+        path = tmp_path / "patterns.json"
+        path.write_text(json.dumps({"patterns": [entry]}))
+        assert load_patterns_file(path) == []
+
+    def test_custom_patterns_are_indexed(self):
+        """Test custom shapes join the masks and tile index of the registry."""
+        registry = PatternRegistry(
+            default_patterns() + load_patterns_file(EXAMPLE_PATTERNS)
+        )
+        assert len(registry) == 20
+        stamp_tiles = [(0, 3), (0, 4), (1, 3), (1, 4)]
+        assert registry.completed(tiles_to_mask(stamp_tiles)) == ["postage_stamp"]
+        assert "postage_stamp" in {name for name, _ in registry.tile_index[9]}
+        assert "postage_stamp" not in {name for name, _ in registry.tile_index[0]}
+
+    def test_custom_pattern_replaces_same_name(self):
+        """Test a declared pattern overrides a built-in one of the same name."""
+        corners = WinPattern("four_corners", ((0, 0), (4, 4)), message="Corners!")
+        registry = PatternRegistry(default_patterns() + [corners])
+        assert registry.masks["four_corners"] == tiles_to_mask([(0, 0), (4, 4)])
+        assert list(registry.masks)[-1] == "four_corners"
+
+
+@pytest.mark.unit
+class TestPatternTracker:
+    """Test incremental bookkeeping of completed patterns."""
+
+    def setup_method(self):
+        self.registry = PatternRegistry(default_patterns())
+        self.tracker = PatternTracker()
+
+    def test_add_and_retract_counts_per_category(self):
+        """Test counts follow additions and the retraction through a tile."""
+        completed = set()
+        self.tracker.bind(completed, self.registry)
+        for name in ("row0", "col0", "four_corners"):
+            self.tracker.add(name, self.registry)
+        assert self.tracker.count(STANDARD_CATEGORY) == 2
+        assert self.tracker.count(SPECIAL_CATEGORY) == 1
+
+        # (0, 0) lies on row0, col0 and four_corners; (4, 4) only on the corners here
+        assert self.tracker.retract((4, 4), self.registry) == ["four_corners"]
+        assert self.tracker.retract((0, 0), self.registry) == ["row0", "col0"]
+        assert completed == set()
+        assert self.tracker.count(STANDARD_CATEGORY) == 0
+        assert self.tracker.count(SPECIAL_CATEGORY) == 0
+
+    def test_bind_recounts_replaced_or_changed_sets(self):
+        """Test binding picks up sets replaced or cleared outside the tracker."""
+        completed = {"row0", "row1", "plus"}
+        self.tracker.bind(completed, self.registry)
+        assert self.tracker.count(STANDARD_CATEGORY) == 2
+
+        completed.clear()
+        self.tracker.bind(completed, self.registry)
+        assert self.tracker.count(STANDARD_CATEGORY) == 0
+
+        self.tracker.bind({"diag_main"}, self.registry)
+        assert self.tracker.count(STANDARD_CATEGORY) == 1
+
+    def test_bind_recounts_same_size_changes(self):
+        """Test swapping one pattern for another in place is recounted."""
+        completed = {"row0", "row1"}
+        self.tracker.bind(completed, self.registry)
+
+        completed.discard("row1")
+        completed.add("four_corners")
+        self.tracker.bind(completed, self.registry)
+        assert self.tracker.count(STANDARD_CATEGORY) == 1
+        assert self.tracker.count(SPECIAL_CATEGORY) == 1